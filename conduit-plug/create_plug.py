@@ -6,7 +6,9 @@ Generates STL files for simple cylindrical plugs with a flange at multiple heigh
 Usage:
     python create_plug.py
 
-Output: conduit_plug_{height}mm.stl
+Output: conduit_plug_{height}mm.stl, kept in the artifact store
+(tools/.artifacts) as hard links and recorded in artifacts.json, so plugs
+that come out unchanged are not rewritten and equal ones share one copy.
 """
 import os
 import sys
@@ -14,6 +16,8 @@ import sys
 sys.path.insert(0, "/Users/richard/3d-prints/tools")
 from step_primitives import make_cylinder, translate, fuse, save_stl
 from bbox import print_dimensions
+from output_pipeline import OutputPipeline
+from artifact_store import ArtifactStore
 
 CONDUIT_DIAMETER = 22.5
 PLUG_DIAMETER = CONDUIT_DIAMETER
@@ -39,13 +43,16 @@ def main():
     print(f"Lip thickness:    {LIP_THICKNESS} mm")
     print("=" * 40)
 
-    for h in HEIGHTS:
-        print(f"\n--- {h}mm height ---")
-        shape = create_plug(PLUG_DIAMETER, h)
-        print_dimensions(shape)
-        output_path = os.path.join(script_dir, f"conduit_plug_{h}mm.stl")
-        save_stl(shape, output_path)
-        print(f"  Saved: {output_path}")
+    # Each plug is meshed + written in the background while the next is built
+    store = ArtifactStore()
+    with OutputPipeline() as out:
+        for h in HEIGHTS:
+            print(f"\n--- {h}mm height ---")
+            shape = create_plug(PLUG_DIAMETER, h)
+            print_dimensions(shape)
+            output_path = os.path.join(script_dir, f"conduit_plug_{h}mm.stl")
+            out.save(save_stl, shape, output_path, store=store)
+            print(f"  Saved: {output_path}")
 
     print("\nDone. Print flat side down, no supports needed.")
 
@@ -18,19 +18,25 @@ Outputs (next to this script):
   garage-street-bt-proxy-basket-lid.stl   the friction lid    (print 2)
 
 Print: PETG or ASA (NOT PLA -- a capped conduit in sun softens PLA). Vertical,
-as modeled (Z up); every feature is support-free in that orientation. Use a
-brim (tall part, small footprint).
+as modeled (Z up). Everything but the flat undersides of the upper discs is
+support-free in that orientation (see test_create_carrier.py). Use a brim
+(tall part, small footprint).
 
 Usage:  ../tools/venv/bin/python create_carrier.py
+        (runs inside ../tools/geometry_worker.py when one is serving)
 """
-import math
 import os
 import sys
 
 TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tools")
 sys.path.insert(0, TOOLS)
-from step_primitives import cut, fuse, make_box, make_cylinder, save_stl  # noqa: E402
+from step_primitives import (cut, cut_all, fuse_all, make_box, make_circle, make_cylinder,  # noqa: E402
+                             perforate, save_stl)
+from mesh_arrays import translation  # noqa: E402
+from pattern import pattern, polar_array  # noqa: E402
 from bbox import print_dimensions  # noqa: E402
+from geometry_worker import delegate_to_worker  # noqa: E402
+from output_pipeline import OutputPipeline  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Parameters (mm). Cited values are verified; tune the *_CLEAR values to your
@@ -91,7 +97,8 @@ def _disc_centers():
 
 
 def _disc(z_center):
-    return make_cylinder(CARRIER_R, DISC_T, z=z_center - DISC_T / 2.0)
+    """One centering disc with its axial flow holes, extruded from a perforated profile."""
+    return perforate(make_circle(CARRIER_R, z=z_center - DISC_T / 2.0), _flow_centers(), FLOW_D / 2.0, DISC_T)
 
 
 def _spine():
@@ -111,35 +118,29 @@ def _slot_box():
     return make_box(-w / 2.0, -t / 2.0, 0.0, w, t, GRIP_LEN + 0.01)
 
 
-def _flow_holes(z_center):
-    holes = None
-    for a in FLOW_ANGLES:
-        x = FLOW_R * math.cos(math.radians(a))
-        y = FLOW_R * math.sin(math.radians(a))
-        h = make_cylinder(FLOW_D / 2.0, DISC_T + 0.02, x=x, y=y, z=z_center - DISC_T / 2.0 - 0.01)
-        holes = h if holes is None else fuse(holes, h)
-    return holes
+def _disc_placements():
+    return [translation(0, 0, z) for z in _disc_centers()]
+
+
+def _flow_centers():
+    """(x, y) of the axial flow holes: FLOW_ANGLES around the axis."""
+    return [tuple(c) for c in polar_array(angles=FLOW_ANGLES, base=translation(FLOW_R, 0, 0))[:, :2, 3]]
 
 
 def _basket():
+    """Perforated floor + cup wall, as a list of solids."""
     z0 = GRIP_LEN
-    outer = make_cylinder(CARRIER_R, BASKET_H, z=z0)
-    cavity = make_cylinder(CARRIER_R - BASKET_WALL, BASKET_H - BASKET_FLOOR + 0.01, z=z0 + BASKET_FLOOR)
-    return cut(outer, cavity)
+    floor = perforate(make_circle(CARRIER_R, z=z0), _perf_centers(), PERF_D / 2.0, BASKET_FLOOR)
+    wall_h = BASKET_H - BASKET_FLOOR
+    outer = make_cylinder(CARRIER_R, wall_h, z=z0 + BASKET_FLOOR)
+    cavity = make_cylinder(CARRIER_R - BASKET_WALL, wall_h + 0.02, z=z0 + BASKET_FLOOR - 0.01)
+    return [floor, cut(outer, cavity)]
 
 
-def _perf_ring(z_base, thickness, with_center=True):
-    """Vertical holes in a ring (+ optional center) for floor / lid airflow."""
-    holes = None
-    for i in range(PERF_COUNT):
-        a = 2 * math.pi * i / PERF_COUNT
-        x = PERF_RING_R * math.cos(a)
-        y = PERF_RING_R * math.sin(a)
-        h = make_cylinder(PERF_D / 2.0, thickness + 0.02, x=x, y=y, z=z_base - 0.01)
-        holes = h if holes is None else fuse(holes, h)
-    if with_center:
-        holes = fuse(holes, make_cylinder(PERF_D / 2.0, thickness + 0.02, z=z_base - 0.01))
-    return holes
+def _perf_centers(with_center=True):
+    """(x, y) of the floor / lid airflow holes: a ring, plus the axis if `with_center`."""
+    ring = [tuple(c) for c in polar_array(PERF_COUNT, base=translation(PERF_RING_R, 0, 0))[:, :2, 3]]
+    return ring + [(0.0, 0.0)] if with_center else ring
 
 
 def _antenna_channel():
@@ -148,29 +149,21 @@ def _antenna_channel():
 
 
 def build_carrier():
-    disc_zs = _disc_centers()
-    solid = _spine()
-    for z in disc_zs:
-        solid = fuse(solid, _disc(z))
-    solid = fuse(solid, _basket())
-
-    solid = cut(solid, _slot_box())
-    for z in disc_zs:
-        solid = cut(solid, _flow_holes(z))
-    solid = cut(solid, _perf_ring(GRIP_LEN, BASKET_FLOOR))     # basket floor perforations
+    # discs and basket floor are extruded with their holes; only slot and channel are cut
+    solid = fuse_all([_spine(), pattern(_disc(0.0), _disc_placements())] + _basket())
+    cutters = [_slot_box()]
     if ANTENNA_CHANNEL:
-        solid = cut(solid, _antenna_channel())
-    return solid
+        cutters.append(_antenna_channel())
+    return cut_all(solid, cutters)
 
 
 def build_lid():
     bore_r = CARRIER_R - BASKET_WALL
-    top = make_cylinder(CARRIER_R, LID_TOP_T)
-    plug = make_cylinder(bore_r - LID_CLEAR, LID_PLUG_H, z=LID_TOP_T)
-    lid = fuse(top, plug)
-    lid = cut(lid, _perf_ring(0.0, LID_TOP_T + LID_PLUG_H, with_center=False))
-    lid = cut(lid, make_cylinder(LID_PULL_D / 2.0, LID_TOP_T + LID_PLUG_H + 0.02, z=-0.01))   # center pull
-    return lid
+    holes = _perf_centers(with_center=False) + [(0.0, 0.0)]                        # + center pull
+    radii = [PERF_D / 2.0] * PERF_COUNT + [LID_PULL_D / 2.0]
+    top = perforate(make_circle(CARRIER_R), holes, radii, LID_TOP_T)
+    plug = perforate(make_circle(bore_r - LID_CLEAR, z=LID_TOP_T), holes, radii, LID_PLUG_H)
+    return fuse_all([top, plug])
 
 
 def main():
@@ -182,22 +175,25 @@ def main():
     print(f"  basket:      {BASKET_H} mm, perf {PERF_D} mm (set < your bead size!)")
     print("=" * 48)
 
-    print("\n--- carrier (sled + basket) ---")
-    carrier = build_carrier()
-    print_dimensions(carrier)
-    carrier_path = os.path.join(script_dir, "garage-street-bt-proxy-carrier.stl")
-    save_stl(carrier, carrier_path)
-    print(f"  Saved: {carrier_path}")
+    # The carrier is meshed + written in the background while the lid is built
+    with OutputPipeline() as out:
+        print("\n--- carrier (sled + basket) ---")
+        carrier = build_carrier()
+        print_dimensions(carrier)
+        carrier_path = os.path.join(script_dir, "garage-street-bt-proxy-carrier.stl")
+        out.save(save_stl, carrier, carrier_path)
+        print(f"  Saved: {carrier_path}")
 
-    print("\n--- basket lid ---")
-    lid = build_lid()
-    print_dimensions(lid)
-    lid_path = os.path.join(script_dir, "garage-street-bt-proxy-basket-lid.stl")
-    save_stl(lid, lid_path)
-    print(f"  Saved: {lid_path}")
+        print("\n--- basket lid ---")
+        lid = build_lid()
+        print_dimensions(lid)
+        lid_path = os.path.join(script_dir, "garage-street-bt-proxy-basket-lid.stl")
+        out.save(save_stl, lid, lid_path)
+        print(f"  Saved: {lid_path}")
 
-    print("\nDone. Print vertical (Z up) in PETG/ASA, brim on. No supports.")
+    print("\nDone. Print vertical (Z up) in PETG/ASA, brim on, supports under the upper discs.")
 
 
 if __name__ == "__main__":
-    main()
+    if not delegate_to_worker(__file__):
+        main()
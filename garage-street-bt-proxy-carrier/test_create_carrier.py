@@ -10,50 +10,48 @@ import math
 import os
 import sys
 
-import trimesh
+import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import create_carrier as cc
+from clearance import check_clearance
+from mesh_arrays import as_indexed, rotation, translation
+from printability import analyze
+from shape import Shape
 
-CARRIER = cc.build_carrier()
-LID = cc.build_lid()
-
-
-def _mesh(shape, name):
-    path = os.path.join("/tmp", f"_test_{name}.stl")
-    cc.save_stl(shape, path)
-    return trimesh.load(path)
+CARRIER = Shape(cc.build_carrier())      # triangulated in memory once, shared by every test
+LID = Shape(cc.build_lid())
 
 
 def test_carrier_fits_conduit():
-    m = _mesh(CARRIER, "carrier")
+    m = CARRIER.trimesh
     w, d, h = (m.bounds[1] - m.bounds[0])
     assert max(w, d) < cc.CONDUIT_ID, "carrier OD must be strictly less than conduit ID (else it jams)"
     assert math.isclose(max(w, d), cc.CONDUIT_ID - cc.FIT_CLEAR, abs_tol=0.1)
 
 
 def test_carrier_height():
-    m = _mesh(CARRIER, "carrier")
+    m = CARRIER.trimesh
     h = (m.bounds[1] - m.bounds[0])[2]
     assert math.isclose(h, cc.GRIP_LEN + cc.BASKET_H, abs_tol=0.1)
 
 
 def test_carrier_is_printable_single_body():
-    m = _mesh(CARRIER, "carrier")
+    m = CARRIER.trimesh
     assert m.is_watertight, "carrier must be watertight to slice"
     assert m.body_count == 1, "carrier must be one connected piece (spine ties discs+basket)"
 
 
 def test_carrier_is_hollow():
     """Not a solid slug: discs + spine + cup should be a small fraction of the envelope."""
-    m = _mesh(CARRIER, "carrier")
+    m = CARRIER.trimesh
     envelope = math.pi * (cc.CARRIER_R ** 2) * (cc.GRIP_LEN + cc.BASKET_H)
     assert 0.10 < m.volume / envelope < 0.45
 
 
 def test_board_slot_is_open():
     """The axis at mid-grip must be empty (the PCB slot), but disc rim must be solid."""
-    m = _mesh(CARRIER, "carrier")
+    m = CARRIER.trimesh
     inside_slot = m.contains([[0, 0, cc.GRIP_LEN / 2]])[0]
     # (16,0) is past the slot edge (|x|>14.4) and off the flow-hole ring (r=15.5) -> disc body
     in_disc_body = m.contains([[16.0, 0, cc.DISC_T / 2]])[0]
@@ -62,7 +60,7 @@ def test_board_slot_is_open():
 
 
 def test_lid_seats_in_basket():
-    lm = _mesh(LID, "lid")
+    lm = LID.trimesh
     w, d, _ = (lm.bounds[1] - lm.bounds[0])
     cup_bore_d = 2 * (cc.CARRIER_R - cc.BASKET_WALL)
     # flange must be WIDER than the cup bore (so it catches on the rim) but not
@@ -76,3 +74,36 @@ def test_lid_seats_in_basket():
 def test_perf_smaller_than_typical_bead():
     """Perforations must retain beads; warn-level guard at the small end of silica gel (~2mm)."""
     assert cc.PERF_D <= 2.0
+
+
+def test_carrier_supports_only_under_upper_discs():
+    """Slot, holes and cup are support-free vertical; the upper discs' flat undersides are not."""
+    report = analyze(CARRIER)
+    assert not report.islands, report.summary()
+    upper_disc_bottoms = [z - cc.DISC_T / 2.0 for z in cc._disc_centers()[1:]]
+    assert [round(r.z, 2) for r in report.unsupported] == [round(z, 2) for z in upper_disc_bottoms]
+
+
+def test_lid_is_support_free():
+    report = analyze(LID)
+    assert report.support_free, report.summary()
+
+
+def _lid_in_place(lid):
+    """Lid turned over and seated: flange on the basket rim, plug down in the bore."""
+    vertices, faces = as_indexed(lid)
+    m = translation(0, 0, cc.CARRIER_H + cc.LID_TOP_T) @ rotation("x", 180)
+    return vertices @ m[:3, :3].T + m[:3, 3], faces
+
+
+def test_seated_lid_clears_the_basket():
+    c = check_clearance(_lid_in_place(LID), CARRIER, samples=5000)
+    assert c.interference == pytest.approx(0, abs=1e-3), c.summary()
+    assert c.min_gap > -0.01, c.summary()     # flange rests on the rim; nothing deeper
+
+
+def test_negative_lid_clearance_interferes(monkeypatch):
+    monkeypatch.setattr(cc, "LID_CLEAR", -0.2)
+    c = check_clearance(_lid_in_place(cc.build_lid()), CARRIER, samples=5000)
+    assert c.interference > 1.0
+    assert c.min_gap == pytest.approx(-0.2, abs=0.06), c.summary()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Content-addressed store for generated outputs (STL, STEP, 3MF, GLB...).
+
+Every output is stored once, under the sha256 of its bytes, compressed with
+zstd when `zstandard` is installed and deflate (zlib) otherwise:
+
+    tools/.artifacts/objects/ab/cdef....zst     (or .z)
+    tools/.artifacts/files/ab/cdef....stl       uncompressed, for hard links (link=True)
+
+A project directory keeps `artifacts.json`, a manifest of file name ->
+digest and size, next to the files themselves. Files are materialized from
+the store as independent copies by default, which saves write time but no
+disk: every copy plus the compressed object. The disk saving needs
+`link=True`, which hard-links files to one shared, read-only uncompressed
+copy. That is safe only for outputs that are always written through
+`write` or `canonical.save_stl` (and `step_primitives.save_stl(store=...)`,
+which uses it; both link by themselves) - these replace whole files, so a
+link is broken, never written through. Writers that rewrite a path in place (numpy-stl `save`,
+`StlAPI_Writer`, `save_3mf`, `save_glb`) would change every linked copy at
+once; keep their outputs on copies.
+
+With links, identical outputs - three equal plugs, a sweep of 100 variants
+of which most didn't change - cost one object and one uncompressed copy,
+and `write` of bytes the manifest records and the file still holds touches
+nothing: no compression, no file write, no mtime change.
+
+`gc` deletes objects no manifest refers to, and uncompressed copies no
+project file links to any more.
+
+Usage:
+    python artifact_store.py add conduit/*.stl       # store and record
+    python artifact_store.py checkout [dirs...]      # materialize from manifests
+    python artifact_store.py gc [--dry-run]
+    python artifact_store.py stats
+
+    from artifact_store import ArtifactStore
+    store = ArtifactStore()
+    changed = store.write("plug_12.stl", stl_bytes(plug))    # canonical.stl_bytes
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ROOT = os.environ.get("ARTIFACT_STORE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".artifacts")
+MANIFEST = "artifacts.json"
+_SKIP_DIRS = {".git", "venv", ".venv", "__pycache__", "node_modules"}
+
+
+def _compress(data: bytes) -> tuple[str, bytes]:
+    if zstandard is not None:
+        return ".zst", zstandard.ZstdCompressor(level=10).compress(data)
+    return ".z", zlib.compress(data, 6)
+
+
+def _decompress(suffix: str, data: bytes) -> bytes:
+    if suffix == ".zst":
+        if zstandard is None:
+            raise ImportError("object is zstd-compressed; pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.chmod(tmp, 0o644)                 # mkstemp creates 0600
+    os.replace(tmp, path)
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(directory: str) -> dict[str, dict]:
+    """file name -> {"sha256", "size"} for a project directory ({} without a manifest)."""
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_manifest(directory: str, entries: dict[str, dict]) -> None:
+    lines = [f"{json.dumps(k)}: {json.dumps(entries[k], sort_keys=True)}" for k in sorted(entries)]
+    data = ("{\n" + ",\n".join(lines) + "\n}\n").encode("utf-8") if lines else b"{}\n"
+    path = os.path.join(directory, MANIFEST)
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as fh:
+            if fh.read() == data:
+                return
+    _atomic_write(path, data)
+
+
+def find_manifests(root: str = REPO_ROOT) -> list[str]:
+    """Directories under `root` holding an artifacts.json."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS and not d.startswith(".artifacts")]
+        if MANIFEST in filenames:
+            found.append(dirpath)
+    return sorted(found)
+
+
+class ArtifactStore:
+    """Objects keyed by sha256 under `root`; see the module docstring for the layout."""
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = os.path.abspath(root)
+
+    def _object(self, digest: str) -> str | None:
+        base = os.path.join(self.root, "objects", digest[:2], digest[2:])
+        for suffix in (".zst", ".z"):
+            if os.path.exists(base + suffix):
+                return base + suffix
+        return None
+
+    def _file(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, "files", digest[:2], digest[2:] + ext)
+
+    def has(self, digest: str) -> bool:
+        return self._object(digest) is not None
+
+    def put(self, data: bytes) -> str:
+        """Store `data` (compressed once; a no-op if already present); returns its sha256."""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.has(digest):
+            suffix, packed = _compress(data)
+            _atomic_write(os.path.join(self.root, "objects", digest[:2], digest[2:] + suffix), packed)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        path = self._object(digest)
+        if path is None:
+            raise KeyError(f"no artifact {digest}")
+        with open(path, "rb") as fh:
+            data = _decompress(os.path.splitext(path)[1], fh.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"artifact {digest} is corrupt")
+        return data
+
+    def materialize(self, digest: str, dest: str, link: bool = False) -> bool:
+        """Put the artifact's bytes at `dest` (False if already there): a file, or a hard link to the shared copy.
+
+        Writing replaces `dest`, so a link it had to another file is broken
+        rather than written through.
+        """
+        shared = self._file(digest, os.path.splitext(dest)[1])
+        if os.path.exists(dest) and _sha256_file(dest) == digest and \
+                (not link or os.path.exists(shared) and os.path.samefile(dest, shared)):
+            return False
+        if not link:
+            _atomic_write(dest, self.get(digest))
+            return True
+        if not os.path.exists(shared) or _sha256_file(shared) != digest:     # missing, or edited through a link
+            _atomic_write(shared, self.get(digest))
+            os.chmod(shared, 0o444)              # linked files are shared: rewrite them, don't edit in place
+        tmp = os.path.join(os.path.dirname(os.path.abspath(dest)), f".tmp-{os.path.basename(dest)}")
+        try:
+            os.link(shared, tmp)
+        except OSError:                          # other filesystem, or no hard links
+            _atomic_write(dest, self.get(digest))
+            return True
+        os.replace(tmp, dest)
+        return True
+
+    def write(self, path: str, data: bytes, link: bool = False) -> bool:
+        """Store `data` as the output `path` and record it in that directory's manifest.
+
+        Returns False, without touching the store or the file, when the
+        manifest already records these bytes and the file holds them (as a
+        link to the shared copy, with `link`). A recorded file that no
+        longer holds them is restored.
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        digest = hashlib.sha256(data).hexdigest()
+        entries = load_manifest(directory)
+        if entries.get(name, {}).get("sha256") == digest and self.has(digest):
+            return self.materialize(digest, path, link)
+        self.put(data)
+        self.materialize(digest, path, link)
+        entries[name] = {"sha256": digest, "size": len(data)}
+        save_manifest(directory, entries)
+        return True
+
+    def add(self, paths: list[str], link: bool = False) -> dict[str, str]:
+        """Ingest existing files (recording them in their manifests, optionally relinking them); path -> digest."""
+        out = {}
+        for p in paths:
+            with open(p, "rb") as fh:
+                data = fh.read()
+            self.write(p, data, link)
+            out[p] = hashlib.sha256(data).hexdigest()
+        return out
+
+    def checkout(self, directory: str, link: bool = False) -> int:
+        """Materialize every file in a directory's manifest; returns how many were (re)written."""
+        return sum(self.materialize(e["sha256"], os.path.join(directory, name), link)
+                   for name, e in load_manifest(directory).items())
+
+    def objects(self) -> dict[str, str]:
+        """digest -> object path for everything in the store."""
+        out = {}
+        top = os.path.join(self.root, "objects")
+        for dirpath, _, filenames in os.walk(top):
+            for f in filenames:
+                if not f.startswith(".tmp-"):
+                    out[os.path.basename(dirpath) + os.path.splitext(f)[0]] = os.path.join(dirpath, f)
+        return out
+
+    def gc(self, manifest_dirs: list[str] | None = None, dry_run: bool = False) -> tuple[int, int]:
+        """Drop objects no manifest references and shared copies nothing links to; (files, bytes) freed."""
+        live = set()
+        for d in find_manifests() if manifest_dirs is None else manifest_dirs:
+            live.update(e["sha256"] for e in load_manifest(d).values())
+        dead = [p for digest, p in self.objects().items() if digest not in live]
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, "files")):
+            for f in filenames:
+                p = os.path.join(dirpath, f)
+                digest = os.path.basename(dirpath) + os.path.splitext(f)[0]
+                if digest not in live or os.stat(p).st_nlink <= 1:
+                    dead.append(p)
+        freed = sum(os.path.getsize(p) for p in dead)
+        if not dry_run:
+            for p in dead:
+                os.remove(p)
+        return len(dead), freed
+
+    def stats(self) -> dict[str, int]:
+        objs = self.objects()
+        return {"objects": len(objs), "stored_bytes": sum(os.path.getsize(p) for p in objs.values())}
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--store", default=DEFAULT_ROOT, help="store directory (default: tools/.artifacts, or $ARTIFACT_STORE)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("add", help="store files and record them in manifests")
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--link", action="store_true", help="replace the files with hard links to the shared copy")
+    p = sub.add_parser("checkout", help="materialize files from manifests")
+    p.add_argument("dirs", nargs="*", help="project directories (default: every manifest in the repo)")
+    p.add_argument("--link", action="store_true", help="hard links instead of copies")
+    p = sub.add_parser("gc", help="delete objects no manifest references")
+    p.add_argument("--dry-run", action="store_true")
+    sub.add_parser("stats")
+    args = ap.parse_args(argv)
+    store = ArtifactStore(args.store)
+
+    if args.command == "add":
+        for path, digest in store.add(args.paths, link=args.link).items():
+            print(f"  {digest[:12]}  {path}")
+    elif args.command == "checkout":
+        for d in args.dirs or find_manifests():
+            print(f"  {d}: {store.checkout(d, link=args.link)} file(s) written")
+    elif args.command == "gc":
+        count, freed = store.gc(dry_run=args.dry_run)
+        print(f"{'would free' if args.dry_run else 'freed'} {count} file(s), {freed / 1e6:.2f} MB")
+    else:
+        s = store.stats()
+        print(f"{s['objects']} object(s), {s['stored_bytes'] / 1e6:.2f} MB compressed "
+              f"({'zstd' if zstandard is not None else 'deflate'})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
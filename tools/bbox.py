@@ -4,28 +4,32 @@ Dispatches over the three mesh representations used in this toolkit:
 - numpy-stl `stl.Mesh`
 - OCP `TopoDS_Shape`
 - trimesh `Trimesh`
+- `shape.Shape` (uses whatever representation it already holds)
+
+None of those libraries is imported here: see `mesh_arrays.is_instance_by_name`.
 """
 from __future__ import annotations
 
 import numpy as np
-import trimesh
-from OCP.TopoDS import TopoDS_Shape
-from stl import mesh as _stl_mesh
 
-from step_primitives import get_bbox as _ocp_get_bbox
+from mesh_arrays import is_instance_by_name
 
 
 def get_extents(thing) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Return (mins, maxs, dims) as length-3 numpy arrays in mm."""
-    if isinstance(thing, _stl_mesh.Mesh):
+    if is_instance_by_name(thing, "shape", "Shape"):
+        mins, maxs = thing.bounds
+    elif is_instance_by_name(thing, "stl", "Mesh"):
         v = thing.vectors.reshape(-1, 3)
         mins = v.min(axis=0)
         maxs = v.max(axis=0)
-    elif isinstance(thing, trimesh.Trimesh):
+    elif is_instance_by_name(thing, "trimesh", "Trimesh"):
         mins = np.asarray(thing.bounds[0])
         maxs = np.asarray(thing.bounds[1])
-    elif isinstance(thing, TopoDS_Shape):
-        xmin, ymin, zmin, xmax, ymax, zmax = _ocp_get_bbox(thing)
+    elif is_instance_by_name(thing, "OCP", "TopoDS_Shape"):
+        from step_primitives import get_bbox
+
+        xmin, ymin, zmin, xmax, ymax, zmax = get_bbox(thing)
         mins = np.array([xmin, ymin, zmin])
         maxs = np.array([xmax, ymax, zmax])
     else:
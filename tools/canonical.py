@@ -0,0 +1,103 @@
+"""Canonical mesh form: an order-independent geometry hash and byte-stable STL.
+
+Two exports of the same solid can differ byte for byte: numpy-stl stamps the
+time into the header, and triangle order (and which corner comes first)
+depends on the kernel, welding and boolean order. The canonical form drops
+all of that:
+1. vertices are quantized to `quantum` mm (integers);
+2. triangles that collapse are dropped;
+3. each triangle is rotated (cyclically, keeping its winding) to start at
+   its lexicographically smallest corner;
+4. triangles are sorted by their corners.
+All steps are vectorized. `canonical_hash` is the sha256 of the packed
+result, so it ignores vertex sharing, triangle order and float noise below
+the quantum. `save_stl` writes the canonical triangles under a fixed header,
+so identical geometry always gives identical bytes, and leaves the file
+untouched (mtime included) when those bytes are already on disk.
+
+Usage:
+    from canonical import canonical_hash, save_stl
+    key = canonical_hash(part)                    # cache key / dedupe
+    changed = save_stl(part, "part.stl")          # False: file already identical
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+
+import numpy as np
+
+from mesh_arrays import as_indexed, is_instance_by_name
+
+QUANTUM = 1e-4                                    # mm
+HEADER = b"3d-prints canonical binary STL"
+_STL_RECORD = np.dtype([("normal", "<f4", 3), ("vectors", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+def _triangles(thing) -> np.ndarray:
+    if is_instance_by_name(thing, "stl", "Mesh"):
+        return thing.vectors.astype(np.float64)
+    vertices, faces = as_indexed(thing)
+    return vertices[faces]
+
+
+def canonical_triangles(thing, quantum: float = QUANTUM) -> np.ndarray:
+    """(N, 3, 3) int64 quantized triangles in canonical order (see the module docstring)."""
+    q = np.round(_triangles(thing) / quantum).astype(np.int64)
+    if not len(q):
+        return q.reshape(0, 3, 3)
+    _, rank = np.unique(q.reshape(-1, 3), axis=0, return_inverse=True)     # lexicographic corner rank
+    rank = rank.reshape(-1, 3)
+    keep = (rank[:, 0] != rank[:, 1]) & (rank[:, 1] != rank[:, 2]) & (rank[:, 2] != rank[:, 0])
+    q, rank = q[keep], rank[keep]
+    order = (rank.argmin(axis=1)[:, None] + np.arange(3)) % 3
+    rows = np.arange(len(q))[:, None]
+    q, rank = q[rows, order], rank[rows, order]
+    return q[np.lexsort((rank[:, 2], rank[:, 1], rank[:, 0]))]
+
+
+def canonical_hash(thing, quantum: float = QUANTUM) -> str:
+    """sha256 hex digest of the canonical triangles (anything `as_indexed` accepts)."""
+    h = hashlib.sha256(f"canonical-mesh/1 quantum={quantum!r}\n".encode())
+    h.update(np.ascontiguousarray(canonical_triangles(thing, quantum), dtype="<i8").tobytes())
+    return h.hexdigest()
+
+
+def stl_bytes(thing, quantum: float = QUANTUM, header: bytes = HEADER) -> bytes:
+    """Binary STL of the canonical triangles: fixed header, sorted triangles, computed normals."""
+    tri = (canonical_triangles(thing, quantum) * quantum).astype(np.float32)
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]).astype(np.float64)
+    length = np.linalg.norm(n, axis=1, keepdims=True)
+    rec = np.zeros(len(tri), dtype=_STL_RECORD)
+    rec["normal"] = np.divide(n, length, out=np.zeros_like(n), where=length > 0)
+    rec["vectors"] = tri
+    return header[:80].ljust(80, b"\0") + np.uint32(len(tri)).astype("<u4").tobytes() + rec.tobytes()
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Write `data` unless the file already holds exactly it; returns whether it was written.
+
+    The file is replaced, not rewritten in place, so a hard-linked artifact
+    (see `artifact_store`) is never modified through another link.
+    """
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as fh:
+            if fh.read() == data:
+                return False
+    tmp = os.path.join(os.path.dirname(os.path.abspath(path)), f".tmp-{os.path.basename(path)}")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def save_stl(thing, path: str, quantum: float = QUANTUM, header: bytes = HEADER, store=None) -> bool:
+    """Write a byte-stable binary STL; returns False when the file was already identical (not rewritten).
+
+    With an `artifact_store.ArtifactStore`, the bytes go through `store.write`
+    (deduplicated, recorded in the directory's manifest) and the file is a
+    hard link to the store's shared copy: safe, because this function only
+    ever replaces whole files.
+    """
+    data = stl_bytes(thing, quantum, header)
+    return store.write(str(path), data, link=True) if store is not None else write_if_changed(str(path), data)
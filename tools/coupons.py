@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Tolerance calibration coupons: one fit feature at many clearances, on one plate.
+
+Print the plate, try the real part (or the nominal gauge) in each coupon and
+read the winner's index off its notches, instead of guessing `FIT_CLEAR`,
+`SLOT_CLEAR`, `LID_CLEAR` or `POST_EXPAND_MM` and reprinting the whole part.
+
+Features (sizes are nominal, clearances per side in mm):
+- "bore" (diameter): block with a through hole of diameter + 2 x clearance;
+  the gauge is a nominal pin.
+- "slot" (width, thickness): block with a through slot grown by clearance on
+  every side; the gauge is a nominal blade, printed flat.
+- "post" (diameter): base with a post of diameter + 2 x clearance (positive
+  is tighter, like `POST_EXPAND_MM`); the gauge is a block with a nominal
+  socket.
+
+Every coupon in a set has the same footprint. Its 1-based index is written in
+binary as notches along the front (-Y) edge, least significant bit on the
+left: a deep notch is 1, a shallow one 0. Each coupon is built with
+manifold3d primitives and a single batched boolean for its cutters, and the
+set is packed onto one plate (`plate.save_plate`).
+
+Usage:
+    python coupons.py bore 17.45 --clearances 0 0.1 0.2 0.3 0.4 -o lid_bore.3mf
+    python coupons.py slot 28 1.6 --range 0.1 0.6 0.05 -o board_slot.3mf
+
+    from coupons import save_coupons
+    save_coupons("post", (3.0,), [0, 0.1, 0.2, 0.3], "posts.3mf")
+"""
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+FEATURES = {"bore": 1, "slot": 2, "post": 1}     # feature -> number of nominal sizes
+
+NOTCH_W = 1.2
+NOTCH_PITCH = 2.4
+NOTCH_DEEP = 1.6
+NOTCH_SHALLOW = 0.6
+
+
+def _cube(w: float, d: float, h: float, x: float = 0, y: float = 0, z: float = 0):
+    """Box centered on (x, y) in XY, from z to z + h."""
+    import manifold3d
+
+    return manifold3d.Manifold.cube([w, d, h], center=True).translate([x, y, z + h / 2])
+
+
+def _cylinder(r: float, h: float, z: float = 0, n: int | None = None):
+    import manifold3d
+
+    from mesh_primitives import segments
+
+    return manifold3d.Manifold.cylinder(h, r, circular_segments=n or segments(r)).translate([0, 0, z])
+
+
+def notch_bits(index: int, count: int) -> list[int]:
+    """Binary digits of `index` (1-based), least significant first, padded to fit `count` coupons."""
+    width = max(1, int(count).bit_length())
+    return [(index >> b) & 1 for b in range(width)]
+
+
+def _footprint(feature: str, size: tuple[float, ...], clearances, margin: float, bits: int) -> tuple[float, float]:
+    grow = 2 * max(max(clearances), 0.0)
+    if feature == "slot":
+        w, d = size[0] + grow + 2 * margin, size[1] + grow + 2 * margin
+    else:
+        w = d = size[0] + grow + 2 * margin
+    return max(w, bits * NOTCH_PITCH + 2 * margin), max(d, NOTCH_DEEP + margin + 2)
+
+
+def coupon(feature: str, size, clearance: float, index: int, count: int, depth: float = 6.0,
+           margin: float = 4.0, base: float = 2.0, footprint: tuple[float, float] | None = None,
+           segments: int | None = None):
+    """One coupon (a manifold3d solid resting on z=0, centered in XY)."""
+    import manifold3d
+
+    size = tuple(float(s) for s in np.atleast_1d(size))
+    if feature not in FEATURES or len(size) != FEATURES[feature]:
+        raise ValueError(f"unknown feature {feature!r} / size {size} (expected one of {FEATURES})")
+    bits = notch_bits(index, count)
+    w, d = footprint or _footprint(feature, size, [clearance], margin, len(bits))
+
+    if feature == "post":
+        body = manifold3d.Manifold.batch_boolean(
+            [_cube(w, d, base), _cylinder(size[0] / 2 + clearance, depth, z=base, n=segments)],
+            manifold3d.OpType.Add)
+        height = base
+    else:
+        body, height = _cube(w, d, depth), depth
+
+    cutters = []
+    if feature == "bore":
+        cutters.append(_cylinder(size[0] / 2 + clearance, depth + 2, z=-1, n=segments))
+    elif feature == "slot":
+        cutters.append(_cube(size[0] + 2 * clearance, size[1] + 2 * clearance, depth + 2, z=-1))
+    x0 = -(len(bits) - 1) * NOTCH_PITCH / 2
+    for i, bit in enumerate(bits):
+        deep = NOTCH_DEEP if bit else NOTCH_SHALLOW
+        cutters.append(_cube(NOTCH_W, 2 * deep, height + 2, x=x0 + i * NOTCH_PITCH, y=-d / 2, z=-1))
+    return body - manifold3d.Manifold.batch_boolean(cutters, manifold3d.OpType.Add)
+
+
+def gauge(feature: str, size, depth: float = 6.0, margin: float = 4.0, segments: int | None = None):
+    """The nominal mating piece for `feature`, resting on z=0."""
+    size = tuple(float(s) for s in np.atleast_1d(size))
+    if feature == "bore":
+        return _cylinder(size[0] / 2, depth + 4, n=segments)
+    if feature == "slot":
+        return _cube(size[0], depth + 10, size[1])
+    w = size[0] + 2 * margin
+    return _cube(w, w, depth) - _cylinder(size[0] / 2, depth + 2, z=-1, n=segments)
+
+
+def coupon_set(feature: str, size, clearances, with_gauge: bool = True, **kwargs) -> list[tuple[object, str]]:
+    """[(solid, name)] for every clearance (same footprint throughout), plus the gauge."""
+    size = tuple(float(s) for s in np.atleast_1d(size))
+    margin = kwargs.get("margin", 4.0)
+    bits = len(notch_bits(len(clearances), len(clearances)))
+    footprint = _footprint(feature, size, clearances, margin, bits)
+    out = [(coupon(feature, size, c, i + 1, len(clearances), footprint=footprint, **kwargs),
+            f"{feature} #{i + 1} {c:+.2f}") for i, c in enumerate(clearances)]
+    if with_gauge:
+        g = {k: v for k, v in kwargs.items() if k in ("depth", "margin", "segments")}
+        out.append((gauge(feature, size, **g), f"{feature} gauge"))
+    return out
+
+
+def save_coupons(feature: str, size, clearances, filepath: str, bed: tuple[float, float] = (256.0, 256.0),
+                 spacing: float = 5.0, with_gauge: bool = True, **kwargs):
+    """Build the set and write it as one packed plate (`.3mf` or `.stl`); returns the placements."""
+    from plate import save_plate
+
+    parts = coupon_set(feature, size, clearances, with_gauge=with_gauge, **kwargs)
+    return save_plate([(solid, 1, name) for solid, name in parts], filepath, bed=bed, spacing=spacing)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("feature", choices=sorted(FEATURES))
+    ap.add_argument("size", type=float, nargs="+", help="nominal size: diameter, or slot width and thickness")
+    group = ap.add_mutually_exclusive_group(required=True)
+    group.add_argument("--clearances", type=float, nargs="+", help="per-side clearances (mm)")
+    group.add_argument("--range", type=float, nargs=3, metavar=("START", "STOP", "STEP"),
+                       help="clearances START..STOP inclusive")
+    ap.add_argument("--depth", type=float, default=6.0, help="coupon (or post) height")
+    ap.add_argument("--bed", type=float, nargs=2, default=(256.0, 256.0))
+    ap.add_argument("--no-gauge", action="store_true")
+    ap.add_argument("-o", "--output", required=True, help=".3mf or .stl")
+    args = ap.parse_args(argv)
+
+    if args.range:
+        start, stop, step = args.range
+        clearances = list(np.round(np.arange(start, stop + step / 2, step), 4))
+    else:
+        clearances = args.clearances
+    placed = save_coupons(args.feature, tuple(args.size), clearances, args.output, bed=tuple(args.bed),
+                          with_gauge=not args.no_gauge, depth=args.depth)
+    for i, c in enumerate(clearances):
+        code = "".join("D" if b else "s" for b in notch_bits(i + 1, len(clearances)))
+        print(f"  #{i + 1:<3d} {c:+.3f} mm   notches {code}")
+    print(f"{len(placed)} part(s) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,14 @@ that press-fits into the light slots cut in the Apollo R-PRO-1 case.
 Two variants: loose (0.1mm clearance) and press (-0.04mm interference fit for 100.7% XY scale).
 
 Output: ../apollo-r-pro-1-case/r_pro-1_lens_cover_{loose,press}.step
+        ../apollo-r-pro-1-case/r_pro-1_lens_cover_plate.3mf (2 of each, packed)
 """
 import os
 
 from step_primitives import fuse, make_box, save_step
 from bbox import print_dimensions
+from output_pipeline import OutputPipeline
+from plate import save_plate
 
 SLOT_WIDTH = 40.0
 SLOT_HEIGHT = 10.0
@@ -25,6 +28,9 @@ FLANGE_LIP = 1.0
 FLANGE_THICKNESS = 0.8
 INSERT_DEPTH = 2.0
 
+COPIES = 2                 # one per light slot
+BED = (256.0, 256.0)
+
 
 def create_lens_cover(clearance: float):
     insert_w = SLOT_WIDTH - 2 * clearance
@@ -44,23 +50,28 @@ def main():
     print("Lens Cover Generator")
     print("=" * 40)
 
-    for suffix, clearance in VARIANTS:
-        print(f"\n--- Variant: {suffix} (clearance {clearance:+.2f} mm/side) ---")
-        print(f"Slot opening:      {SLOT_WIDTH} x {SLOT_HEIGHT} mm")
-        print(f"Insert body:       {SLOT_WIDTH - 2*clearance} x {SLOT_HEIGHT - 2*clearance} x {INSERT_DEPTH} mm")
-        print(f"Flange:            {SLOT_WIDTH + 2*FLANGE_LIP} x {SLOT_HEIGHT + 2*FLANGE_LIP} x {FLANGE_THICKNESS} mm")
-        print(f"Total depth:       {FLANGE_THICKNESS + INSERT_DEPTH} mm")
-        print()
-
-        cover = create_lens_cover(clearance)
-        print_dimensions(cover)
-        print()
-
-        output_path = os.path.join(output_dir, f"r_pro-1_lens_cover_{suffix}.step")
-        save_step(cover, output_path)
-        print(f"Saved: {output_path}")
-
-    print("\nPrint 2 copies of each variant (one per slot).")
+    with OutputPipeline() as out:
+        plate = []
+        for suffix, clearance in VARIANTS:
+            print(f"\n--- Variant: {suffix} (clearance {clearance:+.2f} mm/side) ---")
+            print(f"Slot opening:      {SLOT_WIDTH} x {SLOT_HEIGHT} mm")
+            print(f"Insert body:       {SLOT_WIDTH - 2*clearance} x {SLOT_HEIGHT - 2*clearance} x {INSERT_DEPTH} mm")
+            print(f"Flange:            {SLOT_WIDTH + 2*FLANGE_LIP} x {SLOT_HEIGHT + 2*FLANGE_LIP} x {FLANGE_THICKNESS} mm")
+            print(f"Total depth:       {FLANGE_THICKNESS + INSERT_DEPTH} mm")
+            print()
+
+            cover = create_lens_cover(clearance)
+            print_dimensions(cover)
+            print()
+
+            output_path = os.path.join(output_dir, f"r_pro-1_lens_cover_{suffix}.step")
+            out.save(save_step, cover, output_path)
+            print(f"Saved: {output_path}")
+            plate.append((cover, COPIES, f"lens_cover_{suffix}"))
+
+        plate_path = os.path.join(output_dir, "r_pro-1_lens_cover_plate.3mf")
+        out.save(save_plate, plate, plate_path, bed=BED, spacing=5.0)
+        print(f"\nSaved: {plate_path} ({COPIES} copies of each variant, flange down)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""Binary glTF (GLB) writer for web previews.
+
+Indexed geometry, one glTF mesh per distinct part and one node per instance,
+so repeated legs/posts/bosses are stored once and placed by node matrices.
+With `quantize=True` positions are stored as normalized int16
+(KHR_mesh_quantization) and the dequantization scale/offset is folded into
+each node matrix -- roughly half the position bytes of float32.
+
+Output is Y-up (glTF convention) via a single root node; geometry stays in mm.
+
+Usage:
+    from export_glb import save_glb
+    save_glb([(leg, leg_transforms, "legs"), (shelf, np.eye(4), "shelf")], "stand.glb")
+"""
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+
+from mesh_arrays import as_indexed, normalize_parts, rotation
+
+_GLB_MAGIC = 0x46546C67
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_UBYTE, _FLOAT, _SHORT, _USHORT, _UINT = 5121, 5126, 5122, 5123, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+_INT16_MAX = 32767
+
+
+def _column_major(t: np.ndarray) -> list[float]:
+    return [float(x) for x in np.asarray(t, dtype=np.float64).T.ravel()]
+
+
+class _Buffer:
+    """Accumulates 4-byte-aligned bufferViews into one binary chunk."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.views: list[dict] = []
+
+    def add(self, arr: np.ndarray, target: int) -> int:
+        raw = np.ascontiguousarray(arr).tobytes()
+        self.views.append({"buffer": 0, "byteOffset": len(self.data), "byteLength": len(raw), "target": target})
+        self.data += raw
+        self.data += b"\0" * (-len(self.data) % 4)
+        return len(self.views) - 1
+
+
+def save_glb(parts, filepath: str, quantize: bool = False, deflection: float = 0.05, colors=None) -> None:
+    """Write parts (see `mesh_arrays.normalize_parts`) as a single GLB file.
+
+    `colors`, if given, lists per part an (V, 3|4) uint8 array of vertex
+    colors (COLOR_0), one row per `as_indexed` vertex, or None.
+    """
+    buf = _Buffer()
+    accessors, meshes, nodes = [], [], []
+    for mid, (thing, transforms, name) in enumerate(normalize_parts(parts)):
+        vertices, faces = as_indexed(thing, deflection=deflection)
+        name = name or f"part_{mid}"
+
+        dequant = np.eye(4)
+        if quantize:
+            lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+            center, half = (lo + hi) / 2, (hi - lo) / 2
+            half[half == 0] = 1.0
+            q = np.round((vertices - center) / half * _INT16_MAX).astype(np.int16)
+            # int16 VEC3 rows are 6 bytes; vertex attributes must be 4-byte aligned
+            pos = np.zeros((len(q), 4), dtype=np.int16)
+            pos[:, :3] = q
+            view = buf.add(pos, _ARRAY_BUFFER)
+            buf.views[view]["byteStride"] = 8
+            accessors.append({"bufferView": view, "componentType": _SHORT, "normalized": True,
+                              "count": len(q), "type": "VEC3",
+                              "min": q.min(axis=0).tolist(), "max": q.max(axis=0).tolist()})
+            dequant[:3, :3] = np.diag(half)
+            dequant[:3, 3] = center
+        else:
+            pos = vertices.astype(np.float32)
+            accessors.append({"bufferView": buf.add(pos, _ARRAY_BUFFER), "componentType": _FLOAT,
+                              "count": len(pos), "type": "VEC3",
+                              "min": pos.min(axis=0).tolist(), "max": pos.max(axis=0).tolist()})
+        pos_acc = len(accessors) - 1
+
+        small = len(vertices) <= 0xFFFF
+        idx = faces.astype(np.uint16 if small else np.uint32).ravel()
+        accessors.append({"bufferView": buf.add(idx, _ELEMENT_ARRAY_BUFFER),
+                          "componentType": _USHORT if small else _UINT,
+                          "count": len(idx), "type": "SCALAR"})
+        idx_acc = len(accessors) - 1
+        attributes = {"POSITION": pos_acc}
+        if colors is not None and colors[mid] is not None:
+            rgba = np.full((len(vertices), 4), 255, dtype=np.uint8)
+            rgba[:, :np.shape(colors[mid])[1]] = colors[mid]
+            accessors.append({"bufferView": buf.add(rgba, _ARRAY_BUFFER), "componentType": _UBYTE,
+                              "normalized": True, "count": len(rgba), "type": "VEC4"})
+            attributes["COLOR_0"] = len(accessors) - 1
+        meshes.append({"name": name, "primitives": [{"attributes": attributes, "indices": idx_acc, "mode": 4}]})
+
+        for i, t in enumerate(transforms):
+            node = {"name": f"{name}_{i}" if len(transforms) > 1 else name, "mesh": mid}
+            m = t @ dequant
+            if not np.allclose(m, np.eye(4)):
+                node["matrix"] = _column_major(m)
+            nodes.append(node)
+
+    root = {"name": "root", "matrix": _column_major(rotation("x", -90)), "children": list(range(len(nodes)))}
+    nodes.append(root)
+    gltf = {
+        "asset": {"version": "2.0", "generator": "3d-prints/tools export_glb"},
+        "scene": 0,
+        "scenes": [{"nodes": [len(nodes) - 1]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "accessors": accessors,
+        "bufferViews": buf.views,
+        "buffers": [{"byteLength": len(buf.data)}],
+    }
+    if quantize:
+        gltf["extensionsUsed"] = gltf["extensionsRequired"] = ["KHR_mesh_quantization"]
+
+    js = json.dumps(gltf, separators=(",", ":")).encode()
+    js += b" " * (-len(js) % 4)
+    total = 12 + 8 + len(js) + 8 + len(buf.data)
+    with open(filepath, "wb") as fh:
+        fh.write(struct.pack("<III", _GLB_MAGIC, 2, total))
+        fh.write(struct.pack("<II", len(js), _CHUNK_JSON) + js)
+        fh.write(struct.pack("<II", len(buf.data), _CHUNK_BIN) + bytes(buf.data))
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Geometric fingerprints of generated parts, and a regression database of them.
+
+A fingerprint is volume, surface area, centroid, inertia tensor (about the
+centroid, unit density) and bounding box:
+- meshes (numpy-stl, trimesh, `(vertices, faces)`, `Shape`...): one
+  vectorized pass over the triangles, each taken as a tetrahedron with the
+  origin (`mass_properties`);
+- OCP shapes: exact, from OpenCASCADE's GProp.
+Comparing fingerprints is far cheaper than a geometric diff and ignores what
+doesn't matter (triangle order, STL header, tessellation noise), so it can
+run after every regeneration.
+
+`fingerprints.json` (next to this file) holds one record per output file,
+keyed by its path relative to the repo root. `record` writes records and
+`check` compares fresh files against them, within `Tolerance`. Files whose
+bytes are unchanged (same sha256) pass without being read as meshes.
+
+Usage:
+    python fingerprint.py record                 # every *.stl in the repo
+    python fingerprint.py check                  # exit status 1 on any change
+    python fingerprint.py check part.stl --rel 1e-4
+    python fingerprint.py compare a.stl b.stl    # how far apart are two outputs?
+
+    from fingerprint import fingerprint
+    fp = fingerprint(build_carrier())
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from mesh_arrays import as_indexed, is_instance_by_name
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fingerprints.json")
+
+
+@dataclasses.dataclass(frozen=True)
+class Tolerance:
+    rel: float = 1e-3        # volume, area, inertia (inertia relative to its norm)
+    abs: float = 0.01        # mm, centroid and bounding box
+
+
+@dataclasses.dataclass(frozen=True)
+class Fingerprint:
+    volume: float                                  # mm³
+    area: float                                    # mm²
+    centroid: tuple[float, float, float]
+    inertia: tuple[tuple[float, ...], ...]         # 3x3, about the centroid, density 1 (mm⁵)
+    bbox_min: tuple[float, float, float]
+    bbox_max: tuple[float, float, float]
+    triangles: int = 0                             # 0 for an exact (BRep) fingerprint
+    sha256: str | None = None                      # of the file it was read from
+
+    def to_json(self) -> dict:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_json(cls, d: dict) -> "Fingerprint":
+        return cls(**{**d, "inertia": tuple(tuple(r) for r in d["inertia"]), "centroid": tuple(d["centroid"]),
+                      "bbox_min": tuple(d["bbox_min"]), "bbox_max": tuple(d["bbox_max"])})
+
+    def differences(self, other: "Fingerprint", tol: Tolerance = Tolerance()) -> list[str]:
+        """Human-readable list of the properties of `other` outside `tol` of this one (empty: same part)."""
+        out = []
+        for name in ("volume", "area"):
+            a, b = getattr(self, name), getattr(other, name)
+            if abs(b - a) > tol.rel * max(abs(a), abs(b)):
+                out.append(f"{name} {a:.6g} -> {b:.6g} ({(b - a) / a:+.3%})" if a else f"{name} {a:.6g} -> {b:.6g}")
+        for name in ("centroid", "bbox_min", "bbox_max"):
+            a, b = np.array(getattr(self, name)), np.array(getattr(other, name))
+            if np.abs(b - a).max() > tol.abs:
+                out.append(f"{name} moved {np.round(b - a, 4).tolist()} mm")
+        a, b = np.array(self.inertia), np.array(other.inertia)
+        if np.linalg.norm(b - a) > tol.rel * max(np.linalg.norm(a), np.linalg.norm(b)):
+            out.append(f"inertia changed by {np.linalg.norm(b - a) / np.linalg.norm(a):.3%}")
+        return out
+
+
+def mass_properties(triangles: np.ndarray) -> tuple[float, float, np.ndarray, np.ndarray]:
+    """(volume, area, centroid, inertia about the centroid) of a closed, outward-wound (N, 3, 3) soup.
+
+    Every triangle spans a signed tetrahedron with the origin; their sums are
+    the solid's moments (divergence theorem), all in one batched pass.
+    """
+    tri = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+    cross = np.cross(b - a, c - a)
+    area = 0.5 * float(np.linalg.norm(cross, axis=1).sum())
+    det = np.einsum("ij,ij->i", a, np.cross(b, c))                  # 6 x signed tetra volume
+    volume = det.sum() / 6.0
+    if abs(volume) < 1e-12:
+        return 0.0, area, tri.reshape(-1, 3).mean(axis=0), np.zeros((3, 3))
+    s = a + b + c
+    centroid = (det[:, None] * s).sum(axis=0) / 24.0 / volume      # tetra centroid = s / 4
+    # second moment of each tetra about the origin: det / 120 x (sum v v^T + s s^T)
+    second = np.einsum("t,tij->ij", det, np.einsum("tvi,tvj->tij", tri, tri) + np.einsum("ti,tj->tij", s, s)) / 120.0
+    second -= volume * np.outer(centroid, centroid)                  # move to the centroid
+    inertia = np.trace(second) * np.eye(3) - second
+    return float(volume), area, centroid, inertia
+
+
+def _brep_fingerprint(shape) -> Fingerprint:
+    from OCP.BRepGProp import BRepGProp
+    from OCP.GProp import GProp_GProps
+
+    from step_primitives import get_bbox
+
+    vol, surf = GProp_GProps(), GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, vol)
+    BRepGProp.SurfaceProperties_s(shape, surf)
+    c, m = vol.CentreOfMass(), vol.MatrixOfInertia()
+    b = get_bbox(shape)
+    return Fingerprint(volume=vol.Mass(), area=surf.Mass(), centroid=(c.X(), c.Y(), c.Z()),
+                       inertia=tuple(tuple(m.Value(i, j) for j in (1, 2, 3)) for i in (1, 2, 3)),
+                       bbox_min=tuple(b[:3]), bbox_max=tuple(b[3:]))
+
+
+def fingerprint(thing) -> Fingerprint:
+    """Fingerprint of an OCP shape (exact) or anything `mesh_arrays.as_indexed` accepts."""
+    if is_instance_by_name(thing, "OCP", "TopoDS_Shape"):
+        return _brep_fingerprint(thing)
+    if is_instance_by_name(thing, "stl", "Mesh"):
+        tri = thing.vectors
+    else:
+        vertices, faces = as_indexed(thing)
+        tri = vertices[faces]
+    volume, area, centroid, inertia = mass_properties(tri)
+    pts = tri.reshape(-1, 3)
+    return Fingerprint(volume=volume, area=area, centroid=tuple(centroid.tolist()),
+                       inertia=tuple(tuple(r) for r in inertia.tolist()),
+                       bbox_min=tuple(pts.min(axis=0).astype(float).tolist()),
+                       bbox_max=tuple(pts.max(axis=0).astype(float).tolist()), triangles=len(tri))
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint_file(path: str, digest: str | None = None) -> Fingerprint:
+    from stl import mesh as stl_mesh
+
+    return dataclasses.replace(fingerprint(stl_mesh.Mesh.from_file(path)), sha256=digest or _sha256(path))
+
+
+def _key(path: str, root: str) -> str:
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+
+
+def load_db(db_path: str = DB_PATH) -> dict[str, Fingerprint]:
+    if not os.path.exists(db_path):
+        return {}
+    with open(db_path, encoding="utf-8") as fh:
+        return {k: Fingerprint.from_json(v) for k, v in json.load(fh).items()}
+
+
+def _round(value, digits: int = 10):
+    if isinstance(value, float):
+        return float(f"{value:.{digits}g}")
+    if isinstance(value, (list, tuple)):
+        return [_round(v, digits) for v in value]
+    return value
+
+
+def save_db(db: dict[str, Fingerprint], db_path: str = DB_PATH) -> None:
+    """One record per line, sorted by path, so regenerations give small diffs."""
+    lines = [f"{json.dumps(k)}: {json.dumps({f: _round(v) for f, v in db[k].to_json().items()})}" for k in sorted(db)]
+    with open(db_path, "w", encoding="utf-8") as fh:
+        fh.write("{\n" + ",\n".join(lines) + "\n}\n")
+
+
+def record(paths: list[str], db_path: str = DB_PATH, root: str = REPO_ROOT) -> dict[str, Fingerprint]:
+    """Fingerprint `paths` and store them in the database; returns the new records."""
+    db = load_db(db_path)
+    fresh = {_key(p, root): fingerprint_file(p) for p in paths}
+    db.update(fresh)
+    save_db(db, db_path)
+    return fresh
+
+
+def check(paths: list[str], tol: Tolerance = Tolerance(), db_path: str = DB_PATH,
+          root: str = REPO_ROOT) -> dict[str, list[str]]:
+    """path key -> differences against the database ([] = within tolerance, ["not recorded"] if new)."""
+    db = load_db(db_path)
+    out = {}
+    for p in paths:
+        key, digest = _key(p, root), _sha256(p)
+        old = db.get(key)
+        if old is None:
+            out[key] = ["not recorded"]
+        elif old.sha256 == digest:
+            out[key] = []
+        else:
+            out[key] = old.differences(fingerprint_file(p, digest), tol)
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from print_estimate import find_stls
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="command", required=True)
+    for name in ("record", "check"):
+        p = sub.add_parser(name)
+        p.add_argument("paths", nargs="*", help="STL files (default: every *.stl in the repo)")
+        p.add_argument("--db", default=DB_PATH)
+        p.add_argument("--rel", type=float, default=Tolerance.rel, help="relative tolerance")
+        p.add_argument("--abs", type=float, default=Tolerance.abs, help="mm, centroid and bbox")
+    p = sub.add_parser("compare")
+    p.add_argument("a")
+    p.add_argument("b")
+    args = ap.parse_args(argv)
+
+    if args.command == "compare":
+        fa, fb = fingerprint_file(args.a), fingerprint_file(args.b)
+        diffs = fa.differences(fb, Tolerance(rel=0.0, abs=0.0))
+        print("identical bytes" if fa.sha256 == fb.sha256 else "\n".join(diffs) or "same fingerprint")
+        return 0
+
+    paths = [os.path.abspath(p) for p in args.paths] or find_stls()
+    if args.command == "record":
+        for key, fp in record(paths, args.db).items():
+            print(f"  {key}: {fp.volume / 1000:.3f} cm³, {fp.triangles} triangles")
+        return 0
+
+    results = check(paths, Tolerance(rel=args.rel, abs=args.abs), args.db)
+    for key, diffs in results.items():
+        print(f"  {'ok     ' if not diffs else 'CHANGED'} {key}" + "".join(f"\n      {d}" for d in diffs))
+    changed = sum(bool(d) for d in results.values())
+    print(f"{len(results) - changed} ok, {changed} changed")
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
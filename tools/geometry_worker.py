@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Long-lived geometry worker: keeps OCP / trimesh / manifold3d warm between runs.
+
+A tuning session re-runs the same generator dozens of times with one number
+changed; each cold run pays interpreter + kernel import/initialization before
+any geometry happens. The worker pays that once, then runs jobs in-process.
+
+A job is a generator script plus top-level parameter overrides:
+
+    {"script": "/abs/path/create_carrier.py", "overrides": {"FIT_CLEAR": 0.8}}
+
+Overrides replace the right-hand side of the matching top-level assignment
+before the script runs, so derived constants (`CARRIER_R = (CONDUIT_ID -
+FIT_CLEAR) / 2`) follow. The script's `main()` is called if it has one;
+otherwise running the module body is the job. The reply carries the output
+files the job wrote, its captured stdout and timings. Source meshes/STEPs
+loaded through `step_primitives.load_step` or `trimesh.load` are cached by
+(path, mtime, size) across jobs.
+
+Usage:
+    python geometry_worker.py serve            # Unix socket (see SOCKET_PATH)
+    python geometry_worker.py serve --stdio    # JSON lines on stdin/stdout
+    python geometry_worker.py run create_carrier.py FIT_CLEAR=0.8
+    python geometry_worker.py stop
+
+Generators opt in with `delegate_to_worker(__file__)` (see create_carrier.py):
+it forwards the run to a live worker and returns False when none is running.
+Set GEOMETRY_WORKER=0 to force a local run.
+"""
+from __future__ import annotations
+
+import ast
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import types
+
+SOCKET_PATH = os.environ.get("GEOMETRY_WORKER_SOCKET") or os.path.join(
+    tempfile.gettempdir(), f"3d-prints-geometry-worker-{os.getuid()}.sock"
+)
+_SKIP_DIRS = {"venv", "__pycache__", "node_modules"}
+
+
+def _apply_overrides(tree: ast.Module, overrides: dict) -> None:
+    """Replace `NAME = ...` at module top level for every NAME in overrides."""
+    remaining = set(overrides)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            name = node.target.id
+        else:
+            continue
+        if name in overrides:
+            node.value = ast.copy_location(ast.parse(repr(overrides[name]), mode="eval").body, node.value)
+            remaining.discard(name)
+    if remaining:
+        raise KeyError(f"no top-level assignment for override(s): {', '.join(sorted(remaining))}")
+    ast.fix_missing_locations(tree)
+
+
+def _snapshot(roots: list[str], depth: int = 2) -> dict[str, int]:
+    """path -> mtime_ns for files under roots (depth-limited, skips dot/venv dirs)."""
+    seen: dict[str, int] = {}
+
+    def walk(d, level):
+        try:
+            entries = list(os.scandir(d))
+        except OSError:
+            return
+        for e in entries:
+            if e.is_file(follow_symlinks=False):
+                seen[os.path.abspath(e.path)] = e.stat().st_mtime_ns
+            elif e.is_dir(follow_symlinks=False) and level < depth \
+                    and not e.name.startswith(".") and e.name not in _SKIP_DIRS:
+                walk(e.path, level + 1)
+
+    for r in roots:
+        walk(r, 0)
+    return seen
+
+
+class GeometryWorker:
+    """Runs generator jobs in this process with warm kernels and a source cache."""
+
+    def __init__(self):
+        self.cache: dict[tuple, object] = {}
+        self.cache_hits = 0
+        self._installed = False
+
+    def preload(self) -> float:
+        """Import + exercise the kernels once; returns seconds spent."""
+        t0 = time.perf_counter()
+        import manifold3d
+        import trimesh  # noqa: F401
+
+        import step_primitives as sp
+        sp.triangulate(sp.cut(sp.make_box(0, 0, 0, 2, 2, 2), sp.make_cylinder(0.5, 3)))
+        manifold3d.Manifold.cube([1, 1, 1]) - manifold3d.Manifold.sphere(0.6)
+        self.install_caches()
+        return time.perf_counter() - t0
+
+    def install_caches(self) -> None:
+        """Route `step_primitives.load_step` and `trimesh.load` through the cache."""
+        if self._installed:
+            return
+        import trimesh
+
+        import step_primitives as sp
+        sp.load_step = self._cached(sp.load_step, copy=False)    # OCP shapes are never mutated in place
+        trimesh.load = self._cached(trimesh.load, copy=True)
+        self._installed = True
+
+    def _cached(self, loader, copy: bool):
+        def load(path, *args, **kwargs):
+            try:
+                st = os.stat(path)
+            except (TypeError, OSError):
+                return loader(path, *args, **kwargs)
+            key = (loader.__module__, loader.__name__, os.path.abspath(path), st.st_mtime_ns, st.st_size,
+                   args, tuple(sorted(kwargs.items())))
+            if key in self.cache:
+                self.cache_hits += 1
+            else:
+                self.cache[key] = loader(path, *args, **kwargs)
+            obj = self.cache[key]
+            return obj.copy() if copy and hasattr(obj, "copy") else obj
+        load.__wrapped__ = loader
+        return load
+
+    def run_job(self, job: dict) -> dict:
+        """Run one job dict; never raises (errors come back in the reply)."""
+        t0 = time.perf_counter()
+        out = io.StringIO()
+        try:
+            script = os.path.abspath(job["script"])
+            script_dir = os.path.dirname(script)
+            with open(script, encoding="utf-8") as fh:
+                tree = ast.parse(fh.read(), filename=script)
+            _apply_overrides(tree, job.get("overrides") or {})
+            code = compile(tree, script, "exec")
+
+            roots = [os.path.abspath(p) for p in job.get("watch") or [os.path.dirname(script_dir)]]
+            before = _snapshot(roots)
+            hits0 = self.cache_hits
+            module = types.ModuleType(os.path.splitext(os.path.basename(script))[0])
+            module.__file__ = script
+            old_cwd, old_path = os.getcwd(), list(sys.path)
+            t1 = time.perf_counter()
+            try:
+                os.chdir(script_dir)
+                sys.path.insert(0, script_dir)
+                with contextlib.redirect_stdout(out):
+                    exec(code, module.__dict__)
+                    entry = job.get("entry", "main")
+                    if entry and callable(module.__dict__.get(entry)):
+                        module.__dict__[entry]()
+            finally:
+                os.chdir(old_cwd)
+                sys.path[:] = old_path
+            t2 = time.perf_counter()
+            after = _snapshot(roots)
+            outputs = sorted(p for p, m in after.items() if before.get(p) != m)
+            return {"ok": True, "outputs": outputs, "stdout": out.getvalue(),
+                    "cache_hits": self.cache_hits - hits0,
+                    "timings": {"prepare_s": t1 - t0, "run_s": t2 - t1, "total_s": time.perf_counter() - t0}}
+        except (Exception, SystemExit) as exc:   # a script calling sys.exit must not kill the worker
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}", "traceback": traceback.format_exc(),
+                    "stdout": out.getvalue(), "timings": {"total_s": time.perf_counter() - t0}}
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op", "run")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "cached_sources": len(self.cache)}
+        if op == "run":
+            return self.run_job(request)
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+
+def make_server(worker: GeometryWorker, path: str = SOCKET_PATH) -> socketserver.UnixStreamServer:
+    """Unix-socket server: one JSON request line in, one JSON reply line out, per connection."""
+    if os.path.exists(path):
+        os.remove(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            if request.get("op") == "stop":
+                reply = {"ok": True}
+                # shutdown() blocks until serve_forever returns; do it off this thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                reply = worker.handle(request)
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+
+    return socketserver.UnixStreamServer(path, Handler)
+
+
+def serve_stdio(worker: GeometryWorker) -> None:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if request.get("op") == "stop":
+            break
+        sys.__stdout__.write(json.dumps(worker.handle(request)) + "\n")
+        sys.__stdout__.flush()
+
+
+def request(payload: dict, path: str = SOCKET_PATH, timeout: float | None = None) -> dict:
+    """Send one request to a running worker. Raises OSError if none is listening."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(path)
+        s.sendall((json.dumps(payload) + "\n").encode())
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf)
+
+
+def delegate_to_worker(script: str, overrides: dict | None = None, path: str = SOCKET_PATH) -> bool:
+    """Run `script` in a live worker and echo its output. False if no worker is up."""
+    if os.environ.get("GEOMETRY_WORKER", "1") == "0" or not os.path.exists(path):
+        return False
+    try:
+        reply = request({"op": "run", "script": os.path.abspath(script), "overrides": overrides or {}}, path)
+    except OSError:
+        return False
+    sys.stdout.write(reply.get("stdout", ""))
+    if not reply["ok"]:
+        raise RuntimeError(f"geometry worker job failed: {reply['error']}\n{reply.get('traceback', '')}")
+    t = reply["timings"]
+    print(f"[worker] {t['total_s']:.2f}s ({t['run_s']:.2f}s run), "
+          f"{len(reply['outputs'])} output(s), {reply['cache_hits']} cached source load(s)")
+    return True
+
+
+def _parse_overrides(pairs: list[str]) -> dict:
+    out = {}
+    for p in pairs:
+        name, _, raw = p.partition("=")
+        try:
+            out[name] = json.loads(raw)
+        except json.JSONDecodeError:
+            out[name] = raw
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve")
+    s.add_argument("--socket", default=SOCKET_PATH)
+    s.add_argument("--stdio", action="store_true", help="read JSON jobs from stdin instead of a socket")
+    r = sub.add_parser("run")
+    r.add_argument("script")
+    r.add_argument("overrides", nargs="*", metavar="NAME=VALUE")
+    r.add_argument("--socket", default=SOCKET_PATH)
+    st = sub.add_parser("stop")
+    st.add_argument("--socket", default=SOCKET_PATH)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        worker = GeometryWorker()
+        warm = worker.preload()
+        if args.stdio:
+            serve_stdio(worker)
+            return 0
+        server = make_server(worker, args.socket)
+        print(f"geometry worker pid {os.getpid()} on {args.socket} (kernels warm in {warm:.2f}s)")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(args.socket):
+                os.remove(args.socket)
+        return 0
+    if args.cmd == "run":
+        reply = request({"op": "run", "script": os.path.abspath(args.script),
+                         "overrides": _parse_overrides(args.overrides)}, args.socket)
+        sys.stdout.write(reply.get("stdout", ""))
+        print(json.dumps({k: v for k, v in reply.items() if k != "stdout"}, indent=2))
+        return 0 if reply["ok"] else 1
+    request({"op": "stop"}, args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Indexed (vertices, faces) numpy views of the toolkit's mesh types.
+
+Exporters that want shared vertices (3MF, GLB) go through `as_indexed`, which
+dispatches over the same representations as `bbox.get_extents`:
+- numpy-stl `stl.Mesh` (triangle soup, welded here)
+- OCP `TopoDS_Shape` (meshed and read in memory by `step_primitives.triangulate`)
+- trimesh `Trimesh`
+- manifold3d `Manifold`
+- a plain `(vertices, faces)` pair
+- a `shape.Shape`, whose cached conversion is reused
+
+`as_manifold` goes the other way, for manifold3d booleans on any of them.
+Also holds the 4x4 transform helpers used for instancing.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def is_instance_by_name(thing, package: str, name: str) -> bool:
+    """isinstance() by top-level package and class name, without importing it.
+
+    Walks the MRO, so subclasses match. Lets type dispatch over numpy-stl /
+    trimesh / OCP stay free for scripts that only ever load one of them (and
+    is indifferent to OCP's `OCP.X` vs `OCP.OCP.X` module layout).
+    """
+    return any(c.__name__ == name and c.__module__.split(".")[0] == package
+               for c in type(thing).__mro__)
+
+
+def weld(triangles: np.ndarray, decimals: int = 6) -> tuple[np.ndarray, np.ndarray]:
+    """Merge coincident corners of an (N, 3, 3) triangle soup.
+
+    Returns (vertices (V, 3) float64, faces (N, 3) int64).
+    """
+    tri = np.asarray(triangles, dtype=np.float64).reshape(-1, 3)
+    keys = np.round(tri, decimals) + 0.0   # + 0.0 folds -0.0 into 0.0
+    vertices, inverse = np.unique(keys, axis=0, return_inverse=True)
+    return vertices, inverse.reshape(-1, 3).astype(np.int64)
+
+
+def as_indexed(thing, deflection: float = 0.05) -> tuple[np.ndarray, np.ndarray]:
+    """Return (vertices, faces) for any supported mesh/shape type."""
+    if isinstance(thing, tuple) and len(thing) == 2:
+        vertices, faces = thing
+        return np.asarray(vertices, dtype=np.float64), np.asarray(faces, dtype=np.int64)
+    if is_instance_by_name(thing, "shape", "Shape"):
+        return thing.indexed
+    if is_instance_by_name(thing, "stl", "Mesh"):
+        return weld(thing.vectors)
+    if is_instance_by_name(thing, "trimesh", "Trimesh"):
+        return np.asarray(thing.vertices, dtype=np.float64), np.asarray(thing.faces, dtype=np.int64)
+    if is_instance_by_name(thing, "manifold3d", "Manifold"):
+        m = thing.to_mesh()
+        return np.asarray(m.vert_properties, dtype=np.float64)[:, :3], np.asarray(m.tri_verts, dtype=np.int64)
+    if is_instance_by_name(thing, "OCP", "TopoDS_Shape"):
+        from step_primitives import triangulate
+
+        return triangulate(thing, deflection=deflection)
+    raise TypeError(f"Unsupported shape type: {type(thing).__name__}")
+
+
+def as_manifold(thing, tolerance: float = 0.01):
+    """manifold3d.Manifold of any `as_indexed` input (must be closed; raises ValueError otherwise)."""
+    import manifold3d
+
+    if isinstance(thing, manifold3d.Manifold):
+        return thing
+    if is_instance_by_name(thing, "shape", "Shape"):
+        return thing.manifold
+    vertices, faces = as_indexed(thing)
+    solid = manifold3d.Manifold(manifold3d.Mesh(vert_properties=np.ascontiguousarray(vertices, dtype=np.float32),
+                                                tri_verts=np.ascontiguousarray(faces, dtype=np.uint32),
+                                                tolerance=tolerance))
+    if solid.status() != manifold3d.Error.NoError:
+        raise ValueError(f"not a closed manifold mesh: {solid.status()}")
+    return solid
+
+
+def normalize_parts(parts) -> list[tuple[object, np.ndarray, str | None]]:
+    """Normalize an exporter `parts` argument to [(mesh, (N, 4, 4) transforms, name)].
+
+    Accepts a bare mesh/shape, or a list whose entries are a mesh/shape (placed
+    once, untransformed) or `(mesh, transforms)` / `(mesh, transforms, name)`,
+    with `transforms` one 4x4 matrix or a stack of them.
+    """
+    if not isinstance(parts, list):
+        parts = [parts]
+    out = []
+    for p in parts:
+        name = None
+        if isinstance(p, tuple) and len(p) in (2, 3) and not isinstance(p[0], np.ndarray):
+            thing, transforms = p[0], p[1]
+            if len(p) == 3:
+                name = p[2]
+        else:
+            thing, transforms = p, [np.eye(4)]
+        transforms = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+        out.append((thing, transforms, name))
+    return out
+
+
+def translation(dx: float = 0, dy: float = 0, dz: float = 0) -> np.ndarray:
+    """4x4 translation matrix (column-vector convention: p' = T @ p)."""
+    t = np.eye(4)
+    t[:3, 3] = (dx, dy, dz)
+    return t
+
+
+def rotation(axis: str, degrees: float) -> np.ndarray:
+    """4x4 rotation about the X, Y or Z axis through the origin."""
+    a = np.radians(degrees)
+    c, s = np.cos(a), np.sin(a)
+    i, j = {"x": (1, 2), "y": (2, 0), "z": (0, 1)}[axis.lower()]
+    r = np.eye(4)
+    r[i, i], r[i, j], r[j, i], r[j, j] = c, -s, s, c
+    return r
+
+
+def place(vertices: np.ndarray, faces: np.ndarray, transforms) -> tuple[np.ndarray, np.ndarray]:
+    """One (vertices, faces) mesh with a copy per 4x4 transform; mirrors keep outward winding."""
+    t = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+    v = np.einsum("kij,nj->kni", t[:, :3, :3], vertices) + t[:, None, :3, 3]
+    f = faces[None] + (np.arange(len(t)) * len(vertices))[:, None, None]
+    mirrored = np.linalg.det(t[:, :3, :3]) < 0
+    f[mirrored] = f[mirrored][:, :, ::-1]
+    return v.reshape(-1, 3), f.reshape(-1, 3)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Geometric diff of two meshes: where, and by how much, two outputs differ.
+
+Both surfaces are sampled (area weighted) and every sample gets its distance
+to the other surface from `clearance.surface_distance` (a KD-tree over a
+fine grid on the other mesh's triangles, then exact point-triangle
+distances, all batched). A's vertices are measured too, so every face of A
+gets a deviation: the largest over its corners and the samples on it.
+
+- `hausdorff`: the largest distance either way (exact up to `reach`, within
+  2 x `spacing` beyond it)
+- `mean`: mean over all samples, both ways
+- `face_deviation`: per face of A, for heatmaps (`save_heatmap`: binary PLY
+  with face colors, or GLB with vertex colors)
+
+Distances are unsigned: material added and removed both show up.
+
+Usage:
+    python mesh_diff.py enclosure.v2.stl enclosure.v3.stl --heatmap v2_v3.ply
+
+    from mesh_diff import mesh_diff
+    d = mesh_diff(old, new)
+    print(d.summary())
+"""
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+from clearance import sample_surface, surface_distance
+from mesh_arrays import as_indexed
+
+# blue (no change) -> green -> yellow -> red (vmax and above)
+_RAMP = np.array([[0, 0, 255], [0, 255, 0], [255, 255, 0], [255, 0, 0]], dtype=np.float64)
+
+
+class MeshDiff:
+    """Result of `mesh_diff`: sample distances both ways, `hausdorff`, `mean`, `face_deviation` over A."""
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, a_to_b: np.ndarray, b_to_a: np.ndarray,
+                 face_deviation: np.ndarray):
+        self.vertices, self.faces = vertices, faces
+        self.a_to_b, self.b_to_a = a_to_b, b_to_a
+        self.face_deviation = face_deviation
+        both = np.concatenate([a_to_b, b_to_a])
+        self.hausdorff = float(max(both.max(initial=0.0), face_deviation.max(initial=0.0)))
+        self.mean = float(both.mean()) if len(both) else 0.0
+        self.p95 = float(np.percentile(both, 95)) if len(both) else 0.0
+
+    def summary(self, thresholds=(0.01, 0.1, 0.5, 1.0)) -> str:
+        lines = [f"hausdorff {self.hausdorff:.4f} mm, mean {self.mean:.4f} mm, 95% within {self.p95:.4f} mm",
+                 f"  A->B max {self.a_to_b.max(initial=0):.4f}, B->A max {self.b_to_a.max(initial=0):.4f}"]
+        n = len(self.face_deviation)
+        lines += [f"  faces of A off by > {t:g} mm: {int((self.face_deviation > t).sum())} / {n}" for t in thresholds]
+        return "\n".join(lines)
+
+
+def mesh_diff(a, b, samples: int = 20000, spacing: float = 0.25, k: int = 8, reach: float = 1.0) -> MeshDiff:
+    """Compare a and b (anything `as_indexed` accepts) in their common frame."""
+    va, fa = as_indexed(a)
+    vb, fb = as_indexed(b)
+    pa, owner = sample_surface(va, fa, samples, seed=2)
+    pb, _ = sample_surface(vb, fb, samples, seed=3)
+    d = surface_distance(np.concatenate([pa, va]), vb, fb, spacing, k, reach)
+    a_to_b, at_vertex = d[:samples], d[samples:]
+    b_to_a = surface_distance(pb, va, fa, spacing, k, reach)
+
+    face_dev = at_vertex[fa].max(axis=1)
+    np.maximum.at(face_dev, owner, a_to_b)
+    return MeshDiff(va, fa, a_to_b, b_to_a, face_dev)
+
+
+def deviation_colors(values: np.ndarray, vmax: float) -> np.ndarray:
+    """(N, 3) uint8 colors along the blue-green-yellow-red ramp, 0 .. vmax."""
+    x = np.clip(np.asarray(values, dtype=np.float64) / (vmax or 1.0), 0, 1) * (len(_RAMP) - 1)
+    i = np.minimum(x.astype(np.int64), len(_RAMP) - 2)
+    t = (x - i)[:, None]
+    return np.round(_RAMP[i] * (1 - t) + _RAMP[i + 1] * t).astype(np.uint8)
+
+
+def _save_ply(vertices: np.ndarray, faces: np.ndarray, colors: np.ndarray, path: str) -> None:
+    header = (f"ply\nformat binary_little_endian 1.0\nelement vertex {len(vertices)}\n"
+              "property float x\nproperty float y\nproperty float z\n"
+              f"element face {len(faces)}\nproperty list uchar int vertex_indices\n"
+              "property uchar red\nproperty uchar green\nproperty uchar blue\nend_header\n")
+    rec = np.zeros(len(faces), dtype=[("n", "u1"), ("idx", "<i4", 3), ("rgb", "u1", 3)])
+    rec["n"], rec["idx"], rec["rgb"] = 3, faces, colors
+    with open(path, "wb") as fh:
+        fh.write(header.encode("ascii"))
+        fh.write(np.ascontiguousarray(vertices, dtype="<f4").tobytes())
+        fh.write(rec.tobytes())
+
+
+def save_heatmap(diff: MeshDiff, path: str, vmax: float | None = None) -> None:
+    """Mesh A colored by `face_deviation` (`.ply` face colors, or `.glb` vertex colors); vmax defaults to hausdorff."""
+    colors = deviation_colors(diff.face_deviation, vmax or diff.hausdorff)
+    if path.lower().endswith(".ply"):
+        _save_ply(diff.vertices, diff.faces, colors, path)
+    elif path.lower().endswith(".glb"):
+        from export_glb import save_glb
+
+        # unshared corners so every face keeps its own color
+        corners = diff.vertices[diff.faces].reshape(-1, 3)
+        save_glb([((corners, np.arange(len(corners)).reshape(-1, 3)), np.eye(4), "deviation")], path,
+                 colors=[np.repeat(colors, 3, axis=0)])
+    else:
+        raise ValueError(f"heatmap must be .ply or .glb: {path}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from stl import mesh as stl_mesh
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("a", help="reference STL")
+    ap.add_argument("b", help="STL to compare")
+    ap.add_argument("--samples", type=int, default=20000, help="surface samples per mesh")
+    ap.add_argument("--spacing", type=float, default=0.25, help="mm, candidate grid pitch")
+    ap.add_argument("--heatmap", help="write A colored by deviation (.ply or .glb)")
+    ap.add_argument("--vmax", type=float, default=None, help="mm shown as red (default: hausdorff)")
+    args = ap.parse_args(argv)
+
+    d = mesh_diff(stl_mesh.Mesh.from_file(args.a), stl_mesh.Mesh.from_file(args.b), args.samples, args.spacing)
+    print(d.summary())
+    if args.heatmap:
+        save_heatmap(d, args.heatmap, args.vmax)
+        print(f"heatmap -> {args.heatmap}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,41 @@
 All functions return `stl.Mesh` objects in millimeters, with:
 - Box/cylinder/ring centered in XY around (cx, cy); bottom face at z=cz.
 - Triangle winding consistent with numpy-stl conventions (outward normals).
+- Round primitives pick their segment count from the chord tolerance (see
+  `segments`) unless `n` is given, so a 2 mm boss stays light and a 40 mm
+  ring stays round. Pass `segments(r)` as `circular_segments=` to manifold3d
+  primitives for the same accuracy there.
 
 Source: lifted from usw-cooling-stand/scad/gen_stl_v2.py.
 """
 from __future__ import annotations
 
+import math
+
 import numpy as np
 from stl import mesh
 
+CHORD_TOL = 0.05           # mm; largest gap between a true circle and its polygon
+MIN_SEGMENTS = 8
+MAX_SEGMENTS = 256
+
+
+def set_chord_tolerance(tol: float, min_segments: int | None = None, max_segments: int | None = None) -> None:
+    """Change the global chord tolerance (and optionally the segment clamps) for every round primitive."""
+    global CHORD_TOL, MIN_SEGMENTS, MAX_SEGMENTS
+    CHORD_TOL = float(tol)
+    MIN_SEGMENTS = MIN_SEGMENTS if min_segments is None else int(min_segments)
+    MAX_SEGMENTS = MAX_SEGMENTS if max_segments is None else int(max_segments)
+
+
+def segments(r: float, tol: float | None = None) -> int:
+    """Segments for a circle of radius r whose chords stay within tol: ceil(pi / acos(1 - tol/r)), clamped."""
+    tol = CHORD_TOL if tol is None else tol
+    if r <= tol / 2:
+        return MIN_SEGMENTS
+    n = math.ceil(math.pi / math.acos(1 - tol / r) - 1e-9)
+    return max(MIN_SEGMENTS, min(MAX_SEGMENTS, n))
+
 
 def make_box(w: float, d: float, h: float,
              cx: float = 0, cy: float = 0, cz: float = 0) -> mesh.Mesh:
@@ -36,8 +63,9 @@ def make_box(w: float, d: float, h: float,
 
 def make_cylinder(r: float, h: float,
                   cx: float = 0, cy: float = 0, cz: float = 0,
-                  n: int = 32) -> mesh.Mesh:
-    """Solid cylinder, axis along Z. n = circumferential segments."""
+                  n: int | None = None) -> mesh.Mesh:
+    """Solid cylinder, axis along Z. n = circumferential segments (default: from the chord tolerance)."""
+    n = n or segments(r)
     faces_list = []
     angles = np.linspace(0, 2 * np.pi, n + 1)[:-1]
     for i in range(n):
@@ -57,8 +85,9 @@ def make_cylinder(r: float, h: float,
 
 def make_ring(r_outer: float, r_inner: float, h: float,
               cx: float = 0, cy: float = 0, cz: float = 0,
-              n: int = 48) -> mesh.Mesh:
-    """Annular cylinder (cylinder with cylindrical hole through it)."""
+              n: int | None = None) -> mesh.Mesh:
+    """Annular cylinder (cylinder with cylindrical hole through it). n defaults from the outer radius."""
+    n = n or segments(r_outer)
     faces_list = []
     angles = np.linspace(0, 2 * np.pi, n + 1)[:-1]
     for i in range(n):
@@ -87,8 +116,28 @@ def combine(meshes: list[mesh.Mesh]) -> mesh.Mesh:
     return mesh.Mesh(np.concatenate([m.data for m in meshes]))
 
 
+def from_indexed(vertices: np.ndarray, faces: np.ndarray) -> mesh.Mesh:
+    """numpy-stl mesh from shared-vertex (vertices, faces), e.g. `mesh_arrays.as_indexed` output."""
+    m = mesh.Mesh(np.zeros(len(faces), dtype=mesh.Mesh.dtype))
+    m.vectors[:] = np.asarray(vertices)[np.asarray(faces)]
+    return m
+
+
+def transform(m: mesh.Mesh, t: np.ndarray) -> mesh.Mesh:
+    """Return a copy of m with a 4x4 transform applied. Mirrors keep outward winding."""
+    t = np.asarray(t, dtype=np.float64)
+    out = mesh.Mesh(m.data.copy())
+    out.vectors[:] = m.vectors @ t[:3, :3].T + t[:3, 3]
+    if np.linalg.det(t[:3, :3]) < 0:
+        out.vectors[:] = out.vectors[:, ::-1]
+    return out
+
+
 def flip_z(m: mesh.Mesh, max_z: float) -> mesh.Mesh:
-    """Mirror mesh in Z around max_z/2. Used to swap print vs assembly orientation."""
+    """Mirror mesh in Z around max_z/2. Used to swap print vs assembly orientation.
+
+    For picking a print orientation from the geometry, see `orient.best_orientations`.
+    """
     flipped = mesh.Mesh(m.data.copy())
     flipped.vectors[:, :, 2] = max_z - flipped.vectors[:, :, 2]
     for i in range(len(flipped.vectors)):
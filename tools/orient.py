@@ -0,0 +1,116 @@
+"""Batched print-orientation search.
+
+Candidate orientations are "which direction of the part goes down onto the
+bed": the six axis directions, the normals of the part's largest flat faces
+and a Fibonacci sphere of `samples` more. For
+all R candidates at once, the face normals' new Z components ((R, F), the
+only row of the rotated (R, F, 3) normals the score needs) and the vertices'
+new heights give each candidate:
+- `overhang`: area of down-facing faces steeper than `max_overhang`, off the bed
+- `height`: build height
+- `contact`: area of faces lying flat on the bed
+
+Lower score is better:
+    overhang / A + w_height * height / sqrt(A) - w_contact * contact / A
+with A the total surface area, so the weights are scale-free. Candidates
+with no face flat on the bed (balanced on an edge or corner, where every
+face can dodge the overhang limit) only rank when nothing sits flat. Yaw
+about Z doesn't change any of these, so candidates leave it alone.
+
+Usage:
+    from orient import best_orientations
+    best = best_orientations(part, top=3)[0]
+    print(best.overhang, best.height, best.contact)
+    printable = transform(part, best.matrix)      # resting on z=0
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from mesh_arrays import as_indexed
+from printability import face_normals_areas
+
+_AXES = np.array([[0, 0, -1], [0, 0, 1], [1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0]], dtype=np.float64)
+
+
+class Orientation(NamedTuple):
+    matrix: np.ndarray     # 4x4: rotation + lift so the part rests on z=0
+    down: np.ndarray       # part-frame direction that faces the bed
+    score: float
+    overhang: float        # mm²
+    height: float          # mm
+    contact: float         # mm²
+
+
+def candidate_directions(samples: int = 500, normals=None, areas=None, faces_per_part: int = 32) -> np.ndarray:
+    """Unit directions: axes, the largest flat-face normals (if given), then a Fibonacci sphere; deduplicated."""
+    i = np.arange(samples) + 0.5
+    z = 1 - 2 * i / samples
+    r = np.sqrt(1 - z ** 2)
+    phi = np.pi * (1 + 5 ** 0.5) * i
+    found = [_AXES]
+    if normals is not None:
+        keys, inverse = np.unique(np.round(normals, 3), axis=0, return_inverse=True)
+        plane_area = np.bincount(inverse.ravel(), weights=areas, minlength=len(keys))
+        top = np.argsort(plane_area)[::-1][:faces_per_part]
+        found.append(keys[top[plane_area[top] > 0]])
+    found.append(np.stack([r * np.cos(phi), r * np.sin(phi), z], axis=1))
+    dirs = np.concatenate(found)
+    dirs /= np.linalg.norm(dirs, axis=1, keepdims=True)
+    _, first = np.unique(np.round(dirs, 3) + 0.0, axis=0, return_index=True)
+    return dirs[np.sort(first)]
+
+
+def down_to_bed(down: np.ndarray) -> np.ndarray:
+    """Batched (R, 3, 3) minimal rotations taking each `down` direction to -Z."""
+    d = down / np.linalg.norm(down, axis=1, keepdims=True)
+    target = np.array([0.0, 0.0, -1.0])
+    v = np.cross(d, target)
+    c = d @ target
+    k = np.zeros((len(d), 3, 3))
+    k[:, 0, 1], k[:, 0, 2], k[:, 1, 2] = -v[:, 2], v[:, 1], -v[:, 0]
+    k -= k.transpose(0, 2, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rot = np.eye(3) + k + (k @ k) / (1 + c)[:, None, None]
+    flipped = c < -1 + 1e-9                # down == +Z: turn over about X
+    rot[flipped] = np.diag([1.0, -1.0, -1.0])
+    return rot
+
+
+def best_orientations(thing, top: int = 5, samples: int = 500, max_overhang: float = 45.0,
+                      w_height: float = 0.05, w_contact: float = 0.5, bed_tol: float = 0.05,
+                      chunk: int = 64) -> list[Orientation]:
+    """Score every candidate orientation of `thing`; return the `top` best, best first."""
+    vertices, faces = as_indexed(thing)
+    normals, areas = face_normals_areas(vertices, faces)
+    total = areas.sum()
+    down = candidate_directions(samples, normals, areas)
+    rots = down_to_bed(down)
+
+    overhang, height, contact = (np.empty(len(rots)) for _ in range(3))
+    sin_o, cos_flat = np.sin(np.radians(max_overhang)), np.cos(np.radians(1.0))
+    for lo in range(0, len(rots), chunk):
+        rz = rots[lo:lo + chunk, 2, :]                  # (C, 3): new Z row of each rotation
+        nz = rz @ normals.T                             # (C, F)
+        vz = rz @ vertices.T                            # (C, V)
+        zmin = vz.min(axis=1, keepdims=True)
+        on_bed = vz[:, faces].max(axis=2) <= zmin + bed_tol
+        overhang[lo:lo + chunk] = ((nz < -sin_o) & ~on_bed) @ areas
+        contact[lo:lo + chunk] = ((nz < -cos_flat) & on_bed) @ areas
+        height[lo:lo + chunk] = vz.max(axis=1) - zmin[:, 0]
+
+    score = overhang / total + w_height * height / np.sqrt(total) - w_contact * contact / total
+    if (contact > 0).any():
+        score[contact <= 0] = np.inf
+    # stable sort keeps the exact axis candidates ahead of equal-scoring duplicates
+    order = np.argsort(score, kind="stable")[:top]
+    out = []
+    for i in order:
+        m = np.eye(4)
+        m[:3, :3] = rots[i]
+        m[2, 3] = -(rots[i][2] @ vertices.T).min()
+        out.append(Orientation(m, down[i], float(score[i]), float(overhang[i]), float(height[i]),
+                               float(contact[i])))
+    return out
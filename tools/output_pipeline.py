@@ -0,0 +1,82 @@
+"""Overlap part building with tessellation/writing in multi-output generators.
+
+Generators that build part 1, write it, build part 2, write it... spend the
+write time idle. Inside `OutputPipeline`, `save` hands the writer call
+(`save_stl`, `save_step`, numpy-stl `Mesh.save`, `save_3mf`, ...) to one
+background thread and returns immediately, so the next part is built while
+the previous one is written. The thread shares the GIL with the builder, so
+only work that releases it (file I/O, large numpy operations) truly runs
+alongside; Python-level meshing and encoding just interleave. For CPU-bound
+parts use `submit`.
+
+`submit` runs a picklable function in a process pool, for independent parts
+that can be built (and written) entirely in a child. OCP shapes don't pickle,
+so such functions should write their own output and return something small.
+
+On exit every queued write is flushed; the first error from a write or a
+submitted job is re-raised (unless the block is already raising).
+
+Usage:
+    with OutputPipeline() as out:
+        for h in HEIGHTS:
+            out.save(save_stl, create_plug(h), f"plug_{h}.stl")
+"""
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class OutputPipeline:
+    """Context manager: background writer thread + lazily created process pool."""
+
+    def __init__(self, processes: int | None = None, max_pending: int = 4):
+        # max_pending bounds how many built-but-unwritten parts are held in memory
+        self._processes = processes
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer")
+        self._pool: ProcessPoolExecutor | None = None
+        self._futures: list[Future] = []
+
+    def save(self, writer, *args, **kwargs) -> Future:
+        """Queue `writer(*args, **kwargs)` on the writer thread (blocks if max_pending are queued)."""
+        self._slots.acquire()
+        fut = self._writer.submit(writer, *args, **kwargs)
+        fut.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(fut)
+        return fut
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run `fn(*args, **kwargs)` in a worker process; args and result must pickle."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._processes or os.cpu_count())
+        fut = self._pool.submit(fn, *args, **kwargs)
+        self._futures.append(fut)
+        return fut
+
+    def close(self) -> None:
+        """Wait for all queued work; re-raise the first failure."""
+        first_error = None
+        for fut in self._futures:
+            exc = fut.exception()
+            if exc is not None and first_error is None:
+                first_error = exc
+        self._writer.shutdown(wait=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        self._futures.clear()
+        if first_error is not None:
+            raise first_error
+
+    def __enter__(self) -> "OutputPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except Exception:
+            pass   # the error already propagating out of the block wins
@@ -0,0 +1,138 @@
+"""Symmetry and pattern operators: mirror, linear array, polar array.
+
+The operators return (N, 4, 4) transform stacks and compose: pass one
+pattern as another's `base` and every base copy is repeated, e.g. a polar
+ring of holes arrayed up a stack of discs. `pattern(thing, transforms)`
+then places a mesh or shape once per transform:
+- numpy-stl, `(vertices, faces)`, trimesh, `Shape`: one batched (N, 4, 4)
+  multiply (`mesh_arrays.place`) into a single mesh (overlaps are not unioned);
+- manifold3d: one `batch_boolean` union;
+- OCP: one compound of relocated copies, which shares the base geometry and
+  is meant as the tool list of a single `step_primitives.cut_all` /
+  `fuse_all` boolean, instead of a chain of pairwise booleans. Straight
+  through-holes in a flat part are cheaper still without any boolean: pass
+  the pattern's (x, y) positions, `t[:, :2, 3]`, to `step_primitives.perforate`.
+
+Transforms also feed exporters and `scene.Node.add_instances` directly.
+
+Usage:
+    from pattern import linear_array, mirror, pattern, polar_array
+    holes = pattern(make_cylinder(1, 3, x=12), polar_array(24))
+    floor = cut_all(floor, holes)
+    posts = mirror("xy", translation(100, 25, 0), reflect=False)   # (±100, ±25, 0)
+"""
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+
+from mesh_arrays import is_instance_by_name, place, rotation, translation
+
+
+def compose(pattern: np.ndarray, base) -> np.ndarray:
+    """P_i @ B_j for every pattern and base transform (pattern-major): each base copy, repeated by `pattern`."""
+    if base is None:
+        return pattern
+    b = np.asarray(base, dtype=np.float64).reshape(-1, 4, 4)
+    return np.einsum("pij,bjk->pbik", pattern, b).reshape(-1, 4, 4)
+
+
+def mirror(axes: str, base=None, about=(0.0, 0.0, 0.0), reflect: bool = True) -> np.ndarray:
+    """Every combination of reflections across the planes normal to `axes` (e.g. "xy": 4 copies).
+
+    Sign combinations run from all-negative to the identity last, in
+    `for dx in [-1, 1]: for dy in [-1, 1]` order. Planes pass through
+    `about`. With `reflect=False` each copy is reflected back in its own
+    frame: a part that is symmetric itself lands at the mirror position
+    without a handedness flip (no negative scales in instanced exports).
+    """
+    about = np.asarray(about, dtype=np.float64)
+    flips = []
+    for signs in itertools.product([-1.0, 1.0], repeat=len(axes)):
+        d = np.eye(4)
+        for axis, sign in zip(axes.lower(), signs):
+            d["xyz".index(axis), "xyz".index(axis)] = sign
+        flips.append(d)
+    flips = np.stack(flips)
+    out = compose(translation(*about) @ flips @ translation(*-about), base)
+    if not reflect:
+        out = out @ np.repeat(flips, len(out) // len(flips), axis=0)
+    return out + 0.0                        # no -0.0 from flipped zeros
+
+
+def linear_array(count: int, step, base=None, start=(0.0, 0.0, 0.0)) -> np.ndarray:
+    """`count` copies at start, start + step, start + 2 x step, ..."""
+    step, start = np.asarray(step, dtype=np.float64), np.asarray(start, dtype=np.float64)
+    return compose(np.stack([translation(*(start + i * step)) for i in range(count)]), base)
+
+
+def polar_array(count: int | None = None, base=None, axis: str = "z", center=(0.0, 0.0, 0.0),
+                start: float = 0.0, sweep: float = 360.0, angles=None) -> np.ndarray:
+    """Rotated copies about an axis through `center` (degrees).
+
+    `count` copies spread evenly over `sweep` from `start` (a full turn
+    leaves no duplicate at the end), or one copy per entry of `angles`.
+    """
+    if angles is None:
+        if not count:
+            raise ValueError("polar_array needs a count or explicit angles")
+        full = abs(abs(sweep) - 360.0) < 1e-9
+        angles = start + np.arange(count) * sweep / (count if full or count == 1 else count - 1)
+    c = np.asarray(center, dtype=np.float64)
+    return compose(np.stack([translation(*c) @ rotation(axis, a) @ translation(*-c) for a in angles]), base)
+
+
+def _ocp_copies(shape, transforms) -> list:
+    from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
+    from OCP.gp import gp_Trsf
+    from OCP.TopLoc import TopLoc_Location
+
+    out = []
+    for t in transforms:
+        trsf = gp_Trsf()
+        trsf.SetValues(*t[:3].ravel())
+        if np.linalg.det(t[:3, :3]) < 0:
+            out.append(BRepBuilderAPI_Transform(shape, trsf, False).Shape())    # locations can't mirror
+        else:
+            out.append(shape.Moved(TopLoc_Location(trsf)))                       # shares the geometry
+    return out
+
+
+def pattern(thing, transforms):
+    """`thing` placed once per transform, as one object of the same kind (see the module docstring)."""
+    t = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+    if isinstance(thing, tuple) and len(thing) == 2:
+        v, f = thing
+        return place(np.asarray(v, dtype=np.float64), np.asarray(f, dtype=np.int64), t)
+    if is_instance_by_name(thing, "OCP", "TopoDS_Shape"):
+        from OCP.BRep import BRep_Builder
+        from OCP.TopoDS import TopoDS_Compound
+
+        compound, builder = TopoDS_Compound(), BRep_Builder()
+        builder.MakeCompound(compound)
+        for copy in _ocp_copies(thing, t):
+            builder.Add(compound, copy)
+        return compound
+    if is_instance_by_name(thing, "stl", "Mesh"):
+        from stl import mesh
+
+        out = mesh.Mesh(np.zeros(len(t) * len(thing.vectors), dtype=mesh.Mesh.dtype))
+        v = np.einsum("kij,nvj->knvi", t[:, :3, :3], thing.vectors.astype(np.float64)) + t[:, None, None, :3, 3]
+        mirrored = np.linalg.det(t[:, :3, :3]) < 0
+        v[mirrored] = v[mirrored][:, :, ::-1]
+        out.vectors[:] = v.reshape(-1, 3, 3)
+        return out
+    if is_instance_by_name(thing, "manifold3d", "Manifold"):
+        import manifold3d
+
+        return manifold3d.Manifold.batch_boolean([thing.transform(m[:3]) for m in t], manifold3d.OpType.Add)
+    if is_instance_by_name(thing, "shape", "Shape"):
+        from shape import Shape
+
+        return Shape(place(*thing.indexed, t))
+    if is_instance_by_name(thing, "trimesh", "Trimesh"):
+        import trimesh
+
+        return trimesh.Trimesh(*place(np.asarray(thing.vertices), np.asarray(thing.faces), t), process=False)
+    raise TypeError(f"Unsupported shape type: {type(thing).__name__}")
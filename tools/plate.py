@@ -0,0 +1,192 @@
+"""Build-plate packing for multi-copy prints.
+
+Each part (already in print orientation) is reduced to its XY footprint, the
+convex hull of its vertices, and turned to the yaw where the hull's bounding
+rectangle is smallest. Copies are packed onto the bed as those rectangles
+(plus `spacing`) with a skyline bottom-left heuristic. Each copy may also be
+turned 90°. The result is one 4x4 transform per copy, ready for `save_3mf`
+instancing, or an STL of the whole plate.
+
+Usage:
+    from plate import save_plate
+    save_plate([(cover_loose, 2, "loose"), (cover_press, 2, "press")], "plate.3mf", bed=(256, 256))
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from mesh_arrays import as_indexed, rotation, translation
+
+
+class Placement(NamedTuple):
+    part: int              # index into the parts list
+    copy: int
+    matrix: np.ndarray     # 4x4 part -> plate
+
+
+def convex_hull_2d(points: np.ndarray) -> np.ndarray:
+    """Counter-clockwise convex hull (K, 2) of XY points (Andrew's monotone chain)."""
+    pts = np.unique(np.round(np.asarray(points, dtype=np.float64)[:, :2], 9), axis=0)
+    if len(pts) < 3:
+        return pts
+
+    def half(seq):
+        out = []
+        for p in seq:
+            while len(out) >= 2 and ((out[-1][0] - out[-2][0]) * (p[1] - out[-2][1])
+                                     - (out[-1][1] - out[-2][1]) * (p[0] - out[-2][0])) <= 0:
+                out.pop()
+            out.append(p)
+        return out[:-1]
+
+    return np.array(half(pts) + half(pts[::-1]))
+
+
+def min_area_yaw(hull: np.ndarray, keep_axis: float = 0.05) -> float:
+    """Yaw (degrees) aligning one hull edge with X that minimizes the bounding rectangle.
+
+    Stays at 0 unless that saves more than `keep_axis` (fraction) of the
+    axis-aligned rectangle, so square-ish parts aren't laid out at odd angles.
+    """
+    if len(hull) < 3:
+        return 0.0
+    edges = np.roll(hull, -1, axis=0) - hull
+    angles = np.concatenate([[0.0], -np.arctan2(edges[:, 1], edges[:, 0])])
+    c, s = np.cos(angles), np.sin(angles)
+    x = c[:, None] * hull[:, 0] - s[:, None] * hull[:, 1]        # (E, K) rotated hull
+    y = s[:, None] * hull[:, 0] + c[:, None] * hull[:, 1]
+    area = np.ptp(x, axis=1) * np.ptp(y, axis=1)
+    if area[0] <= area.min() * (1 + keep_axis):
+        return 0.0
+    return float(np.degrees(angles[np.argmin(area)]))
+
+
+def _normalize(parts):
+    if not isinstance(parts, list):
+        parts = [parts]
+    out = []
+    for p in parts:
+        if isinstance(p, tuple) and len(p) in (2, 3) and isinstance(p[1], (int, np.integer)):
+            out.append((p[0], int(p[1]), p[2] if len(p) == 3 else None))
+        else:
+            out.append((p, 1, None))
+    return out
+
+
+class _Skyline:
+    """Bottom-left skyline over a W x D bin: list of [x, y, width] steps."""
+
+    def __init__(self, width: float, depth: float):
+        self.width, self.depth = width, depth
+        self.steps = [[0.0, 0.0, width]]
+
+    def fit(self, w: float, h: float):
+        """(top, x, y) of the lowest bottom-left spot for a w x h rect, or None."""
+        best = None
+        for i, (x, _, _) in enumerate(self.steps):
+            if x + w > self.width + 1e-9:
+                break
+            y, span, j = 0.0, 0.0, i
+            while span < w - 1e-9:
+                y = max(y, self.steps[j][1])
+                span += self.steps[j][2]
+                j += 1
+            if y + h <= self.depth + 1e-9 and (best is None or (y + h, x) < best[:2]):
+                best = (y + h, x, y)
+        return best
+
+    def add(self, x: float, y: float, w: float, h: float) -> None:
+        new, end = [], x + w
+        for sx, sy, sw in self.steps:
+            se = sx + sw
+            if se <= x + 1e-9 or sx >= end - 1e-9:
+                new.append([sx, sy, sw])
+                continue
+            if sx < x:
+                new.append([sx, sy, x - sx])
+            if se > end:
+                new.append([end, sy, se - end])
+        new.append([x, y + h, w])
+        new.sort()
+        merged = [new[0]]
+        for s in new[1:]:
+            if abs(s[1] - merged[-1][1]) < 1e-9:
+                merged[-1][2] += s[2]
+            else:
+                merged.append(s)
+        self.steps = merged
+
+
+def pack(parts, bed: tuple[float, float] = (256.0, 256.0), spacing: float = 5.0,
+         allow_turn: bool = True) -> tuple[list[Placement], list[tuple[int, int]]]:
+    """Pack `parts` ([thing, (thing, count) or (thing, count, name)]) onto a bed.
+
+    Returns (placements, unplaced (part, copy) pairs). The packed group is
+    centered on the bed; bed coordinates run from (0, 0) to `bed`.
+    """
+    shapes = []
+    for thing, _, _ in _normalize(parts):
+        vertices, _ = as_indexed(thing)
+        hull = convex_hull_2d(vertices)
+        yaw = min_area_yaw(hull)
+        r = rotation("z", yaw)
+        xy = hull @ r[:2, :2].T
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        shapes.append((yaw, lo, hi - lo, vertices[:, 2].min()))
+
+    copies = [(i, c) for i, (_, n, _) in enumerate(_normalize(parts)) for c in range(n)]
+    copies.sort(key=lambda ic: -max(shapes[ic[0]][2]))          # biggest first
+    sky = _Skyline(*bed)
+    placed, boxes, unplaced = [], [], []
+    for i, c in copies:
+        yaw, lo, (w, d), zmin = shapes[i]
+        options = [(0, w + spacing, d + spacing)]
+        if allow_turn and abs(w - d) > 1e-9:
+            options.append((90, d + spacing, w + spacing))
+        fits = [(f, turn, fw, fd) for turn, fw, fd in options if (f := sky.fit(fw, fd)) is not None]
+        if not fits:
+            unplaced.append((i, c))
+            continue
+        (top, x, y), turn, fw, fd = min(fits, key=lambda t: t[0][:2])
+        sky.add(x, y, fw, fd)
+        # part -> yawed footprint at origin -> optional quarter turn -> spot on the bed
+        m = rotation("z", yaw)
+        m = translation(-lo[0], -lo[1], -zmin) @ m
+        if turn:
+            m = translation(d, 0, 0) @ rotation("z", 90) @ m
+        m = translation(x + spacing / 2, y + spacing / 2, 0) @ m
+        placed.append(Placement(i, c, m))
+        boxes.append((x, y, x + fw, y + fd))
+
+    if boxes:
+        b = np.array(boxes)
+        shift = (np.asarray(bed) - (b[:, :2].min(axis=0) + b[:, 2:].max(axis=0))) / 2
+        placed = [p._replace(matrix=translation(shift[0], shift[1], 0) @ p.matrix) for p in placed]
+    placed.sort(key=lambda p: (p.part, p.copy))
+    return placed, unplaced
+
+
+def save_plate(parts, filepath: str, **pack_kwargs) -> list[Placement]:
+    """Pack and write one plate: `.3mf` (instanced) or `.stl` (one combined soup)."""
+    placed, unplaced = pack(parts, **pack_kwargs)
+    if unplaced:
+        raise ValueError(f"{len(unplaced)} cop(ies) don't fit the bed: {unplaced}")
+    norm = _normalize(parts)
+    if filepath.lower().endswith(".3mf"):
+        from export_3mf import save_3mf
+
+        save_3mf([(thing, [p.matrix for p in placed if p.part == i], name)
+                  for i, (thing, _, name) in enumerate(norm)], filepath)
+    else:
+        from stl import mesh as stl_mesh
+
+        from canonical import save_stl
+
+        indexed = [as_indexed(thing) for thing, _, _ in norm]
+        tris = [(indexed[p.part][0] @ p.matrix[:3, :3].T + p.matrix[:3, 3])[indexed[p.part][1]] for p in placed]
+        plate = stl_mesh.Mesh(np.zeros(sum(len(t) for t in tris), dtype=stl_mesh.Mesh.dtype))
+        plate.vectors[:] = np.concatenate(tris)
+        save_stl(plate, filepath)
+    return placed
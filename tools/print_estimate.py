@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Filament and print-time estimates for generated STLs, in batch.
+
+Per file: the mesh is sliced once (`slicer.slice_mesh`) at the print layer
+height, and the estimate is built from per-layer section area and perimeter:
+- walls: perimeter x wall count x line width (capped at the section area)
+- top/bottom skin: the part of each section not covered by every section
+  within `top_bottom_layers` above and below it (plus the first/last layers)
+- sparse infill: whatever is left, times the infill fraction
+Extrusion paths are volume / (line width x layer height); time is path length
+over the wall/infill speeds plus a fixed per-layer overhead. Expect the same
+ballpark as a slicer, not the same minute.
+
+Results are cached per file, keyed by the file's content hash plus the
+settings, so re-running after a sweep only re-slices what changed. Runs only
+add to the cache; `--prune-cache` (`prune_cache`) drops entries for content
+no STL in the repo holds any more.
+
+Usage:
+    python print_estimate.py                      # every *.stl in the repo
+    python print_estimate.py a.stl b.stl --infill 20 --walls 3
+    python print_estimate.py --prune-cache        # ...then forget deleted/edited files
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mesh_arrays import as_indexed
+from slicer import slice_mesh
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".print_estimate_cache.json")
+_SKIP_DIRS = {"venv", ".venv", "__pycache__", "node_modules"}
+
+
+@dataclasses.dataclass(frozen=True)
+class PrintSettings:
+    layer_height: float = 0.2        # mm
+    line_width: float = 0.45         # mm
+    walls: int = 2
+    top_bottom_layers: int = 4
+    infill: float = 0.15             # fraction, 0..1
+    wall_speed: float = 40.0         # mm/s
+    infill_speed: float = 80.0       # mm/s (skin + sparse infill)
+    layer_overhead_s: float = 1.5    # travel, retraction, layer change
+    filament_diameter: float = 1.75  # mm
+    density: float = 1.24            # g/cm³ (PLA; PETG ~1.27)
+
+
+def mesh_volume(vertices: np.ndarray, faces: np.ndarray) -> float:
+    """Enclosed volume (mm³) of a closed, outward-wound mesh (divergence theorem)."""
+    a, b, c = (vertices[faces[:, k]] for k in range(3))
+    return float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6.0)
+
+
+def estimate(thing, settings: PrintSettings = PrintSettings()) -> dict:
+    """Estimate one part (anything `mesh_arrays.as_indexed` accepts)."""
+    s = settings
+    vertices, faces = as_indexed(thing)
+    sl = slice_mesh((vertices, faces), layer_height=s.layer_height)
+    area = np.clip(sl.area, 0, None)
+    n = len(area)
+
+    walls = np.minimum(sl.perimeter * s.walls * s.line_width, area)
+    # a section is fully "covered" only as far as the smallest section within N layers of it
+    k = s.top_bottom_layers
+    padded = np.concatenate([np.zeros(k), area, np.zeros(k)])
+    covered = np.lib.stride_tricks.sliding_window_view(padded, 2 * k + 1).min(axis=1)
+    skin = np.minimum(area - covered, area - walls).clip(0)
+    sparse = (area - walls - skin).clip(0) * s.infill
+
+    lh, lw = s.layer_height, s.line_width
+    extruded = float((walls + skin + sparse).sum() * lh)                    # mm³
+    wall_path = float(sl.perimeter.sum() * s.walls)                         # mm
+    fill_path = float((skin + sparse).sum() / lw)
+    seconds = wall_path / s.wall_speed + fill_path / s.infill_speed + n * s.layer_overhead_s
+    filament_area = np.pi * (s.filament_diameter / 2) ** 2
+    return {
+        "layers": n,
+        "volume_cm3": round(mesh_volume(vertices, faces) / 1000, 3),
+        "extruded_cm3": round(extruded / 1000, 3),
+        "grams": round(extruded / 1000 * s.density, 2),
+        "metres": round(extruded / filament_area / 1000, 3),
+        "minutes": round(seconds / 60, 1),
+    }
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_key(digest: str, settings: PrintSettings) -> str:
+    return digest + ":" + hashlib.sha256(json.dumps(dataclasses.asdict(settings), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _estimate_file(path: str, settings: PrintSettings) -> dict:
+    from stl import mesh as stl_mesh
+
+    return estimate(stl_mesh.Mesh.from_file(path), settings)
+
+
+def _load_cache(cache_path: str | None) -> dict[str, dict]:
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as fh:
+            return json.load(fh)
+    return {}
+
+
+def _save_cache(cache_path: str, cache: dict[str, dict]) -> None:
+    with open(cache_path, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh, indent=1, sort_keys=True)
+
+
+def estimate_files(paths: list[str], settings: PrintSettings = PrintSettings(), processes: int | None = None,
+                   cache_path: str | None = CACHE_PATH) -> dict[str, dict]:
+    """path -> estimate for every path, slicing uncached files in a process pool."""
+    cache = _load_cache(cache_path)
+
+    keys = {p: _cache_key(_file_hash(p), settings) for p in paths}
+    todo = [p for p in paths if keys[p] not in cache]
+    if todo:
+        if len(todo) == 1 or processes == 1:
+            fresh = [_estimate_file(p, settings) for p in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                fresh = list(pool.map(_estimate_file, todo, [settings] * len(todo)))
+        cache.update({keys[p]: r for p, r in zip(todo, fresh)})
+        if cache_path:
+            _save_cache(cache_path, cache)
+    return {p: dict(cache[keys[p]], cached=p not in todo) for p in paths}
+
+
+def prune_cache(paths: list[str], cache_path: str = CACHE_PATH) -> int:
+    """Drop cached estimates (any settings) for content none of `paths` holds; returns how many."""
+    cache = _load_cache(cache_path)
+    live = {_file_hash(p) for p in paths}
+    keep = {k: v for k, v in cache.items() if k.split(":")[0] in live}
+    if len(keep) < len(cache):
+        _save_cache(cache_path, keep)
+    return len(cache) - len(keep)
+
+
+def find_stls(root: str = REPO_ROOT) -> list[str]:
+    """Every *.stl under root, skipping dot and venv directories."""
+    found = []
+    for d, dirs, files in os.walk(root):
+        dirs[:] = sorted(x for x in dirs if not x.startswith(".") and x not in _SKIP_DIRS)
+        found += [os.path.join(d, f) for f in sorted(files) if f.lower().endswith(".stl")]
+    return found
+
+
+def format_table(results: dict[str, dict], root: str = REPO_ROOT) -> str:
+    cols = ["layers", "volume_cm3", "grams", "metres", "minutes"]
+    rows = [[os.path.relpath(p, root)] + [str(r[c]) for c in cols] for p, r in results.items()]
+    totals = {c: sum(r[c] for r in results.values()) for c in cols[2:]}
+    rows.append(["TOTAL", "", ""] + [f"{totals[c]:.{2 if c == 'grams' else 1}f}" for c in cols[2:]])
+    header = ["file"] + cols
+    widths = [max(len(x) for x in col) for col in zip(header, *rows)]
+    fmt = lambda r: "  ".join(x.ljust(w) if i == 0 else x.rjust(w) for i, (x, w) in enumerate(zip(r, widths)))
+    return "\n".join([fmt(header), fmt(["-" * w for w in widths])] + [fmt(r) for r in rows])
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    d = PrintSettings()
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("paths", nargs="*", help="STL files (default: every *.stl in the repo)")
+    ap.add_argument("--layer-height", type=float, default=d.layer_height)
+    ap.add_argument("--line-width", type=float, default=d.line_width)
+    ap.add_argument("--walls", type=int, default=d.walls)
+    ap.add_argument("--top-bottom-layers", type=int, default=d.top_bottom_layers)
+    ap.add_argument("--infill", type=float, default=d.infill * 100, help="percent")
+    ap.add_argument("--wall-speed", type=float, default=d.wall_speed, help="mm/s")
+    ap.add_argument("--infill-speed", type=float, default=d.infill_speed, help="mm/s")
+    ap.add_argument("--density", type=float, default=d.density, help="g/cm³")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--prune-cache", action="store_true",
+                    help="afterwards, drop cache entries for content no *.stl in the repo holds")
+    args = ap.parse_args(argv)
+
+    settings = PrintSettings(layer_height=args.layer_height, line_width=args.line_width, walls=args.walls,
+                             top_bottom_layers=args.top_bottom_layers, infill=args.infill / 100,
+                             wall_speed=args.wall_speed, infill_speed=args.infill_speed, density=args.density)
+    paths = [os.path.abspath(p) for p in args.paths] or find_stls()
+    results = estimate_files(paths, settings, processes=args.jobs, cache_path=None if args.no_cache else CACHE_PATH)
+    print(format_table(results))
+    if args.prune_cache:
+        print(f"pruned {prune_cache(find_stls())} stale cache entr(ies)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Overhang, bridge and island checks for a part in its print orientation (+Z up).
+
+Face normals and areas come from one vectorized pass over the triangles. A
+face overhangs when it faces down more steeply than `max_overhang` degrees
+from vertical (45° is the usual FDM limit; 90° would be a flat ceiling).
+Faces resting on the bed are ignored. Connected overhanging faces form
+regions, and each region reports:
+- `z`: lowest height
+- `area`: mm²
+- `span`: how far the printer must bridge: through each point of the
+  region, the shortest straight line (in XY) that ends on an anchor at both
+  ends; the longest of those over the region (0 if it has none). Anchors
+  are the region's edges where the adjoining face runs down from the edge
+  (a wall or post beneath it) or rests on the bed; an edge into a face that
+  rises (the side of a slab) holds nothing.
+- `reach`: how far the region sticks out where it is held on one side only
+  (a cantilever: no line through the point ends on anchors at both ends):
+  the largest distance from such a point to the nearest anchor (inf if
+  nothing anchors the region).
+
+A region is printable without support - counted among the bridges - when its
+span is at most `max_bridge` (flat ceilings between walls, the arch over a
+horizontal hole) and its reach at most `max_cantilever` (lips, steps and
+chamfer edges a fraction of a millimetre wide); otherwise it needs support.
+
+Islands come from the layer slices (`slicer.slice_mesh`). An island is an
+outer contour that first appears in mid-air: it overlaps no material in the
+layer below.
+
+Usage:
+    from printability import analyze
+    report = analyze(mesh, max_overhang=45, max_bridge=10, max_cantilever=1.5)
+    assert report.support_free, report.summary()
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from mesh_arrays import as_indexed
+from slicer import slice_mesh
+
+_FLAT = 0.996   # |n_z| above this (~5° from horizontal) is treated as a flat ceiling
+_CHORD_DIRECTIONS = 36   # bridge directions tried through each point of a region (5° apart)
+
+
+class Region(NamedTuple):
+    z: float
+    area: float
+    span: float
+    reach: float
+    flat: bool
+
+
+class Island(NamedTuple):
+    z: float
+    area: float
+    centroid: tuple[float, float]
+
+
+class Report:
+    """Result of `analyze`: overhang `regions`, split into bridges / unsupported, and `islands`."""
+
+    def __init__(self, overhang_area: float, regions: list[Region], islands: list[Island], max_bridge: float,
+                 max_cantilever: float):
+        self.overhang_area = overhang_area
+        self.regions = regions
+        self.islands = islands
+        ok = [r.span <= max_bridge and r.reach <= max_cantilever for r in regions]
+        self.bridges = [r for r, good in zip(regions, ok) if good]
+        self.unsupported = [r for r, good in zip(regions, ok) if not good]
+
+    @property
+    def support_free(self) -> bool:
+        return not self.unsupported and not self.islands
+
+    def summary(self) -> str:
+        lines = [f"overhang area {self.overhang_area:.1f} mm² in {len(self.regions)} region(s): "
+                 f"{len(self.bridges)} bridge(s), {len(self.unsupported)} needing support; "
+                 f"{len(self.islands)} island(s)"]
+        lines += [f"  support: z={r.z:.2f} area={r.area:.1f} span={r.span:.1f} reach={r.reach:.1f}"
+                  for r in self.unsupported]
+        lines += [f"  island:  z={i.z:.2f} area={i.area:.1f} at ({i.centroid[0]:.1f}, {i.centroid[1]:.1f})"
+                  for i in self.islands]
+        return "\n".join(lines)
+
+
+def face_normals_areas(vertices: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Unit normals (F, 3) and areas (F,) of every face."""
+    tri = vertices[faces]
+    cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    norm = np.linalg.norm(cross, axis=1)
+    return cross / np.where(norm > 0, norm, 1)[:, None], norm / 2
+
+
+def _components(faces: np.ndarray) -> np.ndarray:
+    """Label faces connected through shared edges (min-label propagation)."""
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    _, edge_id = np.unique(edges, axis=0, return_inverse=True)
+    edge_id = edge_id.ravel()
+    owner = np.repeat(np.arange(len(faces)), 3)
+    labels = np.arange(len(faces))
+    while True:
+        best = np.full(edge_id.max() + 1, len(faces))
+        np.minimum.at(best, edge_id, labels[owner])
+        new = labels.copy()
+        np.minimum.at(new, owner, best[edge_id])
+        new = new[new]                    # pointer jumping speeds up long chains
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def _edge_keys(edges: np.ndarray, n_vertices: int) -> np.ndarray:
+    edges = np.sort(edges, axis=1).astype(np.int64)
+    return edges[:, 0] * n_vertices + edges[:, 1]
+
+
+def _anchor_keys(vertices: np.ndarray, faces: np.ndarray, over: np.ndarray, on_bed: np.ndarray) -> np.ndarray:
+    """Keys of edges a non-overhang face hangs down from (or a bed face touches)."""
+    edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    owner = np.repeat(np.arange(len(faces)), 3)
+    e = vertices[edges[:, 1]] - vertices[edges[:, 0]]
+    w = vertices[faces[:, [2, 0, 1]].ravel()] - vertices[edges[:, 0]]
+    # z of the in-plane direction from the edge into its face: < 0 means the face runs down
+    down = w[:, 2] - (w * e).sum(axis=1) / np.maximum((e ** 2).sum(axis=1), 1e-12) * e[:, 2]
+    anchor = ~over[owner] & ((down < -1e-6) | on_bed[owner])
+    return np.unique(_edge_keys(edges[anchor], len(vertices)))
+
+
+def _span_reach(vertices: np.ndarray, faces: np.ndarray, anchor_keys: np.ndarray) -> tuple[float, float]:
+    """(span, reach) of a region: see the module docstring."""
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    uniq, count = np.unique(edges, axis=0, return_counts=True)
+    boundary = uniq[count == 1]
+    anchored = boundary[np.isin(_edge_keys(boundary, len(vertices)), anchor_keys)]
+    if len(anchored) == 0:
+        return 0.0, float("inf")
+    tri = vertices[faces][:, :, :2]
+    samples = np.concatenate([vertices[np.unique(faces), :2], tri.mean(axis=1),
+                              (tri + np.roll(tri, -1, axis=1)).reshape(-1, 2) / 2])
+    a, b = vertices[anchored[:, 0], :2], vertices[anchored[:, 1], :2]
+    ab = b - a
+    span = reach = 0.0
+    for lo in range(0, len(samples), 512):
+        r = a - samples[lo:lo + 512, None, :]
+        chord = np.full(len(r), np.inf)
+        for angle in np.arange(_CHORD_DIRECTIONS) * np.pi / _CHORD_DIRECTIONS:
+            u = np.array([np.cos(angle), np.sin(angle)])
+            denom = u[0] * ab[:, 1] - u[1] * ab[:, 0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                s = (r[..., 0] * ab[:, 1] - r[..., 1] * ab[:, 0]) / denom         # along u to each anchor line
+                t = (r[..., 0] * u[1] - r[..., 1] * u[0]) / denom                 # where on the anchor edge
+            hit = (np.abs(denom) > 1e-12) & (t >= -1e-9) & (t <= 1 + 1e-9)
+            ahead = np.where(hit & (s >= -1e-6), np.maximum(s, 0), np.inf).min(axis=1)
+            behind = np.where(hit & (s <= 1e-6), np.maximum(-s, 0), np.inf).min(axis=1)
+            chord = np.minimum(chord, ahead + behind)
+        bridged = np.isfinite(chord)
+        if bridged.any():
+            span = max(span, float(chord[bridged].max()))
+        if not bridged.all():
+            r = r[~bridged]
+            t = np.clip(-np.einsum("sbk,bk->sb", r, ab) / np.maximum((ab ** 2).sum(axis=1), 1e-12), 0, 1)
+            reach = max(reach, float(np.linalg.norm(r + t[..., None] * ab, axis=2).min(axis=1).max()))
+    return span, reach
+
+
+def _inside(points: np.ndarray, p0: np.ndarray, p1: np.ndarray) -> np.ndarray:
+    """Even-odd point-in-section test of (P, 2) points against one layer's segments."""
+    if len(p0) == 0:
+        return np.zeros(len(points), dtype=bool)
+    x, y = points[:, 0:1], points[:, 1:2]
+    straddle = (p0[:, 1] > y) != (p1[:, 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xc = p0[:, 0] + (y - p0[:, 1]) * (p1[:, 0] - p0[:, 0]) / (p1[:, 1] - p0[:, 1])
+    return (straddle & (x < xc)).sum(axis=1) % 2 == 1
+
+
+def _islands(slices) -> list[Island]:
+    found = []
+    for i in range(1, len(slices)):
+        below0, below1 = slices.segments(i - 1)
+        for loop in slices.polygons(i):
+            nxt = np.roll(loop, -1, axis=0)
+            cross = loop[:, 0] * nxt[:, 1] - nxt[:, 0] * loop[:, 1]
+            a = 0.5 * cross.sum()
+            if a <= 0:
+                continue          # holes are supported by whatever surrounds them
+            if _inside(loop, below0, below1).any():
+                continue
+            if len(below0) and _inside(below0, loop, nxt).any():
+                continue
+            centroid = ((loop + nxt) * cross[:, None]).sum(axis=0) / (6 * a)
+            found.append(Island(float(slices.z[i]), float(a), tuple(float(c) for c in centroid.round(2))))
+    return found
+
+
+def analyze(thing, max_overhang: float = 45.0, max_bridge: float = 10.0, max_cantilever: float = 1.5,
+            layer_height: float = 0.2, bed_tol: float = 0.05) -> Report:
+    """Printability report for anything `mesh_arrays.as_indexed` accepts, printed as positioned."""
+    vertices, faces = as_indexed(thing)
+    normals, areas = face_normals_areas(vertices, faces)
+    bed_z = vertices[:, 2].min()
+    on_bed = vertices[faces, 2].max(axis=1) <= bed_z + bed_tol
+    over = (normals[:, 2] < -np.sin(np.radians(max_overhang))) & ~on_bed & (areas > 0)
+
+    regions = []
+    idx = np.flatnonzero(over)
+    if len(idx):
+        anchors = _anchor_keys(vertices, faces, over, on_bed)
+        labels = _components(faces[idx])
+        for lab in np.unique(labels):
+            sel = idx[labels == lab]
+            span, reach = _span_reach(vertices, faces[sel], anchors)
+            regions.append(Region(z=float(vertices[faces[sel], 2].min()),
+                                  area=float(areas[sel].sum()),
+                                  span=span,
+                                  reach=reach,
+                                  flat=bool((normals[sel, 2] < -_FLAT).all())))
+        regions.sort(key=lambda r: (r.z, -r.area))
+
+    islands = _islands(slice_mesh((vertices, faces), layer_height=layer_height))
+    return Report(float(areas[over].sum()), regions, islands, max_bridge, max_cantilever)
@@ -0,0 +1,148 @@
+"""Assembly scene graph: shared geometry placed by 4x4 transforms, applied lazily.
+
+A `Node` has a local `transform`, optional `geometry` and child nodes. Geometry
+is wrapped in a `shape.Shape`, so each distinct mesh is converted (and its
+bounds found) once however many nodes place it. Transforms are only
+multiplied out when asked for:
+- `instances()` -> [(geometry, (N, 4, 4) transforms, name)], the
+  `mesh_arrays.normalize_parts` format, so `save_3mf` / `save_glb` write one
+  mesh per geometry and one instance per placement.
+- `flatten()` -> one `(vertices, faces)` mesh; each geometry is placed with a
+  single batched (N, 4, 4) multiply.
+- `bounds()` -> (mins, maxs) from cached per-node boxes (8 transformed
+  corners per child), without flattening anything.
+All three work in the node's parent frame: the node's own transform is
+applied, its ancestors' are not. Editing `transform` or adding children
+drops the cached bounds of the node and everything above it.
+
+Printed parts are subtrees of one assembly: `find(name)` returns a node,
+and its `instances()` / `flatten()` are that part alone.
+
+Usage:
+    from scene import Node
+    stand = Node("stand")
+    frame = stand.add(Node("frame"))
+    frame.add_instances("legs", make_box(30, 8, 160), [translation(x, y, 0) for x, y in corners])
+    save_glb(stand.instances(), "stand.glb")
+    mins, maxs = stand.find("frame").bounds()
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from mesh_arrays import place
+from shape import Shape
+
+
+def _corners(mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """The 8 corners of a box, (8, 3)."""
+    lo_hi = np.stack([mins, maxs])
+    idx = np.array([[i >> 2 & 1, i >> 1 & 1, i & 1] for i in range(8)])
+    return lo_hi[idx, [0, 1, 2]]
+
+
+class Node:
+    """A transform, optional geometry and children; see the module docstring."""
+
+    def __init__(self, name: str | None = None, geometry=None, transform=None, children=()):
+        self.name = name
+        self.geometry = None if geometry is None else (geometry if isinstance(geometry, Shape) else Shape(geometry))
+        self._transform = np.eye(4) if transform is None else np.asarray(transform, dtype=np.float64)
+        self.children: list[Node] = []
+        self._parents: list[Node] = []
+        self._bounds = None
+        for child in children:
+            self.add(child)
+
+    # -- structure -----------------------------------------------------------
+
+    @property
+    def transform(self) -> np.ndarray:
+        return self._transform
+
+    @transform.setter
+    def transform(self, matrix) -> None:
+        self._transform = np.asarray(matrix, dtype=np.float64)
+        self._changed()
+
+    def _changed(self) -> None:
+        self._bounds = None
+        for p in self._parents:
+            p._changed()
+
+    def add(self, child: "Node") -> "Node":
+        """Attach `child` (a node may sit under several parents: a shared subassembly); returns it."""
+        self.children.append(child)
+        child._parents.append(self)
+        self._changed()
+        return child
+
+    def add_instances(self, name: str, geometry, transforms) -> "Node":
+        """A child group `name` with one leaf per transform, all sharing `geometry`; returns the group."""
+        shared = geometry if isinstance(geometry, Shape) else Shape(geometry)
+        transforms = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+        return self.add(Node(name, children=[Node(geometry=shared, transform=t) for t in transforms]))
+
+    def find(self, name: str) -> "Node":
+        """First node called `name`, depth first (self included)."""
+        if self.name == name:
+            return self
+        for child in self.children:
+            try:
+                return child.find(name)
+            except KeyError:
+                pass
+        raise KeyError(name)
+
+    def parts(self, matrix=None, name: str | None = None):
+        """Yield (geometry, 4x4 transform, name) for every placed geometry; name is the nearest named node."""
+        matrix = self._transform if matrix is None else matrix @ self._transform
+        name = self.name or name
+        if self.geometry is not None:
+            yield self.geometry, matrix, name
+        for child in self.children:
+            yield from child.parts(matrix, name)
+
+    # -- lazy results --------------------------------------------------------
+
+    def instances(self) -> list[tuple[Shape, np.ndarray, str | None]]:
+        """[(geometry, (N, 4, 4) transforms, name)] with one entry per distinct geometry, in first-use order."""
+        groups: dict[int, tuple[Shape, list, str | None]] = {}
+        for geometry, matrix, name in self.parts():
+            groups.setdefault(id(geometry), (geometry, [], name))[1].append(matrix)
+        return [(g, np.stack(ts), name) for g, ts, name in groups.values()]
+
+    def flatten(self) -> tuple[np.ndarray, np.ndarray]:
+        """Every placement concatenated into one (vertices, faces) mesh (overlaps are not unioned)."""
+        meshes = [place(*g.indexed, ts) for g, ts, _ in self.instances()]
+        if not meshes:
+            return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+        offsets = np.cumsum([0] + [len(v) for v, _ in meshes[:-1]])
+        return (np.concatenate([v for v, _ in meshes]),
+                np.concatenate([f + o for (_, f), o in zip(meshes, offsets)]))
+
+    def _local_bounds(self):
+        """(mins, maxs) of this subtree before its own transform, or None if empty; cached."""
+        if self._bounds is None:
+            boxes = []
+            if self.geometry is not None:
+                boxes.append(self.geometry.bounds)
+            for child in self.children:
+                b = child._local_bounds()
+                if b is not None:
+                    c = _corners(*b) @ child._transform[:3, :3].T + child._transform[:3, 3]
+                    boxes.append((c.min(axis=0), c.max(axis=0)))
+            self._bounds = ((np.min([b[0] for b in boxes], axis=0), np.max([b[1] for b in boxes], axis=0))
+                            if boxes else ())
+        return self._bounds or None
+
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """(mins, maxs) of the subtree with this node's transform applied."""
+        b = self._local_bounds()
+        if b is None:
+            raise ValueError(f"node {self.name!r} has no geometry")
+        c = _corners(*b) @ self._transform[:3, :3].T + self._transform[:3, 3]
+        return c.min(axis=0), c.max(axis=0)
+
+    def __repr__(self) -> str:
+        return f"Node({self.name!r}, children={len(self.children)}{', geometry' if self.geometry else ''})"
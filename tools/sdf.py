@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Implicit (signed distance) modeling: rounded, blended and offset solids.
+
+An `SDF` is a small expression tree - primitives, booleans, smooth booleans,
+offsets, rigid transforms - evaluated on (N, 3) point arrays in one numpy
+pass per node. Negative is inside, and every node is 1-Lipschitz (no
+steeper than a true distance), which is what the mesher relies on:
+
+1. octree: blocks of the lattice whose center is further from the surface
+   than their half-diagonal cannot contain it and are dropped, level by
+   level, all blocks of a level in one batched evaluation;
+2. the surviving leaf blocks (`block` cells on a side) are evaluated
+   densely, in batches, in a process pool when there is more than one CPU;
+3. cubes whose corners change sign are split into six tetrahedra (the
+   Kuhn split, consistent across neighbours) and triangulated by marching
+   tetrahedra from a 16-case table; vertices on shared lattice edges are
+   welded, so the mesh is closed and outward-wound.
+
+Marching tetrahedra rather than marching cubes: its table has no ambiguous
+cases, so there are no cracks to patch, at about twice the triangle count.
+
+Usage:
+    from sdf import box, cylinder, triangulate
+    lid = box(40, 40, 6, radius=2).smooth_union(cylinder(6, 14), k=3) - cylinder(2, 20, cz=-1)
+    vertices, faces = triangulate(lid, resolution=0.2)
+    canonical.save_stl((vertices, faces), "lid.stl")
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+
+import numpy as np
+
+from mesh_arrays import rotation, translation
+
+
+class SDF:
+    """Node of a signed-distance expression; call it on (N, 3) points for (N,) distances (mm)."""
+
+    def __init__(self, op: str, params: tuple = (), children: tuple = ()):
+        self.op, self.params, self.children = op, params, tuple(children)
+
+    def __call__(self, points: np.ndarray) -> np.ndarray:
+        return _EVAL[self.op](np.asarray(points, dtype=np.float64), *self.params,
+                              *(c for c in self.children))
+
+    def __or__(self, other: "SDF") -> "SDF":
+        return union(self, other)
+
+    def __and__(self, other: "SDF") -> "SDF":
+        return intersection(self, other)
+
+    def __sub__(self, other: "SDF") -> "SDF":
+        return difference(self, other)
+
+    def smooth_union(self, other: "SDF", k: float) -> "SDF":
+        return union(self, other, k=k)
+
+    def smooth_difference(self, other: "SDF", k: float) -> "SDF":
+        return difference(self, other, k=k)
+
+    def offset(self, r: float) -> "SDF":
+        """Grow by r mm (shrink if negative); growing rounds every convex edge by r."""
+        return SDF("offset", (float(r),), (self,))
+
+    def shell(self, thickness: float) -> "SDF":
+        """Hollow wall of `thickness` mm centered on the surface."""
+        return SDF("shell", (float(thickness) / 2,), (self,))
+
+    def transform(self, t: np.ndarray) -> "SDF":
+        """Apply a rigid 4x4 transform (rotation + translation; distances must be preserved)."""
+        t = np.asarray(t, dtype=np.float64)
+        r = t[:3, :3]
+        if not np.allclose(r @ r.T, np.eye(3), atol=1e-9):
+            raise ValueError("SDF transforms must be rigid (use scale() for uniform scaling)")
+        return SDF("transform", (r, t[:3, 3]), (self,))
+
+    def translate(self, dx: float = 0, dy: float = 0, dz: float = 0) -> "SDF":
+        return self.transform(translation(dx, dy, dz))
+
+    def rotate(self, axis: str, degrees: float) -> "SDF":
+        return self.transform(rotation(axis, degrees))
+
+    def scale(self, s: float) -> "SDF":
+        return SDF("scale", (float(s),), (self,))
+
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """Conservative axis-aligned (lo, hi) of the solid."""
+        return _BOUNDS[self.op](*self.params, *(c.bounds() for c in self.children))
+
+
+# ── primitives (placement follows mesh_primitives: centered in XY, bottom at cz) ──
+
+def sphere(r: float, cx: float = 0, cy: float = 0, cz: float = 0) -> SDF:
+    return SDF("sphere", (float(r), np.array([cx, cy, cz], dtype=np.float64)))
+
+
+def box(w: float, d: float, h: float, cx: float = 0, cy: float = 0, cz: float = 0, radius: float = 0) -> SDF:
+    """Box, optionally with all edges and corners rounded by `radius`."""
+    half = np.array([w, d, h], dtype=np.float64) / 2
+    return SDF("box", (half, np.array([cx, cy, cz + h / 2]), float(radius)))
+
+
+def cylinder(r: float, h: float, cx: float = 0, cy: float = 0, cz: float = 0, radius: float = 0) -> SDF:
+    """Z-axis cylinder, optionally with both rims rounded by `radius`."""
+    return SDF("cylinder", (float(r), float(h) / 2, np.array([cx, cy, cz + h / 2]), float(radius)))
+
+
+def capsule(a, b, r: float) -> SDF:
+    """All points within r of the segment a-b."""
+    return SDF("capsule", (np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64), float(r)))
+
+
+def torus(r_major: float, r_minor: float, cx: float = 0, cy: float = 0, cz: float = 0) -> SDF:
+    """Ring around the Z axis through (cx, cy, cz)."""
+    return SDF("torus", (float(r_major), float(r_minor), np.array([cx, cy, cz], dtype=np.float64)))
+
+
+def union(*parts: SDF, k: float = 0) -> SDF:
+    """Union; with k > 0 the seams are blended over about k mm (a fillet of radius ~k)."""
+    out = parts[0]
+    for p in parts[1:]:
+        out = SDF("smooth_union", (float(k),), (out, p)) if k > 0 else SDF("union", (), (out, p))
+    return out
+
+
+def intersection(*parts: SDF, k: float = 0) -> SDF:
+    out = parts[0]
+    for p in parts[1:]:
+        out = SDF("smooth_intersection", (float(k),), (out, p)) if k > 0 else SDF("intersection", (), (out, p))
+    return out
+
+
+def difference(base: SDF, *tools: SDF, k: float = 0) -> SDF:
+    """base minus every tool; with k > 0 the cut edges are rounded over about k mm."""
+    out = base
+    for p in tools:
+        out = SDF("smooth_difference", (float(k),), (out, p)) if k > 0 else SDF("difference", (), (out, p))
+    return out
+
+
+def _length(v: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.einsum("...i,...i->...", v, v))
+
+
+# per-column arithmetic below: reductions over a length-2/3 axis are far slower in numpy
+
+
+def _box(p, half, center, radius):
+    qx, qy, qz = (np.abs(p[:, a] - center[a]) - (half[a] - radius) for a in range(3))
+    outside = np.sqrt(np.maximum(qx, 0) ** 2 + np.maximum(qy, 0) ** 2 + np.maximum(qz, 0) ** 2)
+    return outside + np.minimum(np.maximum(np.maximum(qx, qy), qz), 0) - radius
+
+
+def _cylinder(p, r, half_h, center, radius):
+    dr = np.hypot(p[:, 0] - center[0], p[:, 1] - center[1]) - (r - radius)
+    dz = np.abs(p[:, 2] - center[2]) - (half_h - radius)
+    return np.hypot(np.maximum(dr, 0), np.maximum(dz, 0)) + np.minimum(np.maximum(dr, dz), 0) - radius
+
+
+def _capsule(p, a, b, r):
+    ab = b - a
+    t = np.clip((p - a) @ ab / max(ab @ ab, 1e-300), 0, 1)
+    return _length(p - a - t[:, None] * ab) - r
+
+
+def _torus(p, r_major, r_minor, center):
+    q = p - center
+    return np.hypot(np.hypot(q[:, 0], q[:, 1]) - r_major, q[:, 2]) - r_minor
+
+
+def _smooth_union(p, k, a, b):
+    da, db = a(p), b(p)
+    h = np.clip(0.5 + 0.5 * (db - da) / k, 0, 1)
+    return db + (da - db) * h - k * h * (1 - h)
+
+
+def _smooth_intersection(p, k, a, b):
+    da, db = a(p), b(p)
+    h = np.clip(0.5 - 0.5 * (db - da) / k, 0, 1)
+    return db + (da - db) * h + k * h * (1 - h)
+
+
+def _smooth_difference(p, k, a, b):
+    da, db = a(p), -b(p)
+    h = np.clip(0.5 - 0.5 * (db - da) / k, 0, 1)
+    return db + (da - db) * h + k * h * (1 - h)
+
+
+_EVAL = {
+    "sphere": lambda p, r, c: _length(p - c) - r,
+    "box": _box,
+    "cylinder": _cylinder,
+    "capsule": _capsule,
+    "torus": _torus,
+    "union": lambda p, a, b: np.minimum(a(p), b(p)),
+    "intersection": lambda p, a, b: np.maximum(a(p), b(p)),
+    "difference": lambda p, a, b: np.maximum(a(p), -b(p)),
+    "smooth_union": _smooth_union,
+    "smooth_intersection": _smooth_intersection,
+    "smooth_difference": _smooth_difference,
+    "offset": lambda p, r, a: a(p) - r,
+    "shell": lambda p, half, a: np.abs(a(p)) - half,
+    "transform": lambda p, r, t, a: a((p - t) @ r),          # inverse of x -> r x + t
+    "scale": lambda p, s, a: a(p / s) * s,
+}
+
+
+def _grow(b, d):
+    return b[0] - d, b[1] + d
+
+
+def _transformed_bounds(r, t, b):
+    corners = np.array(list(itertools.product(*zip(b[0], b[1]))))
+    moved = corners @ r.T + t
+    return moved.min(axis=0), moved.max(axis=0)
+
+
+_BOUNDS = {
+    "sphere": lambda r, c: (c - r, c + r),
+    "box": lambda half, c, radius: (c - half, c + half),
+    "cylinder": lambda r, half_h, c, radius: (c - [r, r, half_h], c + [r, r, half_h]),
+    "capsule": lambda a, b, r: (np.minimum(a, b) - r, np.maximum(a, b) + r),
+    "torus": lambda rM, rm, c: (c - [rM + rm, rM + rm, rm], c + [rM + rm, rM + rm, rm]),
+    "union": lambda a, b: (np.minimum(a[0], b[0]), np.maximum(a[1], b[1])),
+    "intersection": lambda a, b: (np.maximum(a[0], b[0]), np.minimum(a[1], b[1])),
+    "difference": lambda a, b: a,
+    "smooth_union": lambda k, a, b: _grow((np.minimum(a[0], b[0]), np.maximum(a[1], b[1])), k / 4),
+    "smooth_intersection": lambda k, a, b: (np.maximum(a[0], b[0]), np.minimum(a[1], b[1])),
+    "smooth_difference": lambda k, a, b: a,
+    "offset": lambda r, a: _grow(a, max(r, 0.0)),
+    "shell": lambda half, a: _grow(a, half),
+    "transform": _transformed_bounds,
+    "scale": lambda s, a: (a[0] * s, a[1] * s),
+}
+
+
+# ── marching tetrahedra ──
+
+# cube corner c sits at offset ((c >> 0) & 1, (c >> 1) & 1, (c >> 2) & 1)
+_CORNER = np.array([[(c >> a) & 1 for a in range(3)] for c in range(8)])
+# Kuhn split: one tetrahedron per axis order, each a monotone path 000 -> 111
+_TETS = np.array([[0, 1 << p[0], (1 << p[0]) | (1 << p[1]), 7] for p in itertools.permutations(range(3))])
+
+
+def _tet_table() -> tuple[np.ndarray, np.ndarray]:
+    """(6, 16, 2, 3, 2) cube-corner pairs per output triangle and (6, 16) triangle counts.
+
+    Triangles are wound so their normal points from the inside (negative)
+    corners to the outside ones. Every tetrahedron edge joins a corner to one
+    with a superset of its bits, so the lower-numbered corner is also the
+    lower lattice point.
+    """
+    edges = np.zeros((6, 16, 2, 3, 2), dtype=np.int64)
+    count = np.zeros((6, 16), dtype=np.int64)
+    for t, tet in enumerate(_TETS):
+        for mask in range(1, 15):
+            inside = [q for q in range(4) if mask >> q & 1]
+            outside = [q for q in range(4) if not mask >> q & 1]
+            if len(inside) == 2:
+                (a, b), (c, d) = inside, outside
+                tris = [[(a, c), (a, d), (b, d)], [(a, c), (b, d), (b, c)]]
+            else:
+                lone, rest = (inside[0], outside) if len(inside) == 1 else (outside[0], inside)
+                tris = [[(lone, o) for o in rest]]
+            inner = _CORNER[tet[inside]].mean(axis=0)
+            for s, tri in enumerate(tris):
+                pts = np.array([(_CORNER[tet[u]] + _CORNER[tet[v]]) / 2 for u, v in tri])
+                n = np.cross(pts[1] - pts[0], pts[2] - pts[0])
+                if n @ (pts.mean(axis=0) - inner) < 0:
+                    tri = tri[::-1]
+                edges[t, mask, s] = [sorted((tet[u], tet[v])) for u, v in tri]     # lower corner first
+            count[t, mask] = len(tris)
+    return edges, count
+
+
+_TRI_EDGES, _TRI_COUNT = _tet_table()
+
+
+def _leaves(f: SDF, lo: np.ndarray, res: float, top: int, cells: np.ndarray, block: int) -> np.ndarray:
+    """Lattice corners (M, 3) of the leaf blocks (`block` cells) that may contain the surface."""
+    size = top
+    corners = np.stack(np.meshgrid(*(np.arange(0, n, top) for n in cells), indexing="ij"), -1).reshape(-1, 3)
+    while True:
+        center = lo + (corners + size / 2) * res
+        reach = size * res * np.sqrt(3) / 2
+        corners = corners[np.abs(f(center)) <= reach * (1 + 1e-9) + 1e-12]
+        if size == block:
+            return corners
+        size //= 2
+        corners = (corners[:, None, :] + _CORNER[None] * size).reshape(-1, 3)
+
+
+def _mesh_blocks(f: SDF, lo: np.ndarray, res: float, dims: np.ndarray, block: int, corners: np.ndarray):
+    """Mesh a batch of leaf blocks: (edge keys (U,), vertices (U, 3), faces (T, 3) into them).
+
+    A vertex is keyed by the lattice edge it lies on (lower point x 8 + edge
+    direction), so neighbouring batches produce the same key and position.
+    """
+    n = block + 1
+    local = np.stack(np.meshgrid(*(np.arange(n),) * 3, indexing="ij"), -1).reshape(-1, 3)
+    idx = corners[:, None, :] + local[None]                                  # (L, n³, 3) lattice indices
+    values = f((lo + idx.reshape(-1, 3) * res)).reshape(len(corners), n, n, n)
+    values[values == 0] = 1e-12                                              # no vertex exactly on the surface
+
+    # cube corner c of cell (i, j, k) -> value at (i + dx, j + dy, k + dz)
+    shifted = [values[:, dx:dx + block, dy:dy + block, dz:dz + block] for dx, dy, dz in _CORNER]
+    leaf, i, j, k = np.nonzero((np.minimum.reduce(shifted) < 0) & (np.maximum.reduce(shifted) > 0))
+    cube = np.stack([c[leaf, i, j, k] for c in shifted], axis=1)             # (A, 8)
+    base = corners[leaf] + np.stack([i, j, k], axis=1)                       # (A, 3) lattice index of corner 0
+    gid = (base[:, 0] * dims[1] + base[:, 1]) * dims[2] + base[:, 2]
+    step = (_CORNER[:, 0] * dims[1] + _CORNER[:, 1]) * dims[2] + _CORNER[:, 2]
+
+    tet_vals = cube[:, _TETS]                                                # (A, 6, 4)
+    mask = ((tet_vals < 0) * (1 << np.arange(4))).sum(axis=-1)
+    counts = _TRI_COUNT[np.arange(6), mask]                                  # (A, 6)
+    owner, pairs = [], []
+    for s in (0, 1):
+        a, t = np.nonzero(counts > s)
+        owner.append(a)
+        pairs.append(_TRI_EDGES[t, mask[a, t], s])                           # (T, 3, 2) cube corners
+    owner, pairs = np.concatenate(owner), np.concatenate(pairs)
+    keys = (gid[owner][:, None] + step[pairs[..., 0]]) * 8 + (pairs[..., 0] ^ pairs[..., 1])
+    uniq, rep, faces = np.unique(keys.ravel(), return_index=True, return_inverse=True)
+
+    a, c = np.repeat(owner, 3)[rep], pairs.reshape(-1, 2)[rep]              # one triangle corner per vertex
+    v0, v1 = cube[a, c[:, 0]], cube[a, c[:, 1]]
+    p0 = lo + (base[a] + _CORNER[c[:, 0]]) * res
+    p1 = lo + (base[a] + _CORNER[c[:, 1]]) * res
+    return uniq, p0 + (v0 / (v0 - v1))[:, None] * (p1 - p0), faces.reshape(-1, 3)
+
+
+def triangulate(f: SDF, resolution: float = 0.2, bounds=None, block: int = 8, batch: int = 256,
+                processes: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Closed, outward-wound (vertices, faces) of the solid f < 0, sampled every `resolution` mm.
+
+    `bounds` ((lo), (hi)) defaults to `f.bounds()`; `block` is the leaf size
+    in cells (a power of two); `batch` leaves are evaluated per numpy call,
+    spread over `processes` workers (default: one per CPU).
+    """
+    lo, hi = (np.asarray(b, dtype=np.float64) for b in (bounds or f.bounds()))
+    lo, hi = lo - 2 * resolution, hi + 2 * resolution
+    need = np.ceil((hi - lo) / resolution).astype(np.int64)
+    top = block * 2 ** max(int(np.ceil(np.log2(max(need.max() / block, 1) / 4))), 0)   # about 4 top blocks a side
+    cells = -(-need // top) * top
+    dims = cells + 1
+    leaves = _leaves(f, lo, resolution, top, cells, block)
+
+    chunks = [leaves[i:i + batch] for i in range(0, len(leaves), batch)]
+    processes = processes or os.cpu_count() or 1
+    if processes > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+            parts = list(pool.map(_mesh_blocks, *zip(*[(f, lo, resolution, dims, block, c) for c in chunks])))
+    else:
+        parts = [_mesh_blocks(f, lo, resolution, dims, block, c) for c in chunks]
+    if not parts:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+    start = np.cumsum([0] + [len(k) for k, _, _ in parts[:-1]])
+    _, first, index = np.unique(np.concatenate([k for k, _, _ in parts]), return_index=True, return_inverse=True)
+    vertices = np.concatenate([v for _, v, _ in parts])[first]
+    faces = index[np.concatenate([fc + s for (_, _, fc), s in zip(parts, start)])]
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return vertices, faces[keep]
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+    import time
+
+    ap = argparse.ArgumentParser(description="Mesh a demo SDF part (rounded lid with a blended boss).")
+    ap.add_argument("out", help="STL path")
+    ap.add_argument("--resolution", type=float, default=0.2, help="mm")
+    ap.add_argument("--processes", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    from canonical import save_stl
+
+    lid = box(40, 40, 4, radius=1.5).smooth_union(cylinder(6, 12, radius=1), k=3) - cylinder(2.5, 20, cz=-1)
+    t0 = time.perf_counter()
+    vertices, faces = triangulate(lid, args.resolution, processes=args.processes)
+    print(f"{len(faces)} triangles in {time.perf_counter() - t0:.2f} s")
+    save_stl((vertices, faces), args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""`Shape`: one part, held as whichever representation exists, converted lazily and cached.
+
+Representations ("kinds"):
+- "brep": OCP `TopoDS_Shape`
+- "stl": numpy-stl `stl.Mesh` (triangle soup)
+- "indexed": shared-vertex `(vertices, faces)` numpy arrays
+- "manifold": manifold3d `Manifold`
+- "trimesh": trimesh `Trimesh`
+
+Every conversion goes through "indexed":
+- BRep is triangulated in memory (`step_primitives.triangulate`).
+- A soup is welded.
+- Manifold and trimesh hand over their arrays.
+Each result is cached on the wrapper, so asking twice costs nothing. A BRep
+can't be rebuilt from triangles, so `brep` only exists when it was the source.
+
+Mutate through `transform` or `replace`; both drop every cached conversion
+except the new source. After editing a source object in place, call
+`invalidate()`.
+
+`mesh_arrays.as_indexed` / `as_manifold` and `bbox.get_extents` accept a
+Shape and use its cache, so exporters, booleans and bounding boxes share one
+conversion.
+
+Usage:
+    from shape import Shape
+    part = Shape(build_carrier())              # OCP
+    part.bounds, part.volume                   # triangulated once
+    save_3mf(part, "carrier.3mf")              # reuses the same arrays
+    cut = part - Shape(make_cylinder(5, 10))   # manifold3d boolean -> new Shape
+"""
+from __future__ import annotations
+
+from collections import Counter
+
+import numpy as np
+
+from mesh_arrays import is_instance_by_name, weld
+
+KINDS = ("brep", "stl", "indexed", "manifold", "trimesh")
+
+
+def _kind(thing) -> str:
+    if isinstance(thing, tuple) and len(thing) == 2:
+        return "indexed"
+    for kind, package, name in (("brep", "OCP", "TopoDS_Shape"), ("stl", "stl", "Mesh"),
+                                ("manifold", "manifold3d", "Manifold"), ("trimesh", "trimesh", "Trimesh")):
+        if is_instance_by_name(thing, package, name):
+            return kind
+    raise TypeError(f"Unsupported shape type: {type(thing).__name__}")
+
+
+class Shape:
+    """One part; `brep`, `stl`, `indexed`, `manifold`, `trimesh` convert on first use and are cached.
+
+    `conversions` counts the conversions actually performed, per target kind.
+    """
+
+    def __init__(self, thing, deflection: float | None = None):
+        self.deflection = deflection
+        self.conversions: Counter[str] = Counter()
+        self.replace(thing)
+
+    # -- state ---------------------------------------------------------------
+
+    def replace(self, thing) -> None:
+        """Swap in a new source representation, dropping every cached conversion."""
+        if isinstance(thing, Shape):
+            thing = thing._cache[thing.source]
+        kind = _kind(thing)
+        if kind == "indexed":
+            thing = (np.asarray(thing[0], dtype=np.float64), np.asarray(thing[1], dtype=np.int64))
+        self.source = kind
+        self._cache = {kind: thing}
+
+    def invalidate(self) -> None:
+        """Drop cached conversions (keep the source), e.g. after editing the source in place."""
+        self._cache = {self.source: self._cache[self.source]}
+
+    def cached(self) -> list[str]:
+        return [k for k in KINDS if k in self._cache]
+
+    # -- conversions ---------------------------------------------------------
+
+    def _get(self, kind: str):
+        if kind not in self._cache:
+            self._cache[kind] = self._convert(kind)
+            self.conversions[kind] += 1
+        return self._cache[kind]
+
+    def _convert(self, kind: str):
+        if kind == "brep":
+            raise ValueError(f"a {self.source!r} shape can't be converted to BRep")
+        if kind == "indexed":
+            src = self._cache[self.source]
+            if self.source == "brep":
+                from step_primitives import triangulate
+
+                return triangulate(src, deflection=self.deflection)
+            if self.source == "stl":
+                return weld(src.vectors)
+            if self.source == "trimesh":
+                return np.asarray(src.vertices, dtype=np.float64), np.asarray(src.faces, dtype=np.int64)
+            m = src.to_mesh()
+            return np.asarray(m.vert_properties, dtype=np.float64)[:, :3], np.asarray(m.tri_verts, dtype=np.int64)
+        vertices, faces = self.indexed
+        if kind == "stl":
+            from mesh_primitives import from_indexed
+
+            return from_indexed(vertices, faces)
+        if kind == "manifold":
+            from mesh_arrays import as_manifold
+
+            return as_manifold((vertices, faces))
+        if kind == "trimesh":
+            import trimesh
+
+            return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+        raise ValueError(f"unknown kind {kind!r}")
+
+    @property
+    def brep(self):
+        return self._get("brep")
+
+    @property
+    def stl(self):
+        return self._get("stl")
+
+    @property
+    def indexed(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._get("indexed")
+
+    @property
+    def manifold(self):
+        return self._get("manifold")
+
+    @property
+    def trimesh(self):
+        return self._get("trimesh")
+
+    # -- queries -------------------------------------------------------------
+
+    @property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """(mins, maxs); exact from the BRep when that is the source, else from the cheapest mesh at hand."""
+        if self.source == "brep" and "indexed" not in self._cache:
+            from step_primitives import get_bbox
+
+            b = get_bbox(self.brep)
+            return np.array(b[:3]), np.array(b[3:])
+        if "stl" in self._cache and "indexed" not in self._cache:
+            v = self.stl.vectors.reshape(-1, 3)
+        else:
+            v = self.indexed[0]
+        return v.min(axis=0).astype(np.float64), v.max(axis=0).astype(np.float64)
+
+    @property
+    def volume(self) -> float:
+        return float(self.manifold.volume())
+
+    # -- mutation and booleans -----------------------------------------------
+
+    def transform(self, matrix) -> "Shape":
+        """Apply a 4x4 transform to the source in place (mirrors keep outward winding); returns self."""
+        t = np.asarray(matrix, dtype=np.float64)
+        src = self._cache[self.source]
+        if self.source == "brep":
+            from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
+            from OCP.gp import gp_Trsf
+
+            trsf = gp_Trsf()
+            trsf.SetValues(*t[:3].ravel())
+            src = BRepBuilderAPI_Transform(src, trsf, True).Shape()
+        elif self.source == "stl":
+            from mesh_primitives import transform
+
+            src = transform(src, t)
+        elif self.source == "indexed":
+            vertices, faces = src
+            src = (vertices @ t[:3, :3].T + t[:3, 3], faces[:, ::-1] if np.linalg.det(t[:3, :3]) < 0 else faces)
+        elif self.source == "manifold":
+            src = src.transform(t[:3])
+        else:
+            src = src.copy()
+            src.apply_transform(t)
+        self.replace(src)
+        return self
+
+    def __add__(self, other: "Shape") -> "Shape":
+        return Shape(self.manifold + _as_shape(other).manifold)
+
+    def __sub__(self, other: "Shape") -> "Shape":
+        return Shape(self.manifold - _as_shape(other).manifold)
+
+    def __xor__(self, other: "Shape") -> "Shape":
+        return Shape(self.manifold ^ _as_shape(other).manifold)
+
+    def __repr__(self) -> str:
+        return f"Shape(source={self.source!r}, cached={self.cached()})"
+
+
+def _as_shape(thing) -> Shape:
+    return thing if isinstance(thing, Shape) else Shape(thing)
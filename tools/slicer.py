@@ -0,0 +1,183 @@
+"""Batched planar slicing: cross-sections of a closed mesh at a stack of Z planes.
+
+Every triangle is bucketed once by the range of planes it spans (two
+`searchsorted` calls), then all (triangle, plane) crossings are intersected in
+one numpy pass. Per-layer area and perimeter come straight from the oriented
+segments (shoelace sum / lengths via `bincount`), so they need no polygon
+chaining; `Slices.polygons(i)` chains one layer into closed loops on demand.
+
+Segments are oriented so outer contours run counter-clockwise (seen from +Z)
+and holes clockwise, i.e. signed area is material area. A vertex lying exactly
+on a plane counts as below it (symbolic perturbation), which keeps every
+crossing edge shared by exactly two segments on a closed mesh.
+
+Usage:
+    from slicer import slice_mesh, save_svg
+    s = slice_mesh(trimesh.load("part.stl"), layer_height=0.2)
+    print(s.z, s.area, s.perimeter)
+    save_svg(s, "sections.svg", layers=[0, len(s.z) // 2, -1])
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from mesh_arrays import as_indexed
+
+
+class Slices:
+    """Sections of one mesh: per-layer `z`, `area` (mm²), `perimeter` (mm)."""
+
+    def __init__(self, z, area, perimeter, seg_layer, seg_start, seg_end, key_start, key_end):
+        self.z = z
+        self.area = area
+        self.perimeter = perimeter
+        self._layer = seg_layer          # (S,) layer index of each segment, sorted
+        self._p0, self._p1 = seg_start, seg_end
+        self._k0, self._k1 = key_start, key_end
+        self._bounds = np.searchsorted(seg_layer, np.arange(len(z) + 1))
+
+    def __len__(self) -> int:
+        return len(self.z)
+
+    def segments(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        """Oriented (start, end) XY points of layer i's segments, each (K, 2)."""
+        a, b = self._bounds[i], self._bounds[i + 1]
+        return self._p0[a:b], self._p1[a:b]
+
+    def polygons(self, i: int) -> list[np.ndarray]:
+        """Closed loops of layer i as (K, 2) arrays; open chains (non-manifold input) are dropped."""
+        a, b = self._bounds[i], self._bounds[i + 1]
+        k0, k1, pts = self._k0[a:b], self._k1[a:b], self._p0[a:b]
+        order = np.argsort(k0)
+        pos = np.searchsorted(k0[order], k1)
+        pos[pos >= len(order)] = 0
+        nxt = np.where(k0[order[pos]] == k1, order[pos], -1)
+        seen = np.zeros(b - a, dtype=bool)
+        loops = []
+        for s in range(b - a):
+            if seen[s]:
+                continue
+            chain, cur = [], s
+            while cur >= 0 and not seen[cur]:
+                seen[cur] = True
+                chain.append(cur)
+                cur = nxt[cur]
+            if cur == s and len(chain) >= 3:
+                loops.append(pts[chain])
+        return loops
+
+
+def _layer_zs(zmin: float, zmax: float, layer_height: float) -> np.ndarray:
+    """Mid-layer sample heights, as a slicer would use."""
+    n = max(int(np.floor((zmax - zmin) / layer_height + 1e-9)), 1)
+    return zmin + (np.arange(n) + 0.5) * layer_height
+
+
+def slice_mesh(thing, layer_height: float = 0.2, zs=None) -> Slices:
+    """Slice anything `mesh_arrays.as_indexed` accepts at `zs` (default: mid-layer heights)."""
+    vertices, faces = as_indexed(thing)
+    tri_z = vertices[faces, 2]
+    if zs is None:
+        zs = _layer_zs(vertices[:, 2].min(), vertices[:, 2].max(), layer_height)
+    zs = np.sort(np.asarray(zs, dtype=np.float64))
+
+    # Triangle t crosses plane j iff zmin_t <= z_j < zmax_t: a contiguous plane range.
+    i0 = np.searchsorted(zs, tri_z.min(axis=1), side="left")
+    i1 = np.searchsorted(zs, tri_z.max(axis=1), side="left")
+    counts = i1 - i0
+    tri = np.repeat(np.arange(len(faces)), counts)
+    layer = np.repeat(i0 - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    z = zs[layer]
+
+    f = faces[tri]                                    # (S, 3) vertex ids
+    above = vertices[f, 2] > z[:, None]               # (S, 3)
+    # the "lonely" corner is the one alone on its side of the plane
+    n_above = above.sum(axis=1)
+    lonely = np.where(n_above == 1, above.argmax(axis=1), above.argmin(axis=1))
+    rows = np.arange(len(f))
+    a = f[rows, lonely]
+    b = f[rows, (lonely + 1) % 3]
+    c = f[rows, (lonely + 2) % 3]
+
+    def cross_edge(u, v):
+        lo, hi = np.minimum(u, v), np.maximum(u, v)   # canonical edge -> identical point on both sides
+        pu, pv = vertices[lo], vertices[hi]
+        t = (z - pu[:, 2]) / (pv[:, 2] - pu[:, 2])
+        return pu[:, :2] + t[:, None] * (pv[:, :2] - pu[:, :2]), lo * len(vertices) + hi
+
+    p0, k0 = cross_edge(a, b)
+    p1, k1 = cross_edge(c, a)
+    # outward normal n; material boundary runs along z × n (CCW outer loops)
+    n = np.cross(vertices[b] - vertices[a], vertices[c] - vertices[a])
+    d = p1 - p0
+    flip = (d[:, 0] * -n[:, 1] + d[:, 1] * n[:, 0]) < 0
+    p0[flip], p1[flip] = p1[flip], p0[flip].copy()
+    k0[flip], k1[flip] = k1[flip], k0[flip].copy()
+
+    order = np.argsort(layer, kind="stable")
+    layer, p0, p1, k0, k1 = layer[order], p0[order], p1[order], k0[order], k1[order]
+    cross2 = p0[:, 0] * p1[:, 1] - p1[:, 0] * p0[:, 1]
+    area = 0.5 * np.bincount(layer, weights=cross2, minlength=len(zs))
+    perimeter = np.bincount(layer, weights=np.linalg.norm(p1 - p0, axis=1), minlength=len(zs))
+    return Slices(zs, area, perimeter, layer, p0, p1, k0, k1)
+
+
+def _grid(slices: Slices, layers):
+    layers = range(len(slices)) if layers is None else [i % len(slices) for i in layers]
+    loops = [(i, slices.polygons(i)) for i in layers]
+    pts = np.concatenate([np.concatenate(p) for _, p in loops if p] or [np.zeros((1, 2))])
+    lo, hi = pts.min(axis=0), pts.max(axis=0)
+    return loops, lo, hi
+
+
+def save_svg(slices: Slices, filepath: str, layers=None, cols: int = 4, scale: float = 4.0) -> None:
+    """Write the chosen layers (default all) as a grid of filled sections, px per mm = scale."""
+    loops, lo, hi = _grid(slices, layers)
+    w, h = (hi - lo) * scale + 20
+    cols = max(1, min(cols, len(loops)))
+    rows = -(-len(loops) // cols)
+    body = []
+    for k, (i, polys) in enumerate(loops):
+        ox, oy = (k % cols) * w + 10, (k // cols) * h + 10
+        d = " ".join(
+            "M " + " L ".join(f"{ox + (x - lo[0]) * scale:.2f},{oy + (hi[1] - y) * scale:.2f}" for x, y in p) + " Z"
+            for p in polys
+        )
+        body.append(f'<path d="{d}" fill="#4682B4" fill-rule="evenodd" stroke="#222" stroke-width="0.5"/>'
+                    f'<text x="{ox}" y="{oy + h - 12}" font-size="10">z={slices.z[i]:.2f} '
+                    f'A={slices.area[i]:.1f}</text>')
+    with open(filepath, "w", encoding="utf-8") as fh:
+        fh.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{cols * w:.0f}" height="{rows * h:.0f}">\n')
+        fh.write("\n".join(body))
+        fh.write("\n</svg>\n")
+
+
+def save_png(slices: Slices, filepath: str, layers=None, cols: int = 4, dpi: int = 150) -> None:
+    """Same grid as `save_svg`, rendered with matplotlib (optional dependency)."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
+    except ImportError as exc:
+        raise ImportError("save_png needs matplotlib (pip install matplotlib); use save_svg otherwise") from exc
+
+    loops, lo, hi = _grid(slices, layers)
+    cols = max(1, min(cols, len(loops)))
+    rows = -(-len(loops) // cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(3 * cols, 3 * rows), squeeze=False)
+    for ax in axes.ravel():
+        ax.set_axis_off()
+    for ax, (i, polys) in zip(axes.ravel(), loops):
+        if polys:
+            verts = np.concatenate([np.vstack([p, p[:1]]) for p in polys])
+            codes = np.concatenate([[Path.MOVETO] + [Path.LINETO] * (len(p) - 1) + [Path.CLOSEPOLY] for p in polys])
+            ax.add_patch(PathPatch(Path(verts, codes), facecolor="#4682B4", edgecolor="#222", lw=0.5))
+        ax.set_xlim(lo[0], hi[0])
+        ax.set_ylim(lo[1], hi[1])
+        ax.set_aspect("equal")
+        ax.set_title(f"z={slices.z[i]:.2f}  A={slices.area[i]:.1f} mm²", fontsize=8)
+    fig.tight_layout()
+    fig.savefig(filepath, dpi=dpi)
+    plt.close(fig)
@@ -0,0 +1,115 @@
+"""Plane split with tenon/socket joinery, for parts taller (or wider) than the bed.
+
+`split_part` cuts a closed solid with manifold3d's `split_by_plane`; both
+halves come back closed, with the cut face capped. With `tenon_h > 0` every
+connected region of the cut section gets a tenon:
+- the tenon is the region inset by `inset`, optionally clipped to a
+  `tenon_max` square around the region's most interior point;
+- it is extruded from the cut plane into the upper half (the side the
+  normal points to) and fused onto the lower half;
+- a matching socket, grown by `clearance` per side and deepened by
+  `socket_slack`, is subtracted from the upper half.
+Regions too thin to survive the inset get no tenon.
+
+Keep `tenon_h` below the solid depth of the upper half over each region, or
+the socket breaks through.
+
+Usage:
+    from split import split_part, union
+    lower, upper = split_part(union(parts), z=75, tenon_h=16, inset=1.0, tenon_max=24, clearance=0.3)
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from mesh_arrays import as_manifold
+
+
+def union(things):
+    """One manifold3d solid from overlapping closed parts (numpy-stl, trimesh, OCP, Manifold...)."""
+    import manifold3d
+
+    return manifold3d.Manifold.batch_boolean([as_manifold(t) for t in things], manifold3d.OpType.Add)
+
+
+def _plane_frame(normal) -> np.ndarray:
+    """4x4 rotation taking `normal` to +Z."""
+    n = np.asarray(normal, dtype=np.float64)
+    n = n / np.linalg.norm(n)
+    v, c = np.cross(n, [0.0, 0.0, 1.0]), n[2]
+    r = np.eye(4)
+    if c < -1 + 1e-12:
+        r[:3, :3] = np.diag([1.0, -1.0, -1.0])
+        return r
+    k = np.array([[0, -v[2], v[1]], [v[2], 0, -v[0]], [-v[1], v[0], 0]])
+    r[:3, :3] = np.eye(3) + k + k @ k / (1 + c)
+    return r
+
+
+def _interior_point(region) -> np.ndarray:
+    """Approximate pole of inaccessibility: the grid point farthest inside the region.
+
+    Ties (e.g. along the midline of a rectangle) go to the point nearest the bounds center.
+    """
+    loops = [np.asarray(p, dtype=np.float64) for p in region.to_polygons()]
+    a = np.concatenate(loops)
+    b = np.concatenate([np.roll(p, -1, axis=0) for p in loops])
+    (x0, y0), (x1, y1) = a.min(axis=0), a.max(axis=0)
+    gx, gy = np.meshgrid(np.linspace(x0, x1, 41)[1:-1], np.linspace(y0, y1, 41)[1:-1])
+    pts = np.stack([gx.ravel(), gy.ravel()], axis=1)
+
+    x, y = pts[:, 0:1], pts[:, 1:2]
+    straddle = (a[:, 1] > y) != (b[:, 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xc = a[:, 0] + (y - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    inside = (straddle & (x < xc)).sum(axis=1) % 2 == 1
+    if not inside.any():
+        return a.mean(axis=0)
+    pts = pts[inside]
+    ab = b - a
+    t = np.clip(np.einsum("pbk,bk->pb", pts[:, None] - a, ab) / np.maximum((ab ** 2).sum(axis=1), 1e-12), 0, 1)
+    dist = np.linalg.norm(pts[:, None] - (a + t[..., None] * ab), axis=2).min(axis=1)
+    best = pts[dist >= dist.max() - 1e-9]
+    center = np.array([(x0 + x1) / 2, (y0 + y1) / 2])
+    return best[np.argmin(np.linalg.norm(best - center, axis=1))]
+
+
+def split_part(thing, z: float | None = None, normal=(0.0, 0.0, 1.0), offset: float | None = None,
+               tenon_h: float = 0.0, inset: float = 1.0, tenon_max: float | None = None,
+               clearance: float = 0.3, socket_slack: float = 1.0):
+    """Split a closed solid at a plane; returns (lower, upper) manifold3d solids in the input frame.
+
+    The plane is `z = z` by default, or `dot(normal, p) = offset` for any
+    other `normal`. "Upper" is the side `normal` points to.
+    """
+    import manifold3d
+
+    solid = as_manifold(thing)
+    d = float(z if offset is None else offset)
+    frame = _plane_frame(normal)
+    local = solid.transform(frame[:3]) if not np.allclose(frame, np.eye(4)) else solid
+    upper, lower = local.split_by_plane((0.0, 0.0, 1.0), d)
+
+    if tenon_h > 0:
+        cores = []
+        for region in local.slice(d).decompose():
+            core = region.offset(-inset, manifold3d.JoinType.Miter)
+            if core.is_empty():
+                continue
+            if tenon_max:
+                cx, cy = _interior_point(region)
+                core = core ^ manifold3d.CrossSection.square([tenon_max, tenon_max], center=True).translate([cx, cy])
+            if not core.is_empty():
+                cores.append(core)
+        if cores:
+            pins = manifold3d.CrossSection.batch_boolean(cores, manifold3d.OpType.Add)
+            tenon = manifold3d.Manifold.extrude(pins, tenon_h).translate([0.0, 0.0, d])
+            socket = manifold3d.Manifold.extrude(pins.offset(clearance, manifold3d.JoinType.Miter),
+                                                 tenon_h + socket_slack).translate([0.0, 0.0, d])
+            lower = lower + tenon
+            upper = upper - socket
+
+    if local is not solid:
+        back = frame.T
+        lower, upper = lower.transform(back[:3]), upper.transform(back[:3])
+    return lower, upper
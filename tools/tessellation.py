@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Tessellation report and deviation-bounded meshing for OCP shapes.
+
+`report` meshes a shape with a `step_primitives.PROFILES` entry and lists,
+per face: surface type, triangle count and the deviation BRepMesh actually
+achieved (distance between facets and the true surface). Flat faces show
+up as a handful of triangles at zero deviation whatever the profile; curved
+faces are where linear and angular deflection trade size for accuracy.
+
+`fit_deflection` searches for the coarsest linear deflection whose worst
+face deviation stays within a bound: the smallest file that is still
+accurate enough. `save_stl(shape, path, max_deviation=...)` uses it.
+
+Usage:
+    python tessellation.py part.step --profile print
+    python tessellation.py part.step --max-deviation 0.05
+
+    from tessellation import report
+    print(report(shape, "draft").summary())
+"""
+from __future__ import annotations
+
+import sys
+from typing import NamedTuple
+
+from step_primitives import PROFILES, Tessellation, face_triangulations, mesh_shape
+
+
+class FaceTessellation(NamedTuple):
+    index: int
+    surface: str           # "Plane", "Cylinder", "BSplineSurface", ...
+    triangles: int
+    deviation: float       # mm, as achieved by the mesher
+
+
+class Report:
+    """Result of `report`: the `settings` used and one `FaceTessellation` per face."""
+
+    def __init__(self, settings: Tessellation, faces: list[FaceTessellation]):
+        self.settings = settings
+        self.faces = faces
+        self.triangles = sum(f.triangles for f in faces)
+        self.max_deviation = max((f.deviation for f in faces), default=0.0)
+
+    def summary(self, top: int = 10) -> str:
+        s = self.settings
+        unit = "x edge" if s.relative else "mm"
+        lines = [f"linear {s.linear:g} {unit}, angular {s.angular:.1f}°: {self.triangles} triangles "
+                 f"in {len(self.faces)} faces, max deviation {self.max_deviation:.4f} mm"]
+        by_type: dict[str, list[int]] = {}
+        for f in self.faces:
+            t = by_type.setdefault(f.surface, [0, 0])
+            t[0] += 1
+            t[1] += f.triangles
+        lines += [f"  {name:<16s} {n:4d} faces {tris:7d} triangles" for name, (n, tris) in sorted(by_type.items())]
+        worst = sorted(self.faces, key=lambda f: -f.triangles)[:top]
+        lines += [f"  face {f.index:4d} {f.surface:<16s} {f.triangles:6d} tris  dev {f.deviation:.4f}" for f in worst]
+        return "\n".join(lines)
+
+
+def _surface_name(face) -> str:
+    from OCP.BRepAdaptor import BRepAdaptor_Surface
+
+    return str(BRepAdaptor_Surface(face).GetType()).rsplit(".", 1)[-1].replace("GeomAbs_", "")
+
+
+def report(shape, profile: str = "print", **overrides) -> Report:
+    """Mesh `shape` with a profile (fields overridable as in `mesh_shape`) and report per face."""
+    settings = mesh_shape(shape, profile, **overrides)
+    return _collect(shape, settings)
+
+
+def _collect(shape, settings: Tessellation) -> Report:
+    faces = []
+    for i, (face, tri, _) in enumerate(face_triangulations(shape)):
+        faces.append(FaceTessellation(i, _surface_name(face), tri.NbTriangles() if tri is not None else 0,
+                                      tri.Deflection() if tri is not None else 0.0))
+    return Report(settings, faces)
+
+
+def fit_deflection(shape, max_deviation: float, profile: str = "print", angular: float | None = None,
+                   steps: int = 8) -> Report:
+    """Mesh `shape` with the coarsest absolute linear deflection keeping every face within `max_deviation`.
+
+    Bisects (log scale) between max_deviation / 4 and 4 x max_deviation; the
+    shape is left meshed with the winner, whose report is returned.
+    """
+    def attempt(linear):
+        return _collect(shape, mesh_shape(shape, profile, deflection=linear, angular=angular, relative=False))
+
+    lo, hi = max_deviation / 4, max_deviation * 4
+    best = attempt(lo)
+    if best.max_deviation > max_deviation:
+        raise ValueError(f"cannot reach {max_deviation} mm: {best.max_deviation:.4f} mm at deflection {lo:g}")
+    top = attempt(hi)
+    if top.max_deviation <= max_deviation:
+        return top
+    r = top
+    for _ in range(steps):
+        mid = (lo * hi) ** 0.5
+        r = attempt(mid)
+        if r.max_deviation <= max_deviation:
+            lo, best = mid, r
+        else:
+            hi = mid
+    if r is not best:
+        attempt(best.settings.linear)          # leave the shape meshed with the winner
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from step_primitives import load_step
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("step", help="STEP file")
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="print")
+    ap.add_argument("--max-deviation", type=float, default=None, help="mm; search the coarsest mesh within it")
+    args = ap.parse_args(argv)
+
+    shape = load_step(args.step)
+    if args.max_deviation is not None:
+        r = fit_deflection(shape, args.max_deviation, profile=args.profile)
+    else:
+        r = report(shape, args.profile)
+    print(r.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
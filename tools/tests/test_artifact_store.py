@@ -0,0 +1,72 @@
+"""Tests for the content-addressed artifact store."""
+import os
+
+import pytest
+
+from artifact_store import ArtifactStore, load_manifest
+from canonical import save_stl, stl_bytes
+from mesh_primitives import make_box
+
+
+def test_identical_outputs_share_one_object_and_unchanged_writes_are_skipped(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    project = tmp_path / "plugs"
+    project.mkdir()
+    plug = stl_bytes(make_box(10, 10, 20))
+    for i in range(3):
+        assert store.write(str(project / f"plug_{i}.stl"), plug, link=True)
+    assert store.stats()["objects"] == 1
+    assert os.path.samefile(project / "plug_0.stl", project / "plug_2.stl")
+    assert (project / "plug_1.stl").read_bytes() == plug
+    assert set(load_manifest(str(project))) == {"plug_0.stl", "plug_1.stl", "plug_2.stl"}
+
+    mtime = (project / "plug_1.stl").stat().st_mtime_ns
+    assert not save_stl(make_box(10, 10, 20), project / "plug_1.stl", store=store)
+    assert (project / "plug_1.stl").stat().st_mtime_ns == mtime
+
+    assert save_stl(make_box(10, 10, 25), project / "plug_1.stl", store=store)          # replaced, not edited
+    assert (project / "plug_0.stl").read_bytes() == plug
+    assert save_stl(make_box(10, 10, 20), project / "plug_3.stl", store=store)          # links by itself
+    assert os.path.samefile(project / "plug_0.stl", project / "plug_3.stl")
+    assert store.stats()["objects"] == 2
+
+
+def test_checkout_and_gc(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    project = tmp_path / "p"
+    project.mkdir()
+    store.write(str(project / "a.stl"), b"first", link=True)
+    store.write(str(project / "a.stl"), b"second", link=True)
+    store.write(str(project / "b.stl"), b"other")
+    (project / "a.stl").unlink()
+    assert store.checkout(str(project)) == 1 and (project / "a.stl").read_bytes() == b"second"
+    assert store.checkout(str(project)) == 0
+    assert store.checkout(str(project), link=True) == 2      # both become links
+    assert store.checkout(str(project), link=True) == 0
+
+    count, _ = store.gc([str(project)])
+    assert count == 2                              # the "first" object and its unlinked shared copy
+    assert store.stats()["objects"] == 2
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_plain_writer_on_a_linked_output_is_detected_and_repaired(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    (tmp_path / "p1").mkdir()
+    (tmp_path / "p2").mkdir()
+    a, b = tmp_path / "p1" / "a.stl", tmp_path / "p2" / "b.stl"
+    original = stl_bytes(make_box(10, 10, 20))
+    store.write(str(a), original)                             # default: independent copies
+    store.write(str(b), original)
+    make_box(5, 5, 5).save(str(a))                            # numpy-stl rewrites the path in place
+    assert b.read_bytes() == original
+
+    store.write(str(a), original, link=True)
+    store.write(str(b), original, link=True)
+    os.chmod(a, 0o644)
+    make_box(5, 5, 5).save(str(a))                            # writes through the shared inode
+    assert b.read_bytes() != original
+    assert store.write(str(b), original, link=True)           # content checked, not just size
+    assert b.read_bytes() == original and store.get(store.put(original)) == original
+    assert not store.write(str(b), original, link=True)
@@ -36,3 +36,17 @@ def test_print_dimensions_prints_something(capsys):
 def test_print_dimensions_rejects_unknown_type():
     with pytest.raises(TypeError):
         print_dimensions(object())
+
+
+def test_importing_toolkit_does_not_load_ocp_or_trimesh():
+    """numpy-stl-only generators must not pay the OCP/trimesh import cost."""
+    import subprocess
+    import sys
+    from pathlib import Path
+    code = (
+        "import sys; import bbox, mesh_arrays, mesh_primitives, step_primitives, export_3mf; "
+        "print(any(m.split('.')[0] in ('OCP', 'trimesh') for m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parent.parent)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,55 @@
+"""Tests for the canonical mesh hash and byte-stable STL writer."""
+import numpy as np
+from stl import mesh as stl_mesh
+
+from canonical import canonical_hash, canonical_triangles, save_stl, stl_bytes
+from mesh_arrays import as_indexed, rotation, translation
+from mesh_primitives import make_box, transform
+from step_primitives import make_box as brep_box
+from step_primitives import save_stl as save_brep_stl
+
+
+def _shuffled(m, seed=0):
+    rng = np.random.default_rng(seed)
+    out = stl_mesh.Mesh(m.data.copy())
+    out.vectors[:] = np.roll(m.vectors[rng.permutation(len(m.vectors))], 1, axis=1)    # reorder, rotate corners
+    return out
+
+
+def test_hash_ignores_order_sharing_and_noise_but_not_geometry():
+    box = make_box(20, 10, 4)
+    key = canonical_hash(box)
+    assert canonical_hash(_shuffled(box)) == key
+    assert canonical_hash(as_indexed(box)) == key                                    # welded
+    noisy = stl_mesh.Mesh(box.data.copy())
+    noisy.vectors += 1e-6
+    assert canonical_hash(noisy) == key
+    assert canonical_hash(transform(box, translation(0, 0, 1))) != key               # moved
+    # the same solid, but two faces come out split along their other diagonal:
+    # the hash is triangulation-sensitive, not a test of solid equality
+    assert canonical_hash(transform(box, rotation("z", 180))) != key
+    assert canonical_hash(make_box(20, 10, 4.01)) != key
+    flipped = stl_mesh.Mesh(box.data.copy())
+    flipped.vectors[:] = flipped.vectors[:, ::-1]
+    assert canonical_hash(flipped) != key                                              # winding counts
+    assert len(canonical_triangles((np.zeros((3, 3)), np.array([[0, 1, 2]])))) == 0    # collapsed
+
+
+def test_stl_bytes_are_stable_and_unchanged_files_are_not_rewritten(tmp_path):
+    box = make_box(20, 10, 4)
+    data = stl_bytes(box)
+    assert data == stl_bytes(_shuffled(box, seed=1))
+    path = tmp_path / "box.stl"
+    assert save_stl(box, path)
+    mtime = path.stat().st_mtime_ns
+    assert not save_stl(_shuffled(box), path)
+    assert path.stat().st_mtime_ns == mtime
+    read = stl_mesh.Mesh.from_file(str(path))
+    assert len(read.vectors) == 12 and read.is_closed()
+    stored = np.frombuffer(path.read_bytes()[84:], dtype=stl_mesh.Mesh.dtype)["normals"]
+    np.testing.assert_allclose(stored, read.normals / np.linalg.norm(read.normals, axis=1, keepdims=True), atol=1e-6)
+
+    save_brep_stl(brep_box(0, 0, 0, 20, 10, 4), str(tmp_path / "brep.stl"), canonical=True)
+    brep = (tmp_path / "brep.stl").read_bytes()
+    assert brep == stl_bytes(stl_mesh.Mesh.from_file(str(tmp_path / "brep.stl")))         # already canonical
+    assert brep[:80] == data[:80] and len(brep) == len(data)
@@ -0,0 +1,54 @@
+"""Tests for the clearance / interference checker."""
+import numpy as np
+import pytest
+
+from clearance import check_clearance, closest_on_triangles, grid_surface, sweep
+from mesh_primitives import make_box, make_cylinder
+from split import union
+
+
+def test_closest_on_triangles_matches_brute_force():
+    rng = np.random.default_rng(0)
+    a, b, c = rng.normal(size=(3, 500, 3))
+    p = rng.normal(size=(500, 3)) * 2
+    q = closest_on_triangles(p, a, b, c)
+    # brute force over a fine barycentric grid of each triangle
+    u, v = np.meshgrid(np.linspace(0, 1, 201), np.linspace(0, 1, 201))
+    keep = u + v <= 1
+    u, v = u[keep], v[keep]
+    grid = a[:, None] + u[None, :, None] * (b - a)[:, None] + v[None, :, None] * (c - a)[:, None]
+    brute = np.linalg.norm(grid - p[:, None], axis=2).min(axis=1)
+    exact = np.linalg.norm(q - p, axis=1)
+    assert (exact <= brute + 1e-12).all()
+    np.testing.assert_allclose(exact, brute, atol=0.02)
+
+
+def test_grid_covers_long_thin_triangles():
+    vertices = np.array([[0, 0, 0], [10, 0, 0], [10, 0.2, 0]], dtype=np.float64)
+    points, owner = grid_surface(vertices, np.array([[0, 1, 2]]), spacing=0.25)
+    assert (owner == 0).all() and len(points) < 200
+    probe = np.stack([np.linspace(0, 10, 400), np.linspace(0, 0.2, 400) * 0.5, np.zeros(400)], axis=1)
+    gap = np.linalg.norm(probe[:, None] - points, axis=2).min(axis=1)
+    assert gap.max() <= 2 * 0.25
+
+
+def test_boxes_gap_and_overlap():
+    a = make_box(10, 10, 10)
+    c = check_clearance(a, make_box(10, 10, 10, cx=10.5), samples=5000)
+    assert c.min_gap == pytest.approx(0.5, abs=1e-9) and c.interference == 0
+    c = check_clearance(a, make_box(10, 10, 10, cx=9.8), samples=5000)
+    assert c.min_gap == pytest.approx(-0.2, abs=1e-9)
+    assert c.interference == pytest.approx(0.2 * 10 * 10, rel=1e-6)
+    assert "interference 20.000" in c.summary()
+
+
+def test_peg_in_hole_sweep():
+    block = union([make_box(30, 30, 10)]) - union([make_cylinder(5.3, 12, cz=-1, n=64)])
+    results = sweep(lambda r: (make_cylinder(r, 10, n=64), block), [5.0, 5.4], samples=5000)
+    (_, loose), (_, tight) = results
+    # matching n=64 polygons: parallel flats, cos(pi / 64) of the radius difference apart
+    flat = np.cos(np.pi / 64)
+    assert loose.min_gap == pytest.approx((5.3 - 5.0) * flat, abs=1e-3) and loose.interference == 0
+    assert tight.min_gap == pytest.approx(-(5.4 - 5.3) * flat, abs=1e-3) and tight.interference > 0
+    counts, edges = tight.histogram
+    assert counts[edges[:-1] < 0].sum() > 0 and counts[edges[:-1] < -0.2].sum() == 0
@@ -0,0 +1,50 @@
+"""Tests for tolerance calibration coupons."""
+import zipfile
+
+import numpy as np
+import pytest
+
+from coupons import NOTCH_DEEP, NOTCH_SHALLOW, NOTCH_W, coupon, coupon_set, main, notch_bits
+
+
+def test_notch_bits_are_binary_lsb_first():
+    assert notch_bits(1, 1) == [1]
+    assert notch_bits(5, 12) == [1, 0, 1, 0]
+    assert notch_bits(12, 12) == [0, 0, 1, 1]
+
+
+def test_bore_coupon_volume_tracks_clearance():
+    a = coupon("bore", 10, 0.0, 1, 1, segments=256, footprint=(20, 20))
+    b = coupon("bore", 10, 0.3, 1, 1, segments=256, footprint=(20, 20))
+    hole = np.pi * (5.3 ** 2 - 5.0 ** 2) * 6
+    assert a.volume() - b.volume() == pytest.approx(hole, rel=1e-3)
+
+
+def test_notches_encode_the_index():
+    one, two = (coupon("slot", (28, 1.6), 0.2, i, 2, footprint=(40, 12)) for i in (1, 2))
+    # index 1 = [1, 0], index 2 = [0, 1]: same notch volume, mirrored layout
+    assert one.volume() == pytest.approx(two.volume())
+    solid = coupon("slot", (28, 1.6), 0.2, 3, 3, footprint=(40, 12))     # [1, 1]
+    assert one.volume() - solid.volume() == pytest.approx(NOTCH_W * (NOTCH_DEEP - NOTCH_SHALLOW) * 6)
+
+
+def test_set_shares_one_footprint_and_builds_fast():
+    parts = coupon_set("post", 3.0, [round(0.02 * i, 2) for i in range(30)])
+    assert len(parts) == 31 and parts[-1][1] == "post gauge"
+    boxes = {tuple(np.round(s.bounding_box(), 6)) for s, _ in parts[:-1]}
+    assert len(boxes) == 1
+    assert all(len(s.decompose()) == 1 for s, _ in parts)
+
+
+def test_cli_writes_one_plate(tmp_path, capsys):
+    out = tmp_path / "bores.3mf"
+    assert main(["bore", "17.45", "--range", "0", "0.4", "0.1", "-o", str(out)]) == 0
+    with zipfile.ZipFile(out) as z:
+        model = z.read("3D/3dmodel.model").decode()
+    assert model.count("<object ") == 6 and model.count("<item ") == 6
+    assert "+0.400 mm   notches DsD" in capsys.readouterr().out
+
+
+def test_unknown_feature_rejected():
+    with pytest.raises(ValueError):
+        coupon("slot", 10, 0.1, 1, 1)
@@ -0,0 +1,52 @@
+"""Tests for the 3MF writer."""
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+
+from export_3mf import save_3mf
+from mesh_arrays import translation
+from mesh_primitives import make_box, make_cylinder
+from step_primitives import make_box as step_make_box
+
+NS = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+
+
+def _model(fp):
+    with zipfile.ZipFile(fp) as zf:
+        assert {"[Content_Types].xml", "_rels/.rels", "3D/3dmodel.model"} <= set(zf.namelist())
+        return ET.fromstring(zf.read("3D/3dmodel.model"))
+
+
+def test_instances_share_one_object(tmp_path):
+    fp = tmp_path / "plate.3mf"
+    save_3mf([(make_box(10, 10, 10), [translation(x, 0, 0) for x in (0, 20, 40)])], str(fp))
+    root = _model(fp)
+    objects = root.findall("m:resources/m:object", NS)
+    items = root.findall("m:build/m:item", NS)
+    assert len(objects) == 1 and len(items) == 3
+    assert len(objects[0].findall(".//m:vertex", NS)) == 8
+    # 3MF row-vector transform: translation is the last three numbers
+    assert [float(v) for v in items[2].get("transform").split()][-3:] == [40, 0, 0]
+
+
+def test_mixed_inputs_and_names(tmp_path):
+    fp = tmp_path / "mixed.3mf"
+    save_3mf([step_make_box(0, 0, 0, 5, 5, 5), (make_box(1, 1, 1), np.eye(4), "cube")], str(fp))
+    root = _model(fp)
+    objects = root.findall("m:resources/m:object", NS)
+    assert len(objects) == 2
+    assert objects[1].get("name") == "cube"
+
+
+def test_smaller_than_per_copy_stl(tmp_path):
+    cyl = make_cylinder(10, 5, n=128)
+    save_3mf([(cyl, [translation(x, 0, 0) for x in range(0, 100, 25)])], str(tmp_path / "p.3mf"))
+    soup_bytes = 84 + 50 * len(cyl.vectors) * 4
+    assert (tmp_path / "p.3mf").stat().st_size < soup_bytes / 4
+
+
+def test_output_is_byte_stable(tmp_path):
+    for name in ("a.3mf", "b.3mf"):
+        save_3mf(make_box(3, 4, 5), str(tmp_path / name))
+    assert (tmp_path / "a.3mf").read_bytes() == (tmp_path / "b.3mf").read_bytes()
@@ -0,0 +1,85 @@
+"""Tests for the GLB writer."""
+import json
+import struct
+
+import numpy as np
+
+from export_glb import save_glb
+from mesh_arrays import translation
+from mesh_primitives import make_box, make_cylinder
+
+
+def _read_glb(fp):
+    data = fp.read_bytes()
+    magic, version, total = struct.unpack_from("<III", data, 0)
+    assert (magic, version, total) == (0x46546C67, 2, len(data))
+    jlen, _ = struct.unpack_from("<II", data, 12)
+    gltf = json.loads(data[20:20 + jlen])
+    blen, _ = struct.unpack_from("<II", data, 20 + jlen)
+    return gltf, data[28 + jlen:28 + jlen + blen]
+
+
+def _world_positions(gltf, binary, node):
+    """Dequantized, node-transformed positions for one node (root Y-up ignored)."""
+    acc = gltf["accessors"][gltf["meshes"][node["mesh"]]["primitives"][0]["attributes"]["POSITION"]]
+    view = gltf["bufferViews"][acc["bufferView"]]
+    if acc["componentType"] == 5126:
+        pos = np.frombuffer(binary, np.float32, acc["count"] * 3, view["byteOffset"]).reshape(-1, 3)
+    else:
+        raw = np.frombuffer(binary, np.int16, acc["count"] * 4, view["byteOffset"]).reshape(-1, 4)
+        pos = raw[:, :3] / 32767.0
+    m = np.array(node.get("matrix", np.eye(4).ravel())).reshape(4, 4).T
+    return pos @ m[:3, :3].T + m[:3, 3]
+
+
+def test_instances_share_one_mesh(tmp_path):
+    fp = tmp_path / "legs.glb"
+    save_glb([(make_box(30, 8, 155), [translation(x, 0, 0) for x in (-100, 100)], "legs")], str(fp))
+    gltf, binary = _read_glb(fp)
+    assert len(gltf["meshes"]) == 1
+    legs = [n for n in gltf["nodes"] if "mesh" in n]
+    assert len(legs) == 2 and {n["mesh"] for n in legs} == {0}
+    pos = _world_positions(gltf, binary, legs[1])
+    np.testing.assert_allclose(pos.min(axis=0), [85, -4, 0], atol=1e-4)
+
+
+def test_quantized_positions_round_trip(tmp_path):
+    fp = tmp_path / "q.glb"
+    cyl = make_cylinder(40, 5, cx=3, cy=-2, n=96)
+    save_glb(cyl, str(fp), quantize=True)
+    gltf, binary = _read_glb(fp)
+    assert gltf["extensionsRequired"] == ["KHR_mesh_quantization"]
+    pos = _world_positions(gltf, binary, gltf["nodes"][0])
+    src = cyl.vectors.reshape(-1, 3)
+    np.testing.assert_allclose(pos.min(axis=0), src.min(axis=0), atol=0.01)
+    np.testing.assert_allclose(pos.max(axis=0), src.max(axis=0), atol=0.01)
+
+
+def test_quantized_is_smaller(tmp_path):
+    cyl = make_cylinder(40, 5, n=256)
+    save_glb(cyl, str(tmp_path / "f.glb"))
+    save_glb(cyl, str(tmp_path / "q.glb"), quantize=True)
+    assert (tmp_path / "q.glb").stat().st_size < (tmp_path / "f.glb").stat().st_size
+
+
+def test_large_mesh_uses_uint32_indices(tmp_path):
+    fp = tmp_path / "big.glb"
+    save_glb(make_cylinder(10, 1, n=33000), str(fp))
+    gltf, _ = _read_glb(fp)
+    assert gltf["accessors"][1]["componentType"] == 5125
+
+
+def test_vertex_colors_become_color_0(tmp_path):
+    fp = tmp_path / "colored.glb"
+    v = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float64)
+    rgb = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255]], dtype=np.uint8)
+    save_glb([((v, np.array([[0, 1, 2]])), np.eye(4), "tri")], str(fp), colors=[rgb])
+    gltf, binary = _read_glb(fp)
+    prim = gltf["meshes"][0]["primitives"][0]
+    acc = gltf["accessors"][prim["attributes"]["COLOR_0"]]
+    assert (acc["componentType"], acc["type"], acc["normalized"]) == (5121, "VEC4", True)
+    assert gltf["accessors"][prim["indices"]]["type"] == "SCALAR"
+    view = gltf["bufferViews"][acc["bufferView"]]
+    rgba = np.frombuffer(binary, np.uint8, 12, view["byteOffset"]).reshape(3, 4)
+    np.testing.assert_array_equal(rgba[:, :3], rgb)
+    assert (rgba[:, 3] == 255).all()
@@ -0,0 +1,43 @@
+"""Tests for mesh mass properties and the fingerprint database."""
+import numpy as np
+import pytest
+
+from fingerprint import Tolerance, check, fingerprint, mass_properties, record
+from mesh_arrays import rotation, translation
+from mesh_primitives import make_box as stl_box
+from mesh_primitives import transform
+from step_primitives import make_box
+
+
+def test_box_mass_properties_match_closed_form():
+    box = transform(stl_box(20, 10, 4), translation(3, -2, 7) @ rotation("z", 30))
+    volume, area, centroid, inertia = mass_properties(box.vectors)
+    assert volume == pytest.approx(800)
+    assert area == pytest.approx(2 * (200 + 80 + 40))
+    np.testing.assert_allclose(centroid, [3, -2, 9], atol=1e-5)
+    local = np.diag([10 ** 2 + 4 ** 2, 20 ** 2 + 4 ** 2, 20 ** 2 + 10 ** 2]) * 800 / 12
+    r = rotation("z", 30)[:3, :3]
+    np.testing.assert_allclose(inertia, r @ local @ r.T, rtol=1e-6, atol=1e-3)      # float32 STL vertices
+
+
+def test_brep_and_mesh_fingerprints_agree():
+    exact = fingerprint(make_box(0, 0, 0, 20, 10, 4))
+    mesh = fingerprint(stl_box(20, 10, 4, 10, 5, 0))
+    assert exact.differences(mesh) == []
+    assert mesh.triangles == 12 and exact.triangles == 0
+
+
+def test_record_then_check_flags_only_real_changes(tmp_path):
+    db = str(tmp_path / "fp.json")
+    part = tmp_path / "part.stl"
+    stl_box(20, 10, 4).save(str(part))
+    record([str(part)], db_path=db, root=str(tmp_path))
+    assert check([str(part)], db_path=db, root=str(tmp_path)) == {"part.stl": []}
+
+    transform(stl_box(20, 10, 4), rotation("z", 180)).save(str(part))        # same solid, new bytes
+    assert check([str(part)], db_path=db, root=str(tmp_path)) == {"part.stl": []}
+
+    stl_box(20, 10, 4.1).save(str(part))
+    diffs = check([str(part)], db_path=db, root=str(tmp_path))["part.stl"]
+    assert any(d.startswith("volume") for d in diffs) and any(d.startswith("bbox_max") for d in diffs)
+    assert check([str(part)], Tolerance(rel=0.05, abs=0.2), db_path=db, root=str(tmp_path)) == {"part.stl": []}
@@ -0,0 +1,82 @@
+"""Tests for the persistent geometry worker (in-process and over a Unix socket)."""
+import os
+import tempfile
+import threading
+import textwrap
+
+import pytest
+
+from geometry_worker import GeometryWorker, delegate_to_worker, make_server, request
+
+SCRIPT = textwrap.dedent('''
+    import os
+    from step_primitives import make_box, save_stl
+    WIDTH = 10.0
+    HALF = WIDTH / 2
+
+    def main():
+        out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "out", "box.stl")
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        save_stl(make_box(0, 0, 0, WIDTH, 1, 1), out)
+        print(f"half={HALF}")
+''')
+
+
+@pytest.fixture
+def script(tmp_path):
+    d = tmp_path / "project"
+    d.mkdir()
+    p = d / "gen.py"
+    p.write_text(SCRIPT)
+    return p
+
+
+def test_overrides_flow_into_derived_constants(script):
+    reply = GeometryWorker().run_job({"script": str(script), "overrides": {"WIDTH": 4.0}})
+    assert reply["ok"], reply.get("traceback")
+    assert reply["stdout"].strip() == "half=2.0"
+    assert reply["outputs"] == [str(script.parent / "out" / "box.stl")]
+    assert reply["timings"]["run_s"] >= 0
+
+
+def test_unknown_override_is_an_error_reply(script):
+    reply = GeometryWorker().run_job({"script": str(script), "overrides": {"NOPE": 1}})
+    assert not reply["ok"] and "NOPE" in reply["error"]
+
+
+def test_source_loads_are_cached_between_jobs(tmp_path):
+    from step_primitives import make_box, save_step
+    step = tmp_path / "src.step"
+    save_step(make_box(0, 0, 0, 1, 2, 3), str(step))
+    gen = tmp_path / "proj" / "gen.py"
+    gen.parent.mkdir()
+    gen.write_text(f"from step_primitives import load_step\nshape = load_step({str(step)!r})\n")
+    worker = GeometryWorker()
+    worker.install_caches()
+    try:
+        assert worker.run_job({"script": str(gen)})["cache_hits"] == 0
+        assert worker.run_job({"script": str(gen)})["cache_hits"] == 1
+    finally:
+        import step_primitives
+        import trimesh
+        step_primitives.load_step = step_primitives.load_step.__wrapped__
+        trimesh.load = trimesh.load.__wrapped__
+
+
+def test_client_round_trips_through_socket(script, capsys):
+    path = os.path.join(tempfile.mkdtemp(), "w.sock")
+    server = make_server(GeometryWorker(), path)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        assert request({"op": "ping"}, path)["ok"]
+        assert delegate_to_worker(str(script), {"WIDTH": 6}, path=path)
+        assert "half=3.0" in capsys.readouterr().out
+    finally:
+        request({"op": "stop"}, path)
+        t.join(5)
+        server.server_close()
+
+
+def test_no_worker_means_local_run(tmp_path):
+    assert delegate_to_worker("whatever.py", path=str(tmp_path / "missing.sock")) is False
@@ -0,0 +1,64 @@
+"""Tests for indexed-array views and transform helpers."""
+import numpy as np
+import pytest
+import trimesh
+
+from mesh_arrays import as_indexed, as_manifold, rotation, translation, weld
+from mesh_primitives import make_box as mesh_make_box
+from step_primitives import make_box as step_make_box
+
+
+def test_weld_box_soup_to_8_vertices():
+    vertices, faces = weld(mesh_make_box(10, 20, 30).vectors)
+    assert vertices.shape == (8, 3)
+    assert faces.shape == (12, 3)
+
+
+def test_as_indexed_on_ocp_shape_is_closed():
+    vertices, faces = as_indexed(step_make_box(0, 0, 0, 7, 8, 9))
+    tm = trimesh.Trimesh(vertices, faces)
+    assert tm.is_watertight
+    np.testing.assert_allclose(tm.extents, [7, 8, 9], atol=1e-4)
+
+
+def test_as_indexed_on_ocp_shape_stays_in_memory(monkeypatch):
+    import tempfile
+
+    from OCP.BRepBuilderAPI import BRepBuilderAPI_Transform
+    from OCP.gp import gp_Trsf, gp_Vec
+
+    from step_primitives import cut, make_cylinder
+
+    monkeypatch.setattr(tempfile, "mkstemp", lambda *a, **k: pytest.fail("wrote a temp file"))
+    part = cut(step_make_box(0, 0, 0, 10, 10, 10), make_cylinder(3, 12, x=5, y=5, z=-1))   # reversed bore faces
+    trsf = gp_Trsf()
+    trsf.SetTranslation(gp_Vec(100, 0, 0))
+    moved = BRepBuilderAPI_Transform(part, trsf, False).Shape()        # no copy: faces carry a location
+    vertices, faces = as_indexed(moved)
+    np.testing.assert_allclose(vertices.min(axis=0), [100, 0, 0], atol=1e-9)
+    assert as_manifold((vertices, faces)).volume() == pytest.approx(1000 - np.pi * 9 * 10, rel=5e-3)
+    assert trimesh.Trimesh(vertices, faces, process=False).is_watertight
+
+
+def test_as_indexed_rejects_unknown_type():
+    with pytest.raises(TypeError):
+        as_indexed(object())
+
+
+def test_as_manifold_round_trip():
+    solid = as_manifold(mesh_make_box(10, 20, 30))
+    np.testing.assert_allclose(solid.volume(), 6000, rtol=1e-6)
+    vertices, faces = as_indexed(solid)
+    assert trimesh.Trimesh(vertices, faces).is_watertight
+
+
+def test_as_manifold_rejects_open_mesh():
+    vertices, faces = as_indexed(mesh_make_box(1, 1, 1))
+    with pytest.raises(ValueError):
+        as_manifold((vertices, faces[:-1]))
+
+
+def test_rotation_then_translation():
+    t = translation(10, 0, 0) @ rotation("z", 90)
+    p = t @ np.array([1.0, 0, 0, 1])
+    np.testing.assert_allclose(p[:3], [10, 1, 0], atol=1e-12)
@@ -0,0 +1,37 @@
+"""Tests for the geometric mesh diff."""
+import numpy as np
+import pytest
+
+from mesh_diff import deviation_colors, mesh_diff, save_heatmap
+from mesh_primitives import make_box
+
+
+def test_identical_meshes_have_no_deviation():
+    box = make_box(20, 10, 4)
+    d = mesh_diff(box, box, samples=2000)
+    assert d.hausdorff < 1e-6 and d.mean < 1e-6
+
+
+def test_taller_box_deviates_by_the_height_change_on_top_only():
+    a, b = make_box(20, 10, 4), make_box(20, 10, 4.3)
+    d = mesh_diff(a, b, samples=5000)
+    assert d.hausdorff == pytest.approx(0.3, abs=1e-4)
+    centroids = d.vertices[d.faces].mean(axis=1)
+    top = centroids[:, 2] > 4 - 1e-6
+    np.testing.assert_allclose(d.face_deviation[top], 0.3, atol=1e-4)
+    bottom = centroids[:, 2] < 1e-6
+    np.testing.assert_allclose(d.face_deviation[bottom], 0.0, atol=1e-6)
+    assert 0 < d.mean < 0.3
+
+
+def test_heatmaps_color_faces_by_deviation(tmp_path):
+    d = mesh_diff(make_box(20, 10, 4), make_box(20, 10, 4.3), samples=2000)
+    save_heatmap(d, str(tmp_path / "diff.ply"))
+    save_heatmap(d, str(tmp_path / "diff.glb"))
+    data = (tmp_path / "diff.ply").read_bytes()
+    assert data.startswith(b"ply\nformat binary_little_endian 1.0\n")
+    assert len(data) == data.index(b"end_header\n") + 11 + 12 * len(d.vertices) + 16 * len(d.faces)
+    np.testing.assert_array_equal(deviation_colors(np.array([0.0, 1.0, 2.0]), 1.0),
+                                  [[0, 0, 255], [255, 0, 0], [255, 0, 0]])
+    with pytest.raises(ValueError):
+        save_heatmap(d, str(tmp_path / "diff.obj"))
@@ -3,7 +3,8 @@ import numpy as np
 import pytest
 from stl import mesh
 
-from mesh_primitives import make_box, make_cylinder, make_ring, combine, flip_z
+import mesh_primitives
+from mesh_primitives import make_box, make_cylinder, make_ring, combine, flip_z, from_indexed, segments, transform
 
 
 def _extents(m: mesh.Mesh) -> tuple[np.ndarray, np.ndarray]:
@@ -46,6 +47,29 @@ def test_make_ring_has_inner_hole():
     assert xy_radii.max() <= 10 + 0.05
 
 
+@pytest.mark.parametrize("r", [0.8, 2.15, 5.15, 10, 42, 120])
+def test_segments_keep_chord_error_within_tolerance(r):
+    n = segments(r)
+    sagitta = r * (1 - np.cos(np.pi / n))
+    assert sagitta <= mesh_primitives.CHORD_TOL + 1e-12 or n == mesh_primitives.MAX_SEGMENTS
+    # one segment fewer would break the tolerance (unless clamped at the minimum)
+    assert n == mesh_primitives.MIN_SEGMENTS or r * (1 - np.cos(np.pi / (n - 1))) > mesh_primitives.CHORD_TOL
+
+
+def test_segments_scale_with_radius_and_tolerance(monkeypatch):
+    assert segments(2) < segments(10) == 32 < segments(40)
+    assert segments(0.01) == mesh_primitives.MIN_SEGMENTS
+    assert segments(1e6) == mesh_primitives.MAX_SEGMENTS
+    monkeypatch.setattr(mesh_primitives, "CHORD_TOL", 0.01)
+    assert segments(10) > 32
+    assert len(make_cylinder(10, 1).vectors) == 4 * segments(10)
+
+
+def test_default_ring_segments_follow_outer_radius():
+    assert len(make_ring(42, 38, 4).vectors) == 8 * segments(42)
+    assert len(make_ring(42, 38, 4, n=48).vectors) == 8 * 48
+
+
 def test_combine_preserves_triangle_count():
     a = make_box(1, 1, 1)
     b = make_box(1, 1, 1, cx=10)
@@ -64,3 +88,23 @@ def test_flip_z_mirrors_around_max_z_over_2():
     flip_v = flipped.vectors.reshape(-1, 3)
     # vertex order is reversed per triangle; just check z-coords are mirrored
     assert sorted((20 - orig_v[:, 2]).tolist()) == sorted(flip_v[:, 2].tolist())
+
+
+def test_transform_mirror_keeps_outward_winding():
+    m = make_box(10, 10, 10, cx=20)
+    mirror = np.diag([-1.0, 1, 1, 1])
+    out = transform(m, mirror)
+    mins, maxs = _extents(out)
+    np.testing.assert_allclose(mins[0], -25)
+    # signed volume stays positive only if winding was flipped with the mirror
+    v = out.vectors
+    vol = np.einsum("ij,ij->i", v[:, 0], np.cross(v[:, 1], v[:, 2])).sum() / 6
+    assert vol > 0
+
+
+def test_from_indexed_expands_shared_vertices():
+    v = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+    f = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+    m = from_indexed(v, f)
+    assert len(m.vectors) == 4
+    np.testing.assert_allclose(m.vectors[3], v[[1, 2, 3]])
@@ -0,0 +1,35 @@
+"""Tests for the batched orientation search."""
+import numpy as np
+
+from mesh_primitives import combine, make_box, transform
+from orient import best_orientations, candidate_directions, down_to_bed
+
+
+def test_down_to_bed_maps_every_direction_to_minus_z():
+    d = candidate_directions(200)
+    r = down_to_bed(d)
+    np.testing.assert_allclose(np.einsum("rij,rj->ri", r, d), np.tile([0, 0, -1], (len(d), 1)), atol=1e-12)
+    np.testing.assert_allclose(np.linalg.det(r), 1)
+    np.testing.assert_allclose(r @ r.transpose(0, 2, 1), np.broadcast_to(np.eye(3), r.shape), atol=1e-12)
+
+
+def test_candidates_are_unique_and_start_with_axes():
+    d = candidate_directions(100)
+    np.testing.assert_allclose(d[0], [0, 0, -1])
+    assert len(np.unique(np.round(d, 3), axis=0)) == len(d)
+
+
+def test_tall_plate_lies_flat():
+    best = best_orientations(make_box(40, 4, 60), top=1)[0]
+    np.testing.assert_allclose(abs(best.down[1]), 1)
+    np.testing.assert_allclose([best.height, best.overhang, best.contact], [4, 0, 2400], atol=1e-6)
+
+
+def test_upside_down_t_is_turned_over():
+    # a slab on top of a thin post: the slab belongs on the bed
+    t = combine([make_box(4, 4, 10), make_box(30, 30, 2, cz=10)])
+    best = best_orientations(t, top=1)[0]
+    np.testing.assert_allclose(best.down, [0, 0, 1])
+    placed = transform(t, best.matrix)
+    np.testing.assert_allclose(placed.vectors[:, :, 2].min(), 0, atol=1e-9)
+    np.testing.assert_allclose(placed.vectors[:, :, 2].max(), 12, atol=1e-9)
@@ -0,0 +1,54 @@
+"""Tests for the background writer / process-pool output pipeline."""
+import os
+import threading
+import time
+
+import pytest
+
+from mesh_primitives import make_box
+from output_pipeline import OutputPipeline
+from step_primitives import make_box as step_make_box, save_stl
+
+
+def _square(x):
+    return x * x
+
+
+def test_writes_are_flushed_on_exit(tmp_path):
+    paths = [tmp_path / f"box_{i}.stl" for i in range(3)]
+    with OutputPipeline() as out:
+        for i, p in enumerate(paths):
+            out.save(save_stl, step_make_box(0, 0, 0, 1 + i, 1, 1), str(p))
+        out.save(make_box(1, 1, 1).save, str(tmp_path / "soup.stl"))
+    assert all(p.stat().st_size > 84 for p in paths)
+    assert (tmp_path / "soup.stl").exists()
+
+
+def test_save_returns_before_the_write_finishes():
+    gate = threading.Event()
+    with OutputPipeline() as out:
+        t0 = time.perf_counter()
+        fut = out.save(gate.wait, 5)
+        assert time.perf_counter() - t0 < 1 and not fut.done()
+        gate.set()
+    assert fut.result() is True
+
+
+def test_write_error_surfaces_on_exit(tmp_path):
+    missing = str(tmp_path / "no" / "such" / "dir" / "x.stl")
+    with pytest.raises(RuntimeError, match="Error writing STL"):
+        with OutputPipeline() as out:
+            out.save(save_stl, step_make_box(0, 0, 0, 1, 1, 1), missing)
+
+
+def test_block_error_wins_over_write_error(tmp_path):
+    with pytest.raises(ValueError):
+        with OutputPipeline() as out:
+            out.save(os.remove, str(tmp_path / "missing"))
+            raise ValueError("build failed")
+
+
+def test_submit_runs_in_process_pool():
+    with OutputPipeline(processes=2) as out:
+        futs = [out.submit(_square, i) for i in range(4)]
+    assert [f.result() for f in futs] == [0, 1, 4, 9]
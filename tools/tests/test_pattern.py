@@ -0,0 +1,67 @@
+"""Tests for the mirror / linear / polar pattern operators."""
+import math
+
+import numpy as np
+import pytest
+
+from mesh_arrays import as_indexed, as_manifold, translation
+from mesh_primitives import make_box as stl_box
+from pattern import compose, linear_array, mirror, pattern, polar_array
+from step_primitives import cut, cut_all, fuse_all, make_box, make_circle, make_cylinder, perforate
+
+
+def test_mirror_order_and_placement_without_reflection():
+    t = mirror("xy", translation(3, 2, 5), reflect=False)
+    np.testing.assert_array_equal(t[:, :3, 3], [[-3, -2, 5], [-3, 2, 5], [3, -2, 5], [3, 2, 5]])
+    np.testing.assert_array_equal(t[:, :3, :3], np.broadcast_to(np.eye(3), (4, 3, 3)))
+    reflected = mirror("x", about=(10, 0, 0))
+    np.testing.assert_allclose(reflected[0] @ [0, 0, 0, 1], [20, 0, 0, 1])
+    assert np.linalg.det(reflected[0, :3, :3]) == pytest.approx(-1)
+
+
+def test_linear_and_polar_arrays_compose():
+    ring = polar_array(4, base=translation(10, 0, 0))
+    np.testing.assert_allclose(ring[:, :3, 3], [[10, 0, 0], [0, 10, 0], [-10, 0, 0], [0, -10, 0]], atol=1e-12)
+    np.testing.assert_allclose(polar_array(3, sweep=90)[-1, :3, :3] @ [1, 0, 0], [0, 1, 0], atol=1e-12)
+    stack = compose(linear_array(3, (0, 0, 2)), ring)
+    assert stack.shape == (12, 4, 4)
+    np.testing.assert_allclose(stack[5, :3, 3], [0, 10, 2], atol=1e-12)
+    with pytest.raises(ValueError):
+        polar_array()
+
+
+def test_mesh_pattern_is_one_batched_mesh_with_outward_winding():
+    box = stl_box(2, 2, 2)
+    out = pattern(box, mirror("x", translation(5, 0, 0)))
+    assert len(out.vectors) == 2 * len(box.vectors)
+    assert as_manifold(out).volume() == pytest.approx(16, rel=1e-6)
+    v, f = pattern(as_indexed(box), linear_array(3, (3, 0, 0)))
+    assert len(f) == 36 and v[:, 0].max() == pytest.approx(7)
+
+
+def test_ocp_pattern_feeds_one_multi_tool_cut():
+    plate = make_box(-20, -20, 0, 40, 40, 2)
+    hole = make_cylinder(1, 3, x=12, z=-0.5)
+    holes = pattern(hole, polar_array(24))
+    single = cut_all(plate, holes)
+    chained = plate
+    for t in polar_array(24):
+        chained = cut(chained, pattern(hole, t))
+    expected = 40 * 40 * 2 - 24 * math.pi * 2
+    assert as_manifold(single).volume() == pytest.approx(expected, rel=5e-3)
+    assert as_manifold(single).volume() == pytest.approx(as_manifold(chained).volume(), rel=1e-6)
+    fused = fuse_all([make_box(0, 0, 0, 2, 2, 2), pattern(make_box(0, 0, 0, 2, 2, 2), translation(1, 0, 0))])
+    assert as_manifold(fused).volume() == pytest.approx(12, rel=1e-3)
+
+
+def test_perforate_matches_cut_all_of_through_holes():
+    grid = compose(linear_array(20, (4, 0, 0), start=(-38, 0, 0)), linear_array(10, (0, 4, 0), start=(0, -18, 0)))
+    plate = perforate(make_circle(60, z=1), grid[:, :2, 3], 1, 2)
+    cut_plate = cut_all(make_cylinder(60, 2, z=1), pattern(make_cylinder(1, 3, z=0.5), grid))
+    expected = math.pi * (60 ** 2 - 200) * 2
+    assert as_manifold(plate).volume() == pytest.approx(expected, rel=5e-3)
+    assert as_manifold(plate).volume() == pytest.approx(as_manifold(cut_plate).volume(), rel=1e-6)
+    two = perforate(make_circle(10), [(0, 0), (5, 0)], [2, 1], 3)
+    assert as_manifold(two).volume() == pytest.approx(math.pi * (100 - 4 - 1) * 3, rel=5e-3)
+    with pytest.raises(ValueError):
+        perforate(make_circle(10), [(0, 0), (5, 0)], [2], 3)
@@ -0,0 +1,60 @@
+"""Tests for build-plate packing."""
+import zipfile
+
+import numpy as np
+import pytest
+
+from mesh_arrays import rotation
+from mesh_primitives import make_box, make_cylinder, transform
+from plate import convex_hull_2d, min_area_yaw, pack, save_plate
+
+
+def _footprints(parts, placed):
+    out = []
+    for p in placed:
+        v = parts[p.part][0].vectors.reshape(-1, 3) @ p.matrix[:3, :3].T + p.matrix[:3, 3]
+        out.append((v.min(axis=0), v.max(axis=0)))
+    return out
+
+
+def test_convex_hull_of_square_with_interior_points():
+    pts = np.array([[0, 0], [2, 0], [2, 2], [0, 2], [1, 1], [1, 0]], dtype=float)
+    hull = convex_hull_2d(pts)
+    assert len(hull) == 4
+    assert 0.5 * np.sum(hull[:, 0] * np.roll(hull[:, 1], -1) - np.roll(hull[:, 0], -1) * hull[:, 1]) == 4
+
+
+def test_min_area_yaw_undoes_a_rotation():
+    box = transform(make_box(40, 10, 2), rotation("z", 30))
+    hull = convex_hull_2d(box.vectors.reshape(-1, 3))
+    assert min_area_yaw(hull) % 90 == pytest.approx(60, abs=1e-4)
+
+
+def test_packed_copies_stay_on_bed_without_overlap():
+    parts = [(make_box(40, 10, 3), 12), (make_cylinder(15, 5), 6), (make_box(60, 60, 2), 1)]
+    placed, unplaced = pack(parts, bed=(200, 200), spacing=2)
+    assert not unplaced and len(placed) == 19
+    boxes = _footprints(parts, placed)
+    for k, (lo, hi) in enumerate(boxes):
+        assert (lo[:2] >= -1e-9).all() and (hi[:2] <= 200 + 1e-9).all() and abs(lo[2]) < 1e-9
+        for lo2, hi2 in boxes[k + 1:]:
+            gap = np.maximum(lo[:2] - hi2[:2], lo2[:2] - hi[:2]).max()
+            assert gap >= 2 - 1e-6
+
+
+def test_overflow_is_reported_not_overlapped():
+    placed, unplaced = pack([(make_box(90, 90, 2), 5)], bed=(200, 200), spacing=5)
+    assert len(placed) == 4 and unplaced == [(0, 4)]
+    with pytest.raises(ValueError):
+        save_plate([(make_box(90, 90, 2), 5)], "unused.stl", bed=(200, 200))
+
+
+def test_save_plate_stl_and_3mf(tmp_path):
+    parts = [(make_box(20, 10, 3), 3, "bar"), (make_cylinder(5, 4), 2, "pin")]
+    save_plate(parts, str(tmp_path / "p.3mf"))
+    with zipfile.ZipFile(tmp_path / "p.3mf") as z:
+        model = z.read("3D/3dmodel.model").decode()
+    assert model.count("<object ") == 2 and model.count("<item ") == 5
+    save_plate(parts, str(tmp_path / "p.stl"))
+    from stl import mesh
+    assert len(mesh.Mesh.from_file(str(tmp_path / "p.stl")).vectors) == 3 * 12 + 2 * len(parts[1][0].vectors)
@@ -0,0 +1,60 @@
+"""Tests for the batch print-time / material estimator."""
+import numpy as np
+import pytest
+
+from mesh_primitives import make_box, make_ring
+from mesh_arrays import as_indexed
+from print_estimate import PrintSettings, estimate, estimate_files, mesh_volume, prune_cache
+
+
+def test_mesh_volume():
+    np.testing.assert_allclose(mesh_volume(*as_indexed(make_box(10, 20, 5))), 1000)
+
+
+def test_solid_when_everything_is_skin():
+    # 10 layers, 5 top + 5 bottom: the whole block prints solid
+    r = estimate(make_box(10, 10, 2), PrintSettings(top_bottom_layers=5, infill=0.0))
+    assert r["layers"] == 10
+    np.testing.assert_allclose(r["extruded_cm3"], r["volume_cm3"], rtol=1e-6)
+    np.testing.assert_allclose(r["grams"], 0.2 * 1.24, atol=0.01)
+
+
+def test_infill_and_walls_scale_material():
+    box = make_box(30, 30, 20)
+    sparse = estimate(box, PrintSettings(infill=0.1))
+    dense = estimate(box, PrintSettings(infill=0.5))
+    more_walls = estimate(box, PrintSettings(infill=0.1, walls=4))
+    assert sparse["grams"] < more_walls["grams"] < dense["grams"] < estimate(box, PrintSettings(infill=1.0))["grams"]
+    assert sparse["volume_cm3"] == pytest.approx(18.0)
+
+
+def test_batch_uses_content_hash_cache(tmp_path):
+    a, b = tmp_path / "a.stl", tmp_path / "b.stl"
+    make_box(10, 10, 4).save(str(a))
+    make_ring(10, 5, 4).save(str(b))
+    cache = str(tmp_path / "cache.json")
+    first = estimate_files([str(a), str(b)], processes=2, cache_path=cache)
+    assert not any(r["cached"] for r in first.values())
+
+    make_box(10, 10, 6).save(str(a))   # only a changes
+    second = estimate_files([str(a), str(b)], cache_path=cache)
+    assert not second[str(a)]["cached"] and second[str(b)]["cached"]
+    assert second[str(a)]["grams"] > first[str(a)]["grams"]
+    assert second[str(b)] == dict(first[str(b)], cached=True)
+
+
+def test_cache_keeps_other_files_and_settings_until_pruned(tmp_path):
+    a, b = tmp_path / "a.stl", tmp_path / "b.stl"
+    make_box(10, 10, 4).save(str(a))
+    make_ring(10, 5, 4).save(str(b))
+    cache = str(tmp_path / "cache.json")
+    estimate_files([str(a)], cache_path=cache)
+    estimate_files([str(b)], cache_path=cache)                                   # other file
+    estimate_files([str(a)], PrintSettings(infill=0.5), cache_path=cache)        # other settings
+    assert estimate_files([str(a)], cache_path=cache)[str(a)]["cached"]
+    assert estimate_files([str(b)], cache_path=cache)[str(b)]["cached"]
+
+    make_box(10, 10, 6).save(str(a))
+    assert prune_cache([str(a), str(b)], cache_path=cache) == 2                # both settings of the old a
+    assert estimate_files([str(b)], cache_path=cache)[str(b)]["cached"]
+    assert prune_cache([str(a), str(b)], cache_path=cache) == 0
@@ -0,0 +1,72 @@
+"""Tests for overhang / bridge / island analysis."""
+import manifold3d
+import numpy as np
+
+from mesh_arrays import as_indexed, rotation
+from mesh_primitives import combine, make_box, make_cylinder, transform
+from printability import analyze, face_normals_areas
+
+
+def _union(*boxes):
+    """Boolean union of (w, d, h, cx, cy, cz) boxes as a (vertices, faces) pair."""
+    solid = manifold3d.Manifold()
+    for w, d, h, cx, cy, cz in boxes:
+        solid += manifold3d.Manifold.cube([w, d, h]).translate([cx - w / 2, cy - d / 2, cz])
+    m = solid.to_mesh()
+    return np.asarray(m.vert_properties)[:, :3], np.asarray(m.tri_verts)
+
+
+def test_face_normals_areas_of_box():
+    normals, areas = face_normals_areas(*as_indexed(make_box(10, 20, 5)))
+    np.testing.assert_allclose(areas.sum(), 2 * (200 + 50 + 100))
+    np.testing.assert_allclose(np.abs(normals).max(axis=1), 1)
+
+
+def test_box_on_bed_is_support_free():
+    report = analyze(make_box(10, 10, 10))
+    assert report.overhang_area == 0 and report.support_free
+
+
+def test_t_shape_cantilever_needs_support():
+    # 4 mm post under a 30 x 30 slab: the slab underside is a 13 mm cantilever all round
+    t = _union((4, 4, 10, 0, 0, 0), (30, 30, 2, 0, 0, 10))
+    report = analyze(t)
+    assert len(report.unsupported) == 1
+    r = report.unsupported[0]
+    np.testing.assert_allclose([r.z, r.area], [10, 900 - 16])
+    np.testing.assert_allclose(r.reach, np.hypot(13, 13), atol=0.1)
+    assert r.flat
+    assert not report.islands
+
+
+def test_short_bridge_between_posts_is_bridgeable():
+    bridge = _union((2, 10, 10, -4, 0, 0), (2, 10, 10, 4, 0, 0), (10, 10, 2, 0, 0, 10))
+    report = analyze(bridge, max_bridge=10)
+    assert report.support_free and len(report.bridges) == 1
+    np.testing.assert_allclose(report.bridges[0].span, 6, atol=0.1)
+
+
+def test_ledge_is_measured_from_the_wall_it_hangs_off():
+    # 8 mm off a wall: only the wall edge holds it (the ledge sides rise from the underside)
+    wide = analyze(_union((2, 20, 20, 0, 0, 0), (8, 20, 2, 5, 0, 10)), max_bridge=10, max_cantilever=1.5)
+    assert not wide.support_free and not wide.bridges
+    np.testing.assert_allclose([wide.unsupported[0].span, wide.unsupported[0].reach], [0, 8], atol=1e-6)
+    # a 0.5 mm lip round a 20 x 20 box prints without support
+    lip = analyze(_union((20, 20, 10, 0, 0, 0), (21, 21, 2, 0, 0, 10)), max_cantilever=1.5)
+    assert lip.support_free and len(lip.bridges) == 1
+    np.testing.assert_allclose(lip.bridges[0].reach, 0.5 * np.sqrt(2), atol=1e-6)    # at the corners
+
+
+def test_overhang_angle_threshold():
+    cyl = make_cylinder(5, 10, n=64)
+    lying = transform(cyl, rotation("x", 90))       # horizontal cylinder: bottom arc overhangs
+    report = analyze(lying, max_overhang=45)
+    assert report.overhang_area > 0
+    assert analyze(lying, max_overhang=89.9).overhang_area < report.overhang_area
+
+
+def test_floating_block_is_an_island():
+    report = analyze(combine([make_box(10, 10, 2), make_box(4, 4, 2, cx=20, cz=5)]))
+    assert len(report.islands) == 1
+    np.testing.assert_allclose(report.islands[0].centroid, (20, 0), atol=1e-6)
+    assert not report.support_free
@@ -0,0 +1,70 @@
+"""Tests for the assembly scene graph."""
+import numpy as np
+import pytest
+
+from export_3mf import save_3mf
+from mesh_arrays import as_indexed, place, rotation, translation
+from mesh_primitives import make_box, make_cylinder
+from scene import Node
+
+
+def _assembly():
+    root = Node("root")
+    base = root.add(Node("base"))
+    base.add_instances("feet", make_box(4, 4, 2), [translation(x, 0, 0) for x in (-10, 0, 10)])
+    top = root.add(Node("top", transform=translation(0, 0, 20)))
+    top.add(Node("post", make_cylinder(2, 5)))
+    return root
+
+
+def test_instances_share_geometry_and_compose_transforms():
+    root = _assembly()
+    inst = root.instances()
+    assert [(name, len(ts)) for _, ts, name in inst] == [("feet", 3), ("post", 1)]
+    np.testing.assert_allclose(inst[1][1][0][:3, 3], [0, 0, 20])
+    feet = root.find("feet").children
+    assert all(f.geometry is feet[0].geometry for f in feet)
+
+
+def test_flatten_matches_placed_copies():
+    root = _assembly()
+    v, f = root.flatten()
+    box_v, box_f = as_indexed(make_box(4, 4, 2))
+    cyl_v, cyl_f = as_indexed(make_cylinder(2, 5))
+    assert len(f) == 3 * len(box_f) + len(cyl_f)
+    np.testing.assert_allclose(v.min(axis=0), [-12, -2, 0], atol=1e-6)
+    np.testing.assert_allclose(v.max(axis=0), [12, 2, 25], atol=1e-6)
+    np.testing.assert_allclose(v[f[-len(cyl_f):]].reshape(-1, 3).min(axis=0)[2], 20)
+
+
+def test_bounds_are_cached_and_follow_transform_edits():
+    root = _assembly()
+    mins, maxs = root.bounds()
+    v, _ = root.flatten()
+    np.testing.assert_allclose(mins, v.min(axis=0), atol=1e-6)
+    np.testing.assert_allclose(maxs, v.max(axis=0), atol=1e-6)
+    assert root.find("base")._bounds is not None
+
+    root.find("top").transform = translation(0, 0, 30) @ rotation("x", 90)
+    assert root._bounds is None and root.find("base")._bounds is not None
+    _, maxs = root.bounds()
+    v, _ = root.flatten()
+    np.testing.assert_allclose(maxs, v.max(axis=0), atol=1e-6)
+
+
+def test_subtree_is_a_part_on_its_own(tmp_path):
+    root = _assembly()
+    mins, maxs = root.find("base").bounds()
+    np.testing.assert_allclose(maxs[2], 2, atol=1e-6)
+    save_3mf(root.find("top").instances(), str(tmp_path / "top.3mf"))
+    with pytest.raises(KeyError):
+        root.find("missing")
+
+
+def test_place_batches_copies_and_keeps_winding_under_mirrors():
+    v, f = as_indexed(make_box(2, 2, 2))
+    pv, pf = place(v, f, [np.eye(4), np.diag([-1.0, 1, 1, 1])])
+    tri = pv[pf]
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    centroid = tri.mean(axis=1) - np.repeat(pv.reshape(2, -1, 3).mean(axis=1), len(f), axis=0)
+    assert ((n * centroid).sum(axis=1) > 0).all()
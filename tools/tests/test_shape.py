@@ -0,0 +1,79 @@
+"""Tests for the cached multi-representation Shape wrapper."""
+import numpy as np
+import pytest
+
+from bbox import get_extents
+from mesh_arrays import as_indexed, rotation, translation
+from mesh_primitives import make_box as stl_box
+from shape import Shape
+from split import union
+from step_primitives import cut, make_box, make_cylinder, triangulate
+
+
+def _plate_with_hole():
+    return cut(make_box(0, 0, 0, 20, 10, 4), make_cylinder(3, 6, x=10, y=5, z=-1))
+
+
+def test_brep_is_triangulated_once_and_reused():
+    part = Shape(_plate_with_hole())
+    assert part.cached() == ["brep"]
+    np.testing.assert_allclose(part.bounds[1], [20, 10, 4], atol=1e-6)     # exact, from the BRep
+    volume = part.volume
+    assert volume == pytest.approx(20 * 10 * 4 - np.pi * 9 * 4, rel=2e-3)
+    as_indexed(part)
+    get_extents(part)
+    part.trimesh, part.stl
+    assert part.conversions == {"indexed": 1, "manifold": 1, "trimesh": 1, "stl": 1}
+    assert as_indexed(part) is part.indexed
+
+
+def test_mutation_invalidates_conversions():
+    part = Shape(stl_box(10, 10, 10))
+    before = part.volume
+    part.transform(translation(5, 0, 0) @ rotation("z", 90))
+    assert part.cached() == ["stl"]
+    assert part.volume == pytest.approx(before)
+    np.testing.assert_allclose(part.bounds[0], [0, -5, 0], atol=1e-5)
+    assert part.conversions["manifold"] == 2
+
+
+def test_mirror_keeps_outward_winding():
+    part = Shape(as_indexed(stl_box(10, 10, 10, cx=5)))
+    part.transform(np.diag([-1.0, 1.0, 1.0, 1.0]))
+    assert part.volume == pytest.approx(1000)
+    np.testing.assert_allclose(part.bounds[0], [-10, -5, 0])
+
+
+def test_brep_transform_stays_brep():
+    part = Shape(_plate_with_hole()).transform(translation(0, 0, 10))
+    assert part.source == "brep"
+    np.testing.assert_allclose(part.bounds[0], [0, 0, 10], atol=1e-6)
+
+
+def test_booleans_return_new_shapes():
+    a = Shape(stl_box(10, 10, 10))
+    b = Shape(union([stl_box(10, 10, 10, cx=5)]))
+    assert (a - b).volume == pytest.approx(500)
+    assert (a ^ b).volume == pytest.approx(500)
+    assert (a + b).source == "manifold"
+    with pytest.raises(ValueError):
+        a.brep
+
+
+def test_triangulate_matches_stl_export(tmp_path):
+    from stl import mesh as stl_mesh
+
+    from step_primitives import save_stl
+
+    shape = _plate_with_hole()
+    vertices, faces = triangulate(shape)
+    save_stl(shape, str(tmp_path / "p.stl"))
+    soup = stl_mesh.Mesh.from_file(str(tmp_path / "p.stl")).vectors
+    assert len(faces) == len(soup)
+    np.testing.assert_allclose(np.unique(np.round(vertices, 4), axis=0),
+                               np.unique(np.round(soup.reshape(-1, 3), 4), axis=0), atol=2e-4)
+
+    def signed_volume(tri):
+        return np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2])).sum() / 6
+
+    assert signed_volume(vertices[faces]) == pytest.approx(signed_volume(soup.astype(np.float64)), rel=1e-5)
@@ -0,0 +1,45 @@
+"""Tests for the batched planar slicer."""
+import numpy as np
+import pytest
+
+from mesh_primitives import combine, make_box, make_ring
+from slicer import save_png, save_svg, slice_mesh
+
+
+def test_box_area_and_perimeter_every_layer():
+    s = slice_mesh(make_box(10, 20, 5), layer_height=0.2)
+    assert len(s) == 25
+    np.testing.assert_allclose(s.z[[0, -1]], [0.1, 4.9])
+    np.testing.assert_allclose(s.area, 200)
+    np.testing.assert_allclose(s.perimeter, 60)
+
+
+def test_ring_has_outer_ccw_and_hole_cw():
+    s = slice_mesh(make_ring(10, 5, 4, n=64), zs=[2.0])
+    loops = s.polygons(0)
+    assert len(loops) == 2
+    signed = sorted(0.5 * np.sum(p[:, 0] * np.roll(p[:, 1], -1) - np.roll(p[:, 0], -1) * p[:, 1]) for p in loops)
+    assert signed[0] < 0 < signed[1]
+    np.testing.assert_allclose(s.area[0], sum(signed))
+
+
+def test_plane_through_vertices_is_consistent():
+    # stacked boxes meet at z=5; a plane exactly on vertices is taken at z+eps
+    m = combine([make_box(10, 10, 5), make_box(4, 4, 5, cz=5)])
+    s = slice_mesh(m, zs=[0.0, 5.0, 9.999])
+    np.testing.assert_allclose(s.area, [100, 16, 16])
+    assert len(s.polygons(2)) == 1
+
+
+def test_volume_from_layer_areas():
+    s = slice_mesh(make_ring(10, 5, 10, n=256), layer_height=0.5)
+    np.testing.assert_allclose(s.area.sum() * 0.5, np.pi * 75 * 10, rtol=1e-3)
+
+
+def test_svg_and_png_render(tmp_path):
+    s = slice_mesh(make_ring(10, 5, 2, n=32), layer_height=1)
+    save_svg(s, str(tmp_path / "s.svg"))
+    assert (tmp_path / "s.svg").read_text().count("<path") == 2
+    pytest.importorskip("matplotlib")
+    save_png(s, str(tmp_path / "s.png"), layers=[0])
+    assert (tmp_path / "s.png").read_bytes()[:4] == b"\x89PNG"
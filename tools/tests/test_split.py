@@ -0,0 +1,43 @@
+"""Tests for plane split with tenon/socket joinery."""
+import numpy as np
+import pytest
+
+from mesh_primitives import make_box
+from split import split_part, union
+
+
+def _legs_and_top():
+    legs = [make_box(30, 8, 100, cx=x, cy=y) for x in (-60, 60) for y in (-40, 40)]
+    return union(legs + [make_box(150, 88, 5, cz=100)])
+
+
+def test_plain_split_conserves_volume():
+    solid = _legs_and_top()
+    lower, upper = split_part(solid, z=40)
+    np.testing.assert_allclose(lower.volume() + upper.volume(), solid.volume(), rtol=1e-9)
+    np.testing.assert_allclose(lower.volume(), 4 * 30 * 8 * 40)
+    assert lower.bounding_box()[5] == pytest.approx(40) and upper.bounding_box()[2] == pytest.approx(40)
+
+
+def test_tenons_and_sockets_per_section_region():
+    solid = _legs_and_top()
+    lower, upper = split_part(solid, z=40, tenon_h=10, inset=1, tenon_max=20, clearance=0.25, socket_slack=1)
+    tenon = 20 * 6 * 10                       # 28 x 6 inset section clipped to a 20 mm square
+    socket = 20.5 * 6.5 * 11
+    np.testing.assert_allclose(lower.volume(), 4 * (30 * 8 * 40 + tenon), rtol=1e-9)
+    np.testing.assert_allclose(upper.volume(), solid.volume() - 4 * (30 * 8 * 40 + socket), rtol=1e-9)
+    assert len(lower.decompose()) == 4 and len(upper.decompose()) == 1
+    # the tenons must not collide with the upper half
+    assert (lower ^ upper).volume() == pytest.approx(0, abs=1e-6)
+
+
+def test_sections_thinner_than_the_inset_get_no_tenon():
+    solid = union([make_box(10, 1.5, 20)])
+    lower, _ = split_part(solid, z=10, tenon_h=5, inset=1)
+    np.testing.assert_allclose(lower.volume(), 10 * 1.5 * 10)
+
+
+def test_arbitrary_plane_returns_halves_in_input_frame():
+    lower, upper = split_part(union([make_box(20, 20, 20)]), normal=(1, 0, 0), offset=5)
+    np.testing.assert_allclose(upper.bounding_box(), (5, -10, 0, 10, 10, 20), atol=1e-6)
+    np.testing.assert_allclose(lower.bounding_box(), (-10, -10, 0, 5, 10, 20), atol=1e-6)
@@ -0,0 +1,46 @@
+"""Tests for tessellation profiles, the per-face report and deviation-bounded meshing."""
+import os
+
+from step_primitives import PROFILES, cut, make_box, make_cylinder, save_stl
+from tessellation import fit_deflection, report
+
+
+def _part():
+    return cut(make_box(-30, -30, 0, 60, 60, 10), make_cylinder(20, 12, z=-1))
+
+
+def test_profiles_order_by_size_and_accuracy():
+    shape = _part()
+    r = {name: report(shape, name) for name in ("draft", "print", "archive")}
+    assert r["draft"].triangles < r["print"].triangles < r["archive"].triangles
+    assert r["archive"].max_deviation < r["print"].max_deviation <= PROFILES["print"].linear
+
+
+def test_report_lists_every_face_with_its_surface():
+    r = report(_part())
+    assert len(r.faces) == 7 and sum(f.triangles for f in r.faces) == r.triangles
+    assert {f.surface for f in r.faces} == {"Plane", "Cylinder"}
+    assert r.max_deviation == max(f.deviation for f in r.faces if f.surface == "Cylinder") > 0
+    assert "Cylinder" in r.summary()
+
+
+def test_flat_part_is_the_same_under_every_profile():
+    box = make_box(0, 0, 0, 40, 10, 2)
+    assert {report(box, name).triangles for name in PROFILES} == {12}
+
+
+def test_fit_deflection_is_coarsest_within_bound():
+    shape = _part()
+    fine = report(shape, "print", deflection=0.02)
+    fit = fit_deflection(shape, 0.05)
+    assert fit.max_deviation <= 0.05
+    assert fit.triangles < fine.triangles
+    assert report(shape, "print", deflection=fit.settings.linear * 1.2).max_deviation > 0.05 * 0.9
+
+
+def test_save_stl_with_max_deviation_is_smaller(tmp_path):
+    shape = _part()
+    save_stl(shape, str(tmp_path / "a.stl"), profile="archive")
+    save_stl(shape, str(tmp_path / "b.stl"), max_deviation=0.1)
+    assert os.path.getsize(tmp_path / "b.stl") < os.path.getsize(tmp_path / "a.stl")
+
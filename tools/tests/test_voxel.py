@@ -0,0 +1,42 @@
+"""Tests for the scanline voxelizer and the queries built on it."""
+import math
+
+import numpy as np
+import pytest
+
+from mesh_arrays import rotation, translation
+from mesh_primitives import combine, make_box, make_cylinder, transform
+from voxel import VoxelGrid, interference, voxelize
+
+
+def test_volume_matches_exact_solids_including_edge_aligned_rays():
+    box = make_box(20, 10, 4)                            # face diagonals pass through column centers
+    g = voxelize(box, 0.5)
+    assert g.shape == (40, 20, 8) and g.dense().all()
+    assert voxelize(transform(box, rotation("z", 30)), 0.1).volume == pytest.approx(800, rel=5e-3)
+    assert voxelize(make_cylinder(5, 10), 0.1).volume == pytest.approx(math.pi * 250, rel=2e-2)
+    tube = voxelize(transform(make_box(10, 10, 10), rotation("x", 90)), 0.25, chunk=64)     # many chunks
+    assert tube.volume == pytest.approx(1000)
+
+
+def test_nonzero_fill_keeps_overlapping_shells_solid():
+    pair = combine([make_box(10, 10, 10), make_box(10, 10, 10, cx=5)])
+    assert voxelize(pair, 0.5, fill="nonzero").volume == pytest.approx(1500)
+    assert voxelize(pair, 0.5).volume == pytest.approx(1000)               # parity: overlap cancels
+
+
+def test_dense_round_trip_interference_and_thickness():
+    g = voxelize(make_cylinder(5, 4), 0.25)
+    d = g.dense()
+    back = VoxelGrid.from_dense(d, g.pitch, g.offset)
+    assert (back.dense() == d).all() and back.count == g.count
+    overlap = interference(make_box(20, 10, 4), transform(make_box(20, 10, 4), translation(5, 0, 1)))
+    assert overlap.volume == pytest.approx(15 * 10 * 3)
+    assert interference(make_box(2, 2, 2), make_box(2, 2, 2, cx=10)).volume == 0
+
+    plate = voxelize(combine([make_box(20, 20, 1.2), make_box(2, 20, 10, cx=9)]), 0.2, fill="nonzero")
+    t = plate.thickness()
+    occupied = plate.dense()
+    assert (t[~occupied] == 0).all()
+    assert np.median(t[occupied]) == pytest.approx(1.2, abs=0.1)
+    assert t[occupied].max() == pytest.approx(2.0, abs=0.1)
@@ -24,8 +24,11 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, "/Users/richard/3d-prints/tools")
-from mesh_primitives import make_box, combine
+from mesh_primitives import make_box, combine, transform
+from mesh_arrays import rotation, translation
+from plate import save_plate
 from bbox import print_dimensions
+from canonical import save_stl
 
 
 # ── Dimensions ───────────────────────────────────────────────
@@ -38,6 +41,10 @@ CHANNEL = 50.0        # inner channel depth
 TOTAL_DEPTH = WALL + CHANNEL + WALL  # 58mm
 TOTAL_HEIGHT = FRONT_H + WALL + BACK_H  # 104mm
 
+PLATE_COPIES = 3      # brackets per print plate
+PLATE_GAP = 10.0      # spacing between copies on the plate
+BED = (256.0, 256.0)  # build plate XY
+
 # Derived Y positions (0 = wood panel side)
 BACK_Y = WALL / 2                           # back plate center Y
 SHELF_Y = TOTAL_DEPTH / 2                   # shelf center Y
@@ -67,11 +74,18 @@ parts.append(make_box(WIDTH, WALL, FRONT_H, cx=0, cy=FRONT_Y, cz=FRONT_Z))
 
 bracket = combine(parts)
 out_path = Path(__file__).parent / "unvr_anti_tip_bracket.stl"
-bracket.save(str(out_path))
+save_stl(bracket, out_path)
+
+# Print plate: copies lying on the side face, packed onto the bed (one shared mesh)
+lay_flat = translation(0, 0, WIDTH / 2) @ rotation("y", 90)
+plate_path = Path(__file__).parent / "unvr_anti_tip_bracket_plate.3mf"
+save_plate([(transform(bracket, lay_flat), PLATE_COPIES, "unvr_anti_tip_bracket")], str(plate_path),
+           bed=BED, spacing=PLATE_GAP)
 
 # ── Verify dimensions ────────────────────────────────────────
 
 print(f"Saved: {out_path}")
+print(f"Saved: {plate_path} ({PLATE_COPIES} copies, print-ready)")
 print_dimensions(bracket)
 print(f"  Spec: {WIDTH} x {TOTAL_DEPTH} x {TOTAL_HEIGHT} mm; channel {CHANNEL:.1f} mm")
 print(f"\nPrint recommendation:")
@@ -0,0 +1,35 @@
+"""Printability of the UNVR anti-tip bracket in its print orientation.
+
+Reads the committed STL (regenerate with generate_bracket.py first). Run:
+
+    ../tools/venv/bin/python -m pytest test_generate_bracket.py -q
+"""
+import os
+import sys
+
+from stl import mesh as stl_mesh
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "tools"))
+from mesh_arrays import rotation  # noqa: E402
+from mesh_primitives import transform  # noqa: E402
+from orient import best_orientations  # noqa: E402
+from printability import analyze  # noqa: E402
+
+BRACKET = stl_mesh.Mesh.from_file(os.path.join(HERE, "unvr_anti_tip_bracket.stl"))
+
+
+def test_lying_on_side_face_has_zero_overhangs():
+    report = analyze(transform(BRACKET, rotation("y", 90)))
+    assert report.overhang_area == 0 and report.support_free, report.summary()
+
+
+def test_mounting_orientation_would_need_support():
+    """Why it is laid flat: upright, the shelf underside is a 50+ mm cantilever."""
+    report = analyze(BRACKET)
+    assert report.unsupported and report.unsupported[0].reach >= 50
+
+
+def test_orientation_search_picks_the_side_face():
+    best = best_orientations(BRACKET, top=1)[0]
+    assert abs(best.down[0]) == 1 and best.overhang == 0
@@ -1,5 +1,10 @@
 import { useState, useRef, useEffect } from "react";
 import * as THREE from "three";
+import { GLTFLoader } from "three/examples/jsm/loaders/GLTFLoader.js";
+
+// Written by scad/gen_stl_v2.py (tools/export_glb.py): one instanced,
+// int16-quantized GLB, so the viewer shows the real generated geometry.
+const MODEL_URL = "stl/v8_full.glb";
 
 const COLORS = {
   legs: "#4682B4",
@@ -11,6 +16,27 @@ const COLORS = {
   fan: "#333",
 };
 
+// GLB node name (minus the _<instance> suffix) -> color
+const PART_COLORS = {
+  rails: COLORS.legs,
+  legs: COLORS.legs,
+  braces: COLORS.shelf,
+  shelf: COLORS.shelf,
+  fan_rings: COLORS.fan,
+  bosses: COLORS.shelf,
+  posts: COLORS.posts,
+  walls: COLORS.cradle,
+  lips: COLORS.lip,
+  end_stops: COLORS.cradle,
+};
+
+// Ghost switch placement; must match gen_stl_v2.py
+const SW_W = 210.4;
+const SW_T = 43.7;
+const SW_H = 173.8;
+const WALL = 4;
+const CRADLE_Z = 215; // SHELF_Z + CABLE_GAP (SHELF_Z is the shelf top)
+
 export default function CoolingStandViewer() {
   const mountRef = useRef(null);
   const sceneRef = useRef(null);
@@ -20,10 +46,9 @@ export default function CoolingStandViewer() {
   const lastMouse = useRef({ x: 0, y: 0 });
   const rotation = useRef({ x: -0.4, y: 0.5 });
   const zoomRef = useRef(500);
+  const ghostRef = useRef(null);
   const [showSwitch, setShowSwitch] = useState(true);
-  const [cableGap, setCableGap] = useState(50);
-  const [lipSize, setLipSize] = useState(10);
-  const [wallHeight, setWallHeight] = useState(70);
+  const [loadError, setLoadError] = useState(null);
 
   useEffect(() => {
     const mount = mountRef.current;
@@ -66,186 +91,51 @@ export default function CoolingStandViewer() {
   useEffect(() => {
     const scene = sceneRef.current;
     if (!scene) return;
-
-    // Clear old meshes (keep lights and grid)
-    const toRemove = [];
-    scene.traverse((obj) => {
-      if (obj.isMesh) toRemove.push(obj);
-    });
-    toRemove.forEach((obj) => {
-      obj.geometry.dispose();
-      obj.material.dispose();
-      scene.remove(obj);
-    });
-
-    // Dimensions
-    const SW_W = 210.4;
-    const SW_T = 43.7;
-    const SW_H = 173.8;
-    const FAN = 80;
-    const RAIL_DEPTH = 8;
-    const RAIL_OFFSET = 59;
-    const PLAT_W = SW_W + 16; // 226
-    const PLAT_D = FAN + 20; // 100
-    const FLOOR_CLEAR = 155;
-    const SHELF_Z = 165;
-    const SHELF_T = 5;
-    const WALL = 4;
-    const CLR = 1.5;
-    const SLOT_W = SW_T + CLR * 2;
-    const LEG_W = 30;
-    const LEG_X = PLAT_W / 2 - LEG_W / 2 - 4;
-
-    const CRADLE_Z = SHELF_Z + SHELF_T + cableGap;
-
-    function box(w, d, h, color, x, y, z, edges = true) {
-      const geo = new THREE.BoxGeometry(w, h, d);
-      const mat = new THREE.MeshPhongMaterial({
-        color,
-        transparent: color === "rgba(100,200,100,0.3)",
-        opacity: color === "rgba(100,200,100,0.3)" ? 0.25 : 1,
-      });
-      const mesh = new THREE.Mesh(geo, mat);
-      mesh.position.set(x, z + h / 2, y);
-      scene.add(mesh);
-
-      if (edges && color !== "rgba(100,200,100,0.3)") {
-        const edgeGeo = new THREE.EdgesGeometry(geo);
-        const edgeMat = new THREE.LineBasicMaterial({
-          color: 0x000000,
-          transparent: true,
-          opacity: 0.15,
+    let cancelled = false;
+
+    new GLTFLoader().load(
+      MODEL_URL,
+      (gltf) => {
+        if (cancelled) return;
+        gltf.scene.traverse((obj) => {
+          if (!obj.isMesh) return;
+          const part = obj.name.replace(/_\d+$/, "");
+          obj.material = new THREE.MeshPhongMaterial({
+            color: PART_COLORS[part] || COLORS.shelf,
+            flatShading: true,
+          });
+          const edges = new THREE.LineSegments(
+            new THREE.EdgesGeometry(obj.geometry),
+            new THREE.LineBasicMaterial({ color: 0x000000, transparent: true, opacity: 0.15 })
+          );
+          obj.add(edges);
         });
-        const line = new THREE.LineSegments(edgeGeo, edgeMat);
-        line.position.copy(mesh.position);
-        scene.add(line);
-      }
-      return mesh;
-    }
-
-    function cyl(r, h, color, x, y, z) {
-      const geo = new THREE.CylinderGeometry(r, r, h, 32);
-      const mat = new THREE.MeshPhongMaterial({ color });
-      const mesh = new THREE.Mesh(geo, mat);
-      mesh.position.set(x, z + h / 2, y);
-      scene.add(mesh);
-      return mesh;
-    }
-
-    // === FLOOR RAILS ===
-    for (const s of [-1, 1]) {
-      box(PLAT_W, RAIL_DEPTH, 4, COLORS.legs, 0, s * RAIL_OFFSET, 0);
-    }
-
-    // === 4 LEGS ===
-    for (const lx of [-LEG_X, LEG_X]) {
-      for (const s of [-1, 1]) {
-        box(LEG_W, RAIL_DEPTH, FLOOR_CLEAR, COLORS.legs, lx, s * RAIL_OFFSET, 0);
-      }
-    }
-
-    // === BRACE ===
-    const braceZ = FLOOR_CLEAR + (SHELF_Z - SHELF_T - FLOOR_CLEAR) / 2;
-    for (const lx of [-LEG_X, LEG_X]) {
-      box(4, RAIL_OFFSET * 2, 10, COLORS.shelf, lx, 0, braceZ);
-    }
-
-    // === FAN SHELF ===
-    box(PLAT_W, PLAT_D, SHELF_T, COLORS.shelf, 0, 0, SHELF_Z - SHELF_T);
-
-    // Fan holes (dark circles)
-    const fanGap = 10;
-    for (const fx of [-(FAN / 2 + fanGap / 2), FAN / 2 + fanGap / 2]) {
-      cyl(FAN / 2 - 2, SHELF_T + 1, COLORS.fan, fx, 0, SHELF_Z - SHELF_T - 0.5);
-    }
-
-    // === CORNER POSTS (cable gap) ===
-    const POST = 8;
-    for (const dx of [-1, 1]) {
-      for (const dy of [-1, 1]) {
-        box(
-          POST,
-          POST,
-          cableGap,
-          COLORS.posts,
-          dx * (SW_W / 2),
-          dy * (SLOT_W / 2 + WALL / 2),
-          SHELF_Z
-        );
-      }
-    }
-
-    // === CRADLE ===
-    // Front wall
-    box(
-      SW_W + 10,
-      WALL,
-      wallHeight,
-      COLORS.cradle,
-      0,
-      -(SLOT_W / 2 + WALL / 2),
-      CRADLE_Z
-    );
-    // Back wall
-    box(
-      SW_W + 10,
-      WALL,
-      wallHeight,
-      COLORS.cradle,
-      0,
-      SLOT_W / 2 + WALL / 2,
-      CRADLE_Z
+        scene.add(gltf.scene);
+        render();
+      },
+      undefined,
+      (err) => setLoadError(String(err))
     );
 
-    // Front lip
-    box(
-      SW_W + 10,
-      lipSize,
-      WALL,
-      COLORS.lip,
-      0,
-      -(SLOT_W / 2 - lipSize / 2),
-      CRADLE_Z
+    // Ghost switch, resting on the cradle lips
+    const ghost = new THREE.Mesh(
+      new THREE.BoxGeometry(SW_W, SW_H, SW_T),
+      new THREE.MeshPhongMaterial({ color: "rgb(100,200,100)", transparent: true, opacity: 0.25 })
     );
-    // Back lip
-    box(
-      SW_W + 10,
-      lipSize,
-      WALL,
-      COLORS.lip,
-      0,
-      SLOT_W / 2 - lipSize / 2,
-      CRADLE_Z
-    );
-
-    // End stops
-    for (const dx of [-1, 1]) {
-      box(
-        WALL,
-        SLOT_W + WALL * 2,
-        8,
-        COLORS.cradle,
-        dx * (SW_W / 2 + CLR + WALL / 2),
-        0,
-        CRADLE_Z
-      );
-    }
+    ghost.position.set(0, CRADLE_Z + WALL + SW_H / 2, 0);
+    scene.add(ghost);
+    ghostRef.current = ghost;
 
-    // === GHOST SWITCH ===
-    if (showSwitch) {
-      box(
-        SW_W,
-        SW_T,
-        SW_H,
-        COLORS.switch,
-        0,
-        0,
-        CRADLE_Z + WALL
-      );
-    }
+    return () => {
+      cancelled = true;
+    };
+  }, []);
 
+  useEffect(() => {
+    if (!ghostRef.current) return;
+    ghostRef.current.visible = showSwitch;
     render();
-  }, [showSwitch, cableGap, lipSize, wallHeight]);
+  }, [showSwitch]);
 
   function render() {
     const scene = sceneRef.current;
@@ -298,46 +188,14 @@ export default function CoolingStandViewer() {
             />
             Show switch (ghost)
           </label>
-          <label className="flex items-center gap-2">
-            Cable gap:
-            <input
-              type="range"
-              min={20}
-              max={80}
-              value={cableGap}
-              onChange={(e) => setCableGap(Number(e.target.value))}
-              className="w-24"
-            />
-            {cableGap}mm
-          </label>
-          <label className="flex items-center gap-2">
-            Lip size:
-            <input
-              type="range"
-              min={5}
-              max={20}
-              value={lipSize}
-              onChange={(e) => setLipSize(Number(e.target.value))}
-              className="w-24"
-            />
-            {lipSize}mm
-          </label>
-          <label className="flex items-center gap-2">
-            Wall height:
-            <input
-              type="range"
-              min={30}
-              max={120}
-              value={wallHeight}
-              onChange={(e) => setWallHeight(Number(e.target.value))}
-              className="w-24"
-            />
-            {wallHeight}mm
-          </label>
         </div>
         <p className="text-xs text-gray-500 mt-1">
-          Drag to rotate · Scroll to zoom · Orange lips = switch rests here
+          Drag to rotate · Scroll to zoom · Orange lips = switch rests here ·
+          Dimensions live in scad/gen_stl_v2.py (regenerate to update)
         </p>
+        {loadError && (
+          <p className="text-xs text-red-600 mt-1">Could not load {MODEL_URL}: {loadError}</p>
+        )}
       </div>
       <div
         ref={mountRef}
@@ -1,6 +1,14 @@
+import os
 import sys
 sys.path.insert(0, "/Users/richard/3d-prints/tools")
-from mesh_primitives import make_box, make_cylinder, make_ring, combine, flip_z
+from mesh_primitives import make_box, make_cylinder, make_ring, flip_z, from_indexed, transform
+from mesh_arrays import as_indexed, translation
+from canonical import save_stl
+from export_glb import save_glb
+from output_pipeline import OutputPipeline
+from pattern import compose, mirror
+from scene import Node
+from split import split_part, union
 
 # ============================================================
 # DIMENSIONS
@@ -11,7 +19,7 @@ FAN = 80
 RAIL_DEPTH = 8
 RAIL_OFFSET = 59
 PLAT_W = SW_W + 16
-PLAT_D = FAN + 20
+PLAT_D = RAIL_OFFSET*2 + RAIL_DEPTH + 4  # 130: reaches the legs (as part_b.scad)
 FLOOR_CLEAR = 155
 SHELF_Z = 165
 SHELF_T = 5
@@ -23,7 +31,7 @@ LEG_X = PLAT_W/2 - LEG_W/2 - 4
 CABLE_GAP = 50
 LIP = 10
 WALL_H = 70
-CRADLE_Z = SHELF_Z + SHELF_T + CABLE_GAP
+CRADLE_Z = SHELF_Z + CABLE_GAP  # SHELF_Z is the shelf top
 FAN_GAP = 10
 F1X = -(FAN/2 + FAN_GAP/2)
 F2X = FAN/2 + FAN_GAP/2
@@ -33,136 +41,83 @@ SPLIT_Z = 75
 TENON_W = LEG_W - 6
 TENON_D = RAIL_DEPTH - 2
 TENON_H = 16
+TENON_CLR = 0.3  # per side, socket vs tenon
 FAN_CUT_R = 76/2  # fan cutout radius
 FAN_SCREW_SPACING = 71.5
 FAN_SCREW_R = 4.3/2
 
-# ============================================================
-# PART A (unchanged - legs + rails + tenons)
-# ============================================================
-part_a_meshes = []
-for s in [-1, 1]:
-    part_a_meshes.append(make_box(PLAT_W, RAIL_DEPTH, 4, 0, s*RAIL_OFFSET, 0))
-for lx in [-LEG_X, LEG_X]:
-    for s in [-1, 1]:
-        part_a_meshes.append(make_box(LEG_W, RAIL_DEPTH, SPLIT_Z, lx, s*RAIL_OFFSET, 0))
-        part_a_meshes.append(make_box(TENON_W, TENON_D, TENON_H, lx, s*RAIL_OFFSET, SPLIT_Z))
-
-part_a = combine(part_a_meshes)
-part_a.save('/home/claude/v8_part_a.stl')
-print(f"Part A: {SPLIT_Z + TENON_H}mm tall")
-
-# ============================================================
-# PART B - built in ASSEMBLY orientation then flipped for printing
-# (z=0 at split point, everything goes UP)
-# ============================================================
-pb = []
-
-# Upper legs: from split point up to shelf
-upper_leg_h = SHELF_Z - SHELF_T - SPLIT_Z  # 85mm
-for lx in [-LEG_X, LEG_X]:
-    for s in [-1, 1]:
-        pb.append(make_box(LEG_W, RAIL_DEPTH, upper_leg_h, lx, s*RAIL_OFFSET, 0))
-
-# Brace at midpoint of upper legs
-brace_z = upper_leg_h / 2
-for lx in [-LEG_X, LEG_X]:
-    pb.append(make_box(4, RAIL_OFFSET*2, 10, lx, 0, brace_z))
-
-# Fan shelf - built as a plate with fan holes
-# Instead of a solid plate, build it as strips around the fan holes
-shelf_z = upper_leg_h  # local z of shelf bottom
-
-# Build shelf as the solid plate
-pb.append(make_box(PLAT_W, PLAT_D, SHELF_T, 0, 0, shelf_z))
-
-# Fan hole rings (these sit ON the shelf to form the screw bosses
-# and visually indicate where fans mount)
-for fx in [F1X, F2X]:
-    # Ring around each fan hole
-    pb.append(make_ring(FAN_CUT_R + 4, FAN_CUT_R, SHELF_T, fx, 0, shelf_z, 48))
-    # Screw bosses
-    for dx in [-1, 1]:
-        for dy in [-1, 1]:
-            pb.append(make_cylinder(FAN_SCREW_R + 3, SHELF_T,
-                                   fx + dx*FAN_SCREW_SPACING/2,
-                                   dy*FAN_SCREW_SPACING/2,
-                                   shelf_z, 16))
-
-# Corner posts (cable gap)
-shelf_top = shelf_z + SHELF_T
-for dx in [-1, 1]:
-    for dy in [-1, 1]:
-        pb.append(make_box(POST, POST, CABLE_GAP,
-                          dx*(SW_W/2), dy*(SLOT_W/2 + WALL/2), shelf_top))
-
-# Cradle
-cz = shelf_top + CABLE_GAP
-# Front wall
-pb.append(make_box(SW_W + 10, WALL, WALL_H, 0, -(SLOT_W/2 + WALL/2), cz))
-# Back wall
-pb.append(make_box(SW_W + 10, WALL, WALL_H, 0, (SLOT_W/2 + WALL/2), cz))
-# Front lip
-pb.append(make_box(SW_W + 10, LIP, WALL, 0, -(SLOT_W/2 - LIP/2), cz))
-# Back lip
-pb.append(make_box(SW_W + 10, LIP, WALL, 0, (SLOT_W/2 - LIP/2), cz))
-# End stops
-for dx in [-1, 1]:
-    pb.append(make_box(WALL, SLOT_W + WALL*2, SLOT_LIP,
-                      dx*(SW_W/2 + CLR + WALL/2), 0, cz))
-
-# Combine in assembly orientation
-part_b_assembly = combine(pb)
-
-# Total height of part B
-total_b_h = cz + WALL_H
-print(f"Part B assembly orientation: {total_b_h:.0f}mm tall")
-
-# Now flip for printing: cradle goes on build plate, legs point UP
-# This way when you flip it over for assembly, legs point DOWN
-part_b_print = flip_z(part_b_assembly, total_b_h)
-part_b_print.save('/home/claude/v8_part_b.stl')
-print(f"Part B flipped for printing: cradle at bottom, legs pointing up")
-print(f"  -> When assembled, flip over so legs go into Part A")
-
-# ============================================================
-# FULL MODEL (for reference)
-# ============================================================
-full_parts = []
-# Part A at z=0
-for s in [-1, 1]:
-    full_parts.append(make_box(PLAT_W, RAIL_DEPTH, 4, 0, s*RAIL_OFFSET, 0))
-for lx in [-LEG_X, LEG_X]:
-    for s in [-1, 1]:
-        full_parts.append(make_box(LEG_W, RAIL_DEPTH, FLOOR_CLEAR, lx, s*RAIL_OFFSET, 0))
-
-brace_z_full = FLOOR_CLEAR + (SHELF_Z - SHELF_T - FLOOR_CLEAR) / 2
-for lx in [-LEG_X, LEG_X]:
-    full_parts.append(make_box(4, RAIL_OFFSET*2, 10, lx, 0, brace_z_full))
-
-full_parts.append(make_box(PLAT_W, PLAT_D, SHELF_T, 0, 0, SHELF_Z - SHELF_T))
-for fx in [F1X, F2X]:
-    full_parts.append(make_ring(FAN_CUT_R + 4, FAN_CUT_R, SHELF_T, fx, 0, SHELF_Z - SHELF_T, 48))
-    for dx in [-1, 1]:
-        for dy in [-1, 1]:
-            full_parts.append(make_cylinder(FAN_SCREW_R + 3, SHELF_T,
-                                           fx + dx*FAN_SCREW_SPACING/2,
-                                           dy*FAN_SCREW_SPACING/2,
-                                           SHELF_Z - SHELF_T, 16))
-
-for dx in [-1, 1]:
-    for dy in [-1, 1]:
-        full_parts.append(make_box(POST, POST, CABLE_GAP,
-                                  dx*(SW_W/2), dy*(SLOT_W/2 + WALL/2), SHELF_Z))
-
-full_parts.append(make_box(SW_W + 10, WALL, WALL_H, 0, -(SLOT_W/2 + WALL/2), CRADLE_Z))
-full_parts.append(make_box(SW_W + 10, WALL, WALL_H, 0, (SLOT_W/2 + WALL/2), CRADLE_Z))
-full_parts.append(make_box(SW_W + 10, LIP, WALL, 0, -(SLOT_W/2 - LIP/2), CRADLE_Z))
-full_parts.append(make_box(SW_W + 10, LIP, WALL, 0, (SLOT_W/2 - LIP/2), CRADLE_Z))
-for dx in [-1, 1]:
-    full_parts.append(make_box(WALL, SLOT_W + WALL*2, SLOT_LIP,
-                              dx*(SW_W/2 + CLR + WALL/2), 0, CRADLE_Z))
-
-full = combine(full_parts)
-full.save('/home/claude/v8_full.stl')
-print(f"\nFull model: {CRADLE_Z + WALL_H}mm tall ({(CRADLE_Z+WALL_H)/25.4:.1f}\")")
+# Writes run on a background thread while the next part is built;
+# leaving the block flushes them and raises any write error.
+with OutputPipeline() as out:
+    # ============================================================
+    # FULL MODEL (single source of truth)
+    # One scene graph: repeated features are one mesh at the origin plus a list of
+    # placements, and the printed parts are derived from its subtrees. "frame" is
+    # everything that crosses the split (rails and full-height legs); "shelf" and
+    # "cradle" sit wholly above it and go into Part B untouched.
+    # ============================================================
+    LEG_H = SHELF_Z - SHELF_T                        # legs run floor -> shelf underside
+    brace_z = SPLIT_Z + (LEG_H - SPLIT_Z) / 2        # midway up the upper legs
+
+    fans = mirror("x", translation(F2X, 0, SHELF_Z - SHELF_T), reflect=False)   # F1X = -F2X
+
+    stand = Node("stand")
+    frame = stand.add(Node("frame"))
+    frame.add_instances("rails", make_box(PLAT_W, RAIL_DEPTH, 4),
+                        mirror("y", translation(0, RAIL_OFFSET, 0), reflect=False))
+    frame.add_instances("legs", make_box(LEG_W, RAIL_DEPTH, LEG_H),
+                        mirror("xy", translation(LEG_X, RAIL_OFFSET, 0), reflect=False))
+    shelf = stand.add(Node("shelf"))
+    shelf.add_instances("braces", make_box(4, RAIL_OFFSET*2, 10),
+                        mirror("x", translation(LEG_X, 0, brace_z), reflect=False))
+    shelf.add_instances("shelf", make_box(PLAT_W, PLAT_D, SHELF_T),
+                        [translation(0, 0, SHELF_Z - SHELF_T)])
+    shelf.add_instances("fan_rings", make_ring(FAN_CUT_R + 4, FAN_CUT_R, SHELF_T), fans)
+    shelf.add_instances("bosses", make_cylinder(FAN_SCREW_R + 3, SHELF_T),
+                        compose(fans, mirror("xy", translation(FAN_SCREW_SPACING/2, FAN_SCREW_SPACING/2, 0), reflect=False)))
+    cradle = stand.add(Node("cradle"))
+    cradle.add_instances("posts", make_box(POST, POST, CABLE_GAP),
+                         mirror("xy", translation(SW_W/2, SLOT_W/2 + WALL/2, SHELF_Z), reflect=False))
+    cradle.add_instances("walls", make_box(SW_W + 10, WALL, WALL_H),
+                         mirror("y", translation(0, SLOT_W/2 + WALL/2, CRADLE_Z), reflect=False))
+    cradle.add_instances("lips", make_box(SW_W + 10, LIP, WALL),
+                         mirror("y", translation(0, SLOT_W/2 - LIP/2, CRADLE_Z), reflect=False))
+    cradle.add_instances("end_stops", make_box(WALL, SLOT_W + WALL*2, SLOT_LIP),
+                         mirror("x", translation(SW_W/2 + CLR + WALL/2, 0, CRADLE_Z), reflect=False))
+
+    full = from_indexed(*stand.flatten())
+    out.save(save_stl, full, '/home/claude/v8_full.stl')
+    top_z = stand.bounds()[1][2]
+    print(f"Full model: {top_z:.0f}mm tall ({top_z/25.4:.1f}\")")
+
+    # Compact instanced preview for cooling_stand_viewer.jsx (one fetch, int16 positions)
+    glb_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "stl", "v8_full.glb")
+    out.save(save_glb, stand.instances(), glb_path, quantize=True)
+    print(f"Viewer GLB: {glb_path}")
+
+    # ============================================================
+    # SPLIT at SPLIT_Z: only the frame crosses the plane, so only it is cut.
+    # Part A = rails + lower legs + tenons; Part B = upper legs (with sockets)
+    # + shelf + cradle. Tenons are the leg sections inset to TENON_W x TENON_D.
+    # ============================================================
+    assert shelf.bounds()[0][2] > SPLIT_Z + TENON_H and cradle.bounds()[0][2] > SPLIT_Z
+    part_a_solid, upper_frame = split_part(union(transform(g.stl, t) for g, t, _ in frame.parts()), z=SPLIT_Z,
+                                           tenon_h=TENON_H, inset=(RAIL_DEPTH - TENON_D) / 2, tenon_max=TENON_W,
+                                           clearance=TENON_CLR)
+    part_b_solid = union([upper_frame] + [transform(g.stl, t) for node in (shelf, cradle) for g, t, _ in node.parts()])
+
+    part_a = from_indexed(*as_indexed(part_a_solid))
+    out.save(save_stl, part_a, '/home/claude/v8_part_a.stl')
+    print(f"\nPart A: {SPLIT_Z + TENON_H}mm tall, {len(part_a.vectors)} triangles")
+
+    # Part B in assembly orientation with z=0 at the split point...
+    part_b_assembly = from_indexed(*as_indexed(part_b_solid.translate([0, 0, -SPLIT_Z])))
+    total_b_h = top_z - SPLIT_Z
+    print(f"Part B assembly orientation: {total_b_h:.0f}mm tall")
+
+    # ...then flipped for printing: cradle goes on build plate, legs point UP
+    # This way when you flip it over for assembly, legs point DOWN
+    part_b_print = flip_z(part_b_assembly, total_b_h)
+    out.save(save_stl, part_b_print, '/home/claude/v8_part_b.stl')
+    print(f"Part B flipped for printing: cradle at bottom, legs pointing up")
+    print(f"  -> When assembled, flip over so Part A tenons go into the leg sockets")